@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# 将项目根目录添加到路径以便导入 core / tools 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.asset_store import AssetStore
+from core.assets_loader import AssetsLoader
+from tools.pack_assets import collect_assets, pack_files
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "pets")
+
+
+def make_library(out_dir: str, n: int, frames_per_pet: int = 6, seed: int = 3) -> None:
+    """
+    以现有宠物为底生成 n 个合成宠物（名称矩阵格式）：
+    - 每个底图有 4 种配色变体（同变体的宠物共享调色板）
+    - 每帧在首帧基础上改动少量像素，模拟只差几个像素的待机帧
+    """
+    rnd = random.Random(seed)
+    bases = []
+    for fn in sorted(os.listdir(ASSETS_DIR)):
+        if fn.endswith(".json"):
+            with open(os.path.join(ASSETS_DIR, fn), "r", encoding="utf-8") as f:
+                obj = json.load(f)
+            if "pixels" in (obj.get("frames") or [{}])[0]:
+                bases.append(obj)
+    os.makedirs(out_dir, exist_ok=True)
+    for i in range(n):
+        base = bases[i % len(bases)]
+        variant = (i // len(bases)) % 4
+        palette = {
+            name: [(c + variant * 40) % 256 if k < 3 and name != "bg" else c for k, c in enumerate(rgba)]
+            for name, rgba in base["palette"].items()
+        }
+        key = [list(row) for row in base["frames"][0]["pixels"]]
+        names = [name for name in palette if name != "bg"]
+        frames = []
+        for k in range(frames_per_pet):
+            px = [list(row) for row in key]
+            for _ in range(k % 3 * 2):
+                y, x = rnd.randrange(len(px)), rnd.randrange(len(px[0]))
+                px[y][x] = rnd.choice(names)
+            frames.append({"name": f"idle{k + 1}", "pixels": px})
+        with open(os.path.join(out_dir, f"pet_{i:04d}.json"), "w", encoding="utf-8") as f:
+            json.dump({"size": base["size"], "palette": palette, "frames": frames}, f, ensure_ascii=False, indent=2)
+
+
+def dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, fn)) for root, _, files in os.walk(path) for fn in files)
+
+
+def load_all(files: list) -> tuple:
+    """冷加载全部资源（清空资源库共享实例），返回 (耗时, 解码帧驻留内存)"""
+    AssetStore._instances.clear()
+    loader = AssetsLoader(require_pygame=False)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    kept = [loader.load_frames(p) for p in files]
+    elapsed = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return elapsed, current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="内容寻址资源库基准：磁盘大小、解析时间、解码帧内存")
+    parser.add_argument("-n", "--pets", type=int, default=300, help="合成宠物数量（默认 300）")
+    parser.add_argument("--frames", type=int, default=6, help="每个宠物的帧数（默认 6）")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_store_")
+    try:
+        plain_dir = os.path.join(tmp, "plain", "pets")
+        make_library(plain_dir, args.pets, args.frames)
+        cas_root = os.path.join(tmp, "cas")
+        shutil.copytree(plain_dir, os.path.join(cas_root, "pets"))
+        cas_files = collect_assets([os.path.join(cas_root, "pets")])
+        t0 = time.perf_counter()
+        stats = pack_files(cas_files, os.path.join(cas_root, "store"))
+        pack_time = time.perf_counter() - t0
+        plain_files = collect_assets([plain_dir])
+
+        print(f"pets: {args.pets} x {args.frames} frames")
+        print(
+            f"store objects: {stats['palettes']} palettes, {stats['keyframes']} keyframes, "
+            f"{stats['deltas']} deltas (pack {pack_time * 1000:.0f} ms)"
+        )
+        print(f"disk (plain): {dir_size(os.path.dirname(plain_dir)) / 1024:.1f} KiB")
+        print(f"disk (cas):   {dir_size(cas_root) / 1024:.1f} KiB")
+        for label, files in (("plain", plain_files), ("cas", cas_files)):
+            elapsed, mem = load_all(files)
+            print(f"load all ({label}): {elapsed * 1000:.1f} ms, decoded frames resident {mem / 1024 / 1024:.2f} MiB")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict
+
+# 将项目根目录添加到路径以便导入 core 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.backup_manager import BackupManager, _KeyStream
+
+
+def legacy_xor(data: bytes, key: bytes) -> bytes:
+    """旧实现：逐字节异或，每 32 字节调用一次 sha256"""
+    out = bytearray(len(data))
+    stream_block = key
+    block_idx = 0
+    for i in range(len(data)):
+        if i % 32 == 0:
+            stream_block = hashlib.sha256(stream_block + str(block_idx).encode()).digest()
+            block_idx += 1
+        out[i] = data[i] ^ stream_block[i % 32]
+    return bytes(out)
+
+
+def legacy_export(user_data: Dict[str, Any]) -> str:
+    """旧实现的导出格式（用于验证新实现可读取旧 .dat 文件）"""
+    json_bytes = json.dumps(user_data, ensure_ascii=False).encode("utf-8")
+    iv = os.urandom(16)
+    ciphertext = legacy_xor(json_bytes, BackupManager._derive_key(iv))
+    sig = hmac.new(BackupManager._SALT, iv + ciphertext, hashlib.sha256).hexdigest()
+    return base64.urlsafe_b64encode(iv + ciphertext).decode("ascii") + "|" + sig
+
+
+def make_user(target_mb: float) -> Dict[str, Any]:
+    """构造约 target_mb 大小的用户数据：大粮仓、逐宠物运行时间与大量已用卡密"""
+    n = max(1, int(target_mb * 1024 * 1024 / 90))
+    return {
+        "username": "bench",
+        "total_run_time": 10 ** 7,
+        "inventory": {f"食物{i:06d}": i for i in range(n)},
+        "pet_run_time": {f"pet_{i:06d}": i * 7 for i in range(n)},
+        "used_transfer_keys": [hashlib.sha1(str(i).encode()).hexdigest() for i in range(n)],
+        "settings": {"pet_zoom": 5},
+    }
+
+
+def mb_per_s(nbytes: int, seconds: float) -> float:
+    return nbytes / 1024 / 1024 / max(seconds, 1e-9)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="备份加解密吞吐基准：旧逐字节实现 vs 分块密钥流 / 流式文件导入导出")
+    parser.add_argument("--mb", type=float, default=8, help="用户数据 JSON 大小（MB，默认 8）")
+    parser.add_argument("--legacy-mb", type=float, default=1, help="旧实现测试的数据量（MB，默认 1，逐字节较慢）")
+    args = parser.parse_args()
+
+    key = BackupManager._derive_key(b"\0" * 16)
+    legacy_data = os.urandom(int(args.legacy_mb * 1024 * 1024))
+    t0 = time.perf_counter()
+    expected = legacy_xor(legacy_data, key)
+    legacy_rate = mb_per_s(len(legacy_data), time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    got = BackupManager._xor_cipher(legacy_data, key)
+    chunk_rate = mb_per_s(len(legacy_data), time.perf_counter() - t0)
+    assert got == expected, "keystream mismatch"
+    # 分块调用与一次性调用结果一致
+    ks = _KeyStream(key)
+    pieces = [ks.xor(legacy_data[i:i + 1000]) for i in range(0, len(legacy_data), 1000)]
+    assert b"".join(pieces) == expected, "chunked keystream mismatch"
+    print(f"xor cipher ({args.legacy_mb:g} MB): legacy {legacy_rate:.2f} MB/s, chunked {chunk_rate:.1f} MB/s ({chunk_rate / legacy_rate:.0f}x)")
+
+    user = make_user(args.mb)
+    size = len(json.dumps(user, ensure_ascii=False).encode("utf-8"))
+    # 兼容性：旧实现导出的内容可被新实现导入，新实现导出的内容与旧格式一致
+    small = make_user(0.05)
+    assert BackupManager.import_data(legacy_export(small)) == small, "legacy file not readable"
+    payload, sig = BackupManager.export_data(small).split("|")
+    raw = base64.urlsafe_b64decode(payload)
+    assert json.loads(legacy_xor(raw[16:], BackupManager._derive_key(raw[:16]))) == small, "new file not legacy-compatible"
+    assert hmac.new(BackupManager._SALT, raw, hashlib.sha256).hexdigest() == sig
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_backup.dat")
+        t0 = time.perf_counter()
+        BackupManager.export_to_file(user, path, version=1)
+        export_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        restored = BackupManager.import_file(path)
+        import_s = time.perf_counter() - t0
+        file_mb = os.path.getsize(path) / 1024 / 1024
+        assert restored == user, "round trip mismatch"
+        del restored
+        # 内存峰值单独测量（tracemalloc 会显著拖慢吞吐）
+        tracemalloc.start()
+        BackupManager.export_to_file(user, path, version=1)
+        export_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        restored = BackupManager.import_file(path)
+        import_peak = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+    print(f"user json {size / 1024 / 1024:.1f} MB, backup file {file_mb:.1f} MB")
+    print(f"  export_to_file: {mb_per_s(size, export_s):6.1f} MB/s, peak traced {export_peak / 1024 / 1024:.1f} MB")
+    print(f"  import_file:    {mb_per_s(size, import_s):6.1f} MB/s, peak traced {import_peak / 1024 / 1024:.1f} MB (incl. the restored dict)")
+    t0 = time.perf_counter()
+    assert BackupManager.import_data(BackupManager.export_data(user)) == user
+    print(f"  export_data + import_data (strings): {mb_per_s(size, time.perf_counter() - t0):.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
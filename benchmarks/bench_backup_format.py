@@ -0,0 +1,57 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# 将项目根目录添加到路径以便导入 core / benchmarks 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_backup_cipher import make_user, mb_per_s
+from core.backup_manager import BackupManager, lzma
+
+FORMATS = [("v1 text", 1, "none"), ("v2 none", 2, "none"), ("v2 zlib", 2, "zlib"), ("v2 lzma", 2, "lzma")]
+
+
+def best_of(fn, repeat: int) -> float:
+    """执行 repeat 次，返回最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="备份格式基准：v1 文本 vs v2 分块容器（不压缩 / zlib / lzma）的体积与导入导出速度")
+    parser.add_argument("--sizes", default="1,8,32", help="合成用户数据大小列表（MB，逗号分隔，默认 1,8,32）")
+    parser.add_argument("--repeat", type=int, default=2, help="每项重复次数，取最快（默认 2）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_backup.dat")
+        for mb in [float(x) for x in args.sizes.split(",") if x.strip()]:
+            user = make_user(mb)
+            size = len(json.dumps(user, ensure_ascii=False).encode("utf-8"))
+            print(f"profile {size / 1024 / 1024:.1f} MB json")
+            print(f"  {'format':>8} {'file MB':>8} {'ratio':>6} {'export MB/s':>12} {'import MB/s':>12}")
+            for name, version, codec in FORMATS:
+                if codec == "lzma" and lzma is None:
+                    print(f"  {name:>8}: lzma unavailable")
+                    continue
+                export_s = best_of(lambda: BackupManager.export_to_file(user, path, version=version, codec=codec), args.repeat)
+                file_size = os.path.getsize(path)
+                restored = []
+                import_s = best_of(lambda: restored.append(BackupManager.import_file(path)), args.repeat)
+                assert restored[-1] == user, f"{name} round trip mismatch"
+                restored.clear()
+                print(
+                    f"  {name:>8} {file_size / 1024 / 1024:>8.2f} {file_size / size:>6.2f} "
+                    f"{mb_per_s(size, export_s):>12.1f} {mb_per_s(size, import_s):>12.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# 将项目根目录添加到路径以便导入 core 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.catalog_index import CatalogIndex
+
+_CHARS = "像素小狗猫兔龙黄金星河霓虹赛博樱桃草莓奶牛抹茶熊冰雪企鹅幸运锦鲤彩虹独角兽复古机器人仙人掌奶茶波波元气鸭清新羊泡泡史莱姆"
+
+
+def make_catalog(n: int, seed: int = 7) -> dict:
+    """生成 n 条合成目录：2~6 字中文名 + 编号，价格 0~4 小时，约 5% 为卡密宠物"""
+    rnd = random.Random(seed)
+    items = {}
+    while len(items) < n:
+        name = "".join(rnd.choice(_CHARS) for _ in range(rnd.randint(2, 6))) + str(len(items))
+        cfg = {"price": rnd.randrange(0, 4 * 3600, 60), "description": "合成条目", "frames": ""}
+        if rnd.random() < 0.05:
+            cfg["unlock_type"] = "key"
+        items[name] = cfg
+    return items
+
+
+def naive_search(items: dict, query: str, price_max=None, sort: str = "default") -> list:
+    """基线：每次查询线性扫描目录字典"""
+    hits = [n for n, c in items.items() if query in n.lower() and (price_max is None or int(c.get("price", 0)) <= price_max)]
+    if sort == "price_asc":
+        hits.sort(key=lambda n: int(items[n].get("price", 0)))
+    return hits
+
+
+def _ms(samples: list) -> str:
+    return f"median {statistics.median(samples) * 1000:.3f} ms / max {max(samples) * 1000:.3f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="目录索引基准：构建、增量更新、输入联想与过滤")
+    parser.add_argument("-n", "--entries", type=int, default=10000, help="目录条目数（默认 10000）")
+    args = parser.parse_args()
+
+    items = make_catalog(args.entries)
+    t0 = time.perf_counter()
+    idx = CatalogIndex(items)
+    build = time.perf_counter() - t0
+    print(f"entries: {len(idx)}")
+    print(f"build: {build * 1000:.1f} ms")
+
+    # 增量更新：修改 1% 条目价格、删除 0.5%、新增 0.5%
+    rnd = random.Random(1)
+    reloaded = dict(items)
+    names = list(reloaded)
+    for name in rnd.sample(names, len(names) // 100):
+        reloaded[name] = dict(reloaded[name], price=int(reloaded[name]["price"]) + 60)
+    for name in rnd.sample(names, len(names) // 200):
+        reloaded.pop(name, None)
+    reloaded.update(make_catalog(len(names) // 200, seed=99))
+    t0 = time.perf_counter()
+    changed = idx.update(reloaded)
+    print(f"incremental update ({changed} changed): {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    # 输入联想：逐字输入查询词，每次按键一次查询
+    queries = ["像素小", "黄金星", "奶茶波波", "冰雪企"]
+    typeahead, baseline = [], []
+    for q in queries:
+        for i in range(1, len(q) + 1):
+            prefix = q[:i]
+            t0 = time.perf_counter()
+            got = idx.search(prefix)
+            typeahead.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            expect = naive_search(reloaded, prefix)
+            baseline.append(time.perf_counter() - t0)
+            assert got == expect, prefix
+    print(f"type-ahead (index): {_ms(typeahead)}")
+    print(f"type-ahead (naive): {_ms(baseline)}")
+
+    filtered, filtered_naive = [], []
+    for _ in range(20):
+        t0 = time.perf_counter()
+        got = idx.search("像", price_max=1800, sort="price_asc")
+        filtered.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        expect = naive_search(reloaded, "像", price_max=1800, sort="price_asc")
+        filtered_naive.append(time.perf_counter() - t0)
+    assert sorted(got) == sorted(expect)
+    print(f"search+price filter+sort (index): {_ms(filtered)}")
+    print(f"search+price filter+sort (naive): {_ms(filtered_naive)}")
+
+
+if __name__ == "__main__":
+    main()
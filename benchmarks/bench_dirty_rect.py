@@ -0,0 +1,92 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+# 将项目根目录添加到路径以便导入 core 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from core.pet import PetAnimator
+
+
+def make_sprite(path: str, size: int, frames: int, changed: int, seed: int = 5) -> None:
+    """生成 size x size 的合成精灵：首帧为实心图形，其余帧只在眼部附近改动 changed 个像素（模拟眨眼/摇尾）"""
+    rnd = random.Random(seed)
+    palette = {"bg": [0, 0, 0, 0], "body": [200, 160, 90, 255], "dark": [60, 40, 20, 255], "eye": [20, 20, 20, 255]}
+    c = size // 2
+    key = [["body" if (x - c) ** 2 + (y - c) ** 2 < (size * 0.4) ** 2 else "bg" for x in range(size)] for y in range(size)]
+    out = []
+    for k in range(frames):
+        px = [list(row) for row in key]
+        if k % 2:
+            ey = size // 3
+            for _ in range(changed):
+                x = c + rnd.randrange(-size // 8, size // 8)
+                y = ey + rnd.randrange(-2, 3)
+                px[y][x] = rnd.choice(["dark", "eye"])
+        out.append({"name": f"idle{k + 1}", "pixels": px})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"size": [size, size], "palette": palette, "frames": out}, f)
+
+
+def run(path: str, scale: float, ticks: int, root, partial: bool) -> dict:
+    """逐帧推送并统计每帧推送到 Tk 的字节数与耗时"""
+    pa = PetAnimator(path, scale=scale)
+    pushed, elapsed = [], []
+    for _ in range(ticks):
+        pa.next_frame()
+        t0 = time.perf_counter()
+        if partial:
+            pa.update_photo(root, dry_run=root is None)
+            pushed.append(pa.last_push_bytes)
+        else:
+            img = pa.get_image()
+            if root is not None:
+                pa.get_tk_image()
+            pushed.append(img.width * img.height * 4)
+        elapsed.append(time.perf_counter() - t0)
+    return {
+        "bytes_mean": statistics.mean(pushed[1:]),
+        "bytes_max": max(pushed[1:]),
+        "ms_median": statistics.median(elapsed[1:]) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="脏矩形局部更新基准：每帧推送到 Tk 的字节数")
+    parser.add_argument("--size", type=int, default=128, help="精灵边长（默认 128）")
+    parser.add_argument("--scale", type=float, default=5, help="缩放倍数（默认 5）")
+    parser.add_argument("--changed", type=int, default=12, help="每帧变化的像素数（默认 12）")
+    parser.add_argument("--ticks", type=int, default=200, help="帧数（默认 200）")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        root = None
+        print("no display: counting bytes only (Tk calls skipped)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sprite.json")
+        make_sprite(path, args.size, 8, args.changed)
+        print(f"sprite {args.size}x{args.size} @ {args.scale:g}x, {args.changed} px changed on odd frames")
+        for label, partial in (("full replace", False), ("dirty rect", True)):
+            r = run(path, args.scale, args.ticks, root, partial)
+            print(
+                f"{label:>12}: {r['bytes_mean'] / 1024:.1f} KiB/frame mean, "
+                f"{r['bytes_max'] / 1024:.1f} KiB max, {r['ms_median']:.3f} ms median"
+            )
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
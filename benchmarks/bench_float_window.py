@@ -0,0 +1,169 @@
+import argparse
+import array
+import gc
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# 将项目根目录添加到路径以便导入 core 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from core.clock import VirtualClock
+from core.data_manager import DataManager
+from core.float_window import FloatWindow, StaticFatigueSource
+from core.frame_cache import shared_frame_cache
+from core.runtime_tracker import RuntimeTracker
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PET = os.path.join(ROOT_DIR, "assets", "pets", "pixel_dog.json")
+HOUR_MS = 3600 * 1000
+
+
+class ScriptedFatigue(StaticFatigueSource):
+    """按虚拟时间循环的疲劳状态：正常 20 分钟 → 疲劳 5 分钟 → 无人脸 5 分钟"""
+
+    CYCLE = [(20, StaticFatigueSource.STATUS_NORMAL), (5, StaticFatigueSource.STATUS_FATIGUE), (5, StaticFatigueSource.STATUS_NO_FACE)]
+
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__()
+        self.clock = clock
+        self.period = sum(m for m, _ in self.CYCLE) * 60
+
+    def get_status(self):
+        t = self.clock.time() % self.period
+        for minutes, status in self.CYCLE:
+            if t < minutes * 60:
+                return status
+            t -= minutes * 60
+        return self.STATUS_NORMAL
+
+
+def percentile(sorted_values, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def schedule_user_events(fw: FloatWindow, clock: VirtualClock, rnd: random.Random) -> None:
+    """模拟用户操作：约每 30 秒点击互动一次，约每 10 分钟投喂一次（爱心动画）"""
+
+    def click() -> None:
+        fw.animator.interact_random()
+        clock.after(rnd.randint(20000, 40000), click)
+
+    def feed() -> None:
+        fw._bubble_hearts(6)
+        clock.after(rnd.randint(8 * 60000, 12 * 60000), feed)
+
+    clock.after(rnd.randint(20000, 40000), click)
+    clock.after(rnd.randint(8 * 60000, 12 * 60000), feed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="悬浮窗逐帧流程无界面基准：虚拟时钟加速模拟长时间运行")
+    parser.add_argument("--pet", default=DEFAULT_PET, help="宠物资源文件（默认 pixel_dog.json）")
+    parser.add_argument("--hours", type=float, default=8, help="模拟时长（小时，默认 8）")
+    parser.add_argument("--zoom", type=float, default=5, help="缩放倍数（默认 5）")
+    parser.add_argument("--alloc-ticks", type=int, default=2000, help="tracemalloc 统计的帧数（默认 2000）")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    random.seed(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        dm = DataManager(tmp)
+        dm.upsert_user("bench", {"total_run_time": 0, "pet_run_time": {}, "inventory": {"小鱼干": 999}, "settings": {}})
+        tracker = RuntimeTracker(dm)
+        clock = VirtualClock(start=time.time())
+        fw = FloatWindow(
+            root=None,
+            username="bench",
+            pet_frames_path=args.pet,
+            tracker=tracker,
+            data_manager=dm,
+            backend="null",
+            clock=clock,
+            fatigue=ScriptedFatigue(clock),
+            audio=False,
+        )
+        fw.update_settings({"warm_greetings": True, "pet_zoom": args.zoom})
+        schedule_user_events(fw, clock, rnd)
+
+        # 使用 array 存储耗时，避免统计本身每帧新增 float 对象
+        latencies = array.array("d")
+        tick = fw._tick
+
+        def on_callback(cb, elapsed: float) -> None:
+            if cb == tick:
+                latencies.append(elapsed)
+
+        clock.on_callback = on_callback
+
+        total_ms = int(args.hours * HOUR_MS)
+        print(f"{args.hours:g} h simulated, {args.zoom:g}x zoom, pet {os.path.basename(args.pet)}")
+        print(f"{'hour':>5} {'ticks':>8} {'p50 us':>8} {'p99 us':>8} {'gc objs':>9} {'blocks':>9} {'cache':>6} {'timers':>6}")
+        gc.collect()
+        blocks0 = sys.getallocatedblocks()
+        objs0 = len(gc.get_objects())
+        t_wall = time.perf_counter()
+        done = 0
+        hour = 0
+        while done < total_ms:
+            step = min(HOUR_MS, total_ms - done)
+            start = len(latencies)
+            clock.advance(step)
+            done += step
+            hour += 1
+            lat = sorted(latencies[start:])
+            print(
+                f"{hour:>5} {len(lat):>8} {percentile(lat, 50) * 1e6:>8.1f} {percentile(lat, 99) * 1e6:>8.1f} "
+                f"{len(gc.get_objects()):>9} {sys.getallocatedblocks():>9} "
+                f"{shared_frame_cache.stats()['entries']:>6} {clock.pending():>6}"
+            )
+        wall = time.perf_counter() - t_wall
+        gc.collect()
+        objs_growth = len(gc.get_objects()) - objs0
+        blocks_growth = sys.getallocatedblocks() - blocks0
+
+        # 分配统计：逐帧推进，记录每帧的临时分配峰值与净增长
+        tracemalloc.start()
+        transient, net = [], []
+        for _ in range(args.alloc_ticks):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            clock.advance(120)
+            cur, peak = tracemalloc.get_traced_memory()
+            transient.append(peak - before)
+            net.append(cur - before)
+        tracemalloc.stop()
+
+        lat = sorted(latencies)
+        print()
+        print(f"ticks {len(lat)} in {wall:.1f} s wall ({len(lat) / max(wall, 1e-9):.0f} ticks/s)")
+        print(
+            f"tick latency us: p50 {percentile(lat, 50) * 1e6:.1f}  p90 {percentile(lat, 90) * 1e6:.1f}  "
+            f"p99 {percentile(lat, 99) * 1e6:.1f}  p99.9 {percentile(lat, 99.9) * 1e6:.1f}  max {lat[-1] * 1e6:.1f}"
+        )
+        print(
+            f"alloc per tick: {statistics.mean(transient) / 1024:.1f} KiB transient peak, "
+            f"{statistics.mean(net):+.1f} B net ({args.alloc_ticks} ticks)"
+        )
+        print(
+            f"growth over run: {objs_growth:+d} gc objects, {blocks_growth:+d} allocated blocks; "
+            f"{fw.renderer.frames} frames presented, {fw.renderer.pushed_bytes / 1024 / 1024:.1f} MiB pushed"
+        )
+        fw.close()
+        dm.stop()
+
+
+if __name__ == "__main__":
+    main()
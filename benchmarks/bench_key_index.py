@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# 将项目根目录添加到路径以便导入 core 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_manager import DataManager
+from core.key_index import KeyIndex
+from core.license_manager import LicenseManager
+
+
+def naive_find(dm: DataManager, username: str, key: str):
+    """基线：逐个卡密宠物调用 verify_key，直到匹配"""
+    for name, cfg in dm.get_pets_view().items():
+        if cfg.get("unlock_type") == "key" and LicenseManager.verify_key(username, name, key):
+            return name
+    return None
+
+
+def _us(samples: list) -> str:
+    return f"{statistics.median(samples) * 1e6:9.1f} us"
+
+
+def timed(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="卡密兑换基准：逐宠物验证 vs 按用户预计算的密钥反查索引")
+    parser.add_argument("--sizes", default="10,100,1000,10000", help="卡密宠物数量列表（逗号分隔）")
+    parser.add_argument("--lookups", type=int, default=200, help="每种规模的查询次数（默认 200）")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    print(f"{'key pets':>8} {'naive hit':>12} {'naive miss':>12} {'index build':>12} {'index hit':>12} {'index miss':>12}")
+    for n in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        pets = {f"卡密宠物{i:05d}": {"price": 0, "unlock_type": "key", "frames": ""} for i in range(n)}
+        pets.update({f"普通宠物{i:05d}": {"price": 600, "frames": ""} for i in range(n)})
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "pets.json"), "w", encoding="utf-8") as f:
+                json.dump(pets, f, ensure_ascii=False)
+            dm = DataManager(tmp)
+            index = KeyIndex(dm, max_users=args.lookups)
+            names = [name for name, cfg in pets.items() if cfg.get("unlock_type") == "key"]
+            users = [f"user{i}" for i in range(args.lookups)]
+            cases = [(u, rnd.choice(names)) for u in users]
+            keys = [(u, LicenseManager.generate_key(u, p), p) for u, p in cases]
+            miss = "0000-0000-0000"
+
+            naive_hit = [timed(naive_find, dm, u, k) for u, k, _ in keys[:max(5, args.lookups // max(1, n // 100))]]
+            naive_miss = [timed(naive_find, dm, users[0], miss) for _ in range(max(3, len(naive_hit) // 2))]
+            build = [timed(index.find_pet, u, k) for u, k, _ in keys]
+            hit = [timed(index.find_pet, u, k) for u, k, _ in keys]
+            missing = [timed(index.find_pet, u, miss) for u in users]
+            assert all(index.find_pet(u, k) == p == naive_find(dm, u, k) for u, k, p in keys[:5])
+            assert index.find_pet(users[0], miss) is None
+            dm.stop()
+        print(f"{n:>8} {_us(naive_hit)} {_us(naive_miss)} {_us(build)} {_us(hit)} {_us(missing)}")
+
+
+if __name__ == "__main__":
+    main()
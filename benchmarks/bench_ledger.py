@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# 将项目根目录添加到路径以便导入 core 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ledger import Ledger
+
+KINDS = ("purchase", "transfer_out", "transfer_in", "unlock")
+
+
+def simulate(ledger: Ledger, hours: float, rnd: random.Random, t0: int) -> list:
+    """模拟 hours 小时的使用：每秒累计 1 秒运行时间，约每 10 分钟一次购买 / 转账 / 解锁
+    返回逐秒的 (时间, 余额) 真值，用于校验历史余额查询
+    """
+    balance = 0
+    truth = []
+    for i in range(int(hours * 3600)):
+        ts = t0 + i
+        balance += 1
+        ledger.accrue("alice", 1, balance, ts=ts)
+        if rnd.random() < 1 / 600:
+            kind = rnd.choice(KINDS)
+            delta = {"purchase": -min(balance, 300), "transfer_out": -min(balance, 60), "transfer_in": 120, "unlock": 0}[kind]
+            balance += delta
+            ledger.record("alice", kind, delta, balance, memo="bench", ts=ts)
+        truth.append((ts, balance))
+        if i % 1000 == 0:
+            ledger.flush()
+    ledger.flush(force=True)
+    return truth
+
+
+def full_scan_balance(path: str, ts: int) -> int:
+    """基线：从头扫描整个账本（与 balance_at 相同的批次内插值）"""
+    balance = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            entry = json.loads(raw)
+            start = entry.get("s", entry["t"])
+            if start > ts:
+                break
+            if entry["t"] > ts:
+                return entry["b"] - entry["d"] + entry["d"] * (ts - start + 1) // (entry["t"] - start + 1)
+            balance = entry["b"]
+    return balance
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="账本基准：按批合并的累计记录 vs 每秒一条，检查点历史余额查询 vs 全量扫描")
+    parser.add_argument("--hours", type=float, default=200, help="模拟使用时长（小时，默认 200）")
+    parser.add_argument("--queries", type=int, default=200, help="历史余额查询次数（默认 200）")
+    parser.add_argument("--seed", type=int, default=9)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    t0 = int(time.time()) - int(args.hours * 3600)
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = Ledger(tmp)
+        start = time.perf_counter()
+        truth = simulate(ledger, args.hours, rnd, t0)
+        elapsed = time.perf_counter() - start
+        path = ledger._state("alice").path
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            lines = sum(1 for _ in f)
+        per_second = len(json.dumps({"t": t0, "k": "accrual", "d": 1, "b": truth[-1][1]}, separators=(",", ":"))) + 1
+        print(f"{args.hours:g} h of accrual: {lines} lines, {size / 1024:.1f} KiB written "
+              f"(one entry per second would be {len(truth)} lines, ~{len(truth) * per_second / 1024:.0f} KiB); "
+              f"{elapsed / len(truth) * 1e6:.1f} us per tick")
+
+        samples = [rnd.choice(truth) for _ in range(args.queries)]
+        fresh = Ledger(tmp)
+        t = time.perf_counter()
+        fresh.balance("alice")
+        print(f"current balance after restart: {(time.perf_counter() - t) * 1000:.2f} ms (index load + tail scan), then O(1)")
+        indexed, scanned = [], []
+        for ts, expected in samples:
+            t = time.perf_counter()
+            got = fresh.balance_at("alice", ts)
+            indexed.append(time.perf_counter() - t)
+            assert got == expected, (ts, got, expected)
+        for ts, expected in samples[:20]:
+            t = time.perf_counter()
+            got = full_scan_balance(path, ts)
+            scanned.append(time.perf_counter() - t)
+            assert got == expected
+        print(f"balance_at: checkpoint {statistics.median(indexed) * 1000:.3f} ms, "
+              f"full scan {statistics.median(scanned) * 1000:.3f} ms (median)")
+
+
+if __name__ == "__main__":
+    main()
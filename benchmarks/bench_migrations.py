@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 将项目根目录添加到路径以便导入 core 模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from core.data_manager import DataManager
+from core.migrations import MIGRATIONS, load_schema
+
+
+def make_store(data_dir: str, n_users: int, rnd: random.Random) -> None:
+    """合成数据：约 10% 用户的 pet_run_time 仍以资源路径为键（旧版本遗留）"""
+    with open(os.path.join(ROOT_DIR, "data", "pets.json"), "r", encoding="utf-8") as f:
+        pets = json.load(f)
+    names = list(pets)
+    frames = [str(cfg.get("frames", "")) for cfg in pets.values()]
+    users = {}
+    for i in range(n_users):
+        prt = {rnd.choice(names): rnd.randint(0, 10 ** 5) for _ in range(rnd.randint(1, 8))}
+        if rnd.random() < 0.1:
+            prt[rnd.choice(frames)] = rnd.randint(0, 10 ** 4)
+        users[f"user{i:06d}"] = {"total_run_time": rnd.randint(0, 10 ** 6), "pet_run_time": prt}
+    with open(os.path.join(data_dir, "pets.json"), "w", encoding="utf-8") as f:
+        json.dump(pets, f, ensure_ascii=False)
+    with open(os.path.join(data_dir, "users.json"), "w", encoding="utf-8") as f:
+        json.dump(users, f, ensure_ascii=False, indent=2)
+
+
+def legacy_normalize(dm: DataManager) -> None:
+    """旧实现：每次启动对全部用户执行键名规范化"""
+    m = MIGRATIONS[0]
+    ctx = m.prepare(dm)
+    for username, user in dm.users_cache.items():
+        m.apply(username, user, ctx)
+
+
+def timed_start(data_dir: str) -> tuple:
+    t0 = time.perf_counter()
+    dm = DataManager(data_dir)
+    elapsed = time.perf_counter() - t0
+    dm.stop()
+    return elapsed, dm
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="数据迁移基准：每次启动规范化 vs 一次性迁移后启动")
+    parser.add_argument("--users", type=int, default=50000, help="合成用户数（默认 50000）")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_store(tmp, args.users, random.Random(args.seed))
+        first, dm = timed_start(tmp)
+        st = dm.migration_stats
+        print(f"{args.users} users; first start (runs migrations {st['from']} -> {st['to']}): {first * 1000:.0f} ms, "
+              f"migrations {st['seconds'] * 1000:.0f} ms, {st['changed']} user updates")
+        second, dm = timed_start(tmp)
+        t0 = time.perf_counter()
+        legacy_normalize(dm)
+        legacy = time.perf_counter() - t0
+        print(f"later starts: {second * 1000:.0f} ms total, migration work {dm.migration_stats['seconds'] * 1000:.2f} ms "
+              f"(old per-start normalization: {legacy * 1000:.0f} ms); schema {load_schema(dm.schema_path)}")
+
+
+if __name__ == "__main__":
+    main()
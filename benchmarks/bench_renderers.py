@@ -0,0 +1,103 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+# 将项目根目录添加到路径以便导入 core / benchmarks 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+# 无显示环境下使用 SDL 的 dummy 视频驱动（也可在 Xvfb 等虚拟显示下运行）
+if not os.environ.get("DISPLAY") and not sys.platform.startswith("win"):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from PIL import ImageTk
+
+from benchmarks.bench_dirty_rect import make_sprite
+from core.frame_cache import FrameCache
+from core.pet import PetAnimator
+from core.renderers import PygameRenderer
+
+
+def cpu_per_frame(step, ticks: int) -> float:
+    """执行 ticks 次 step，返回每帧 CPU 时间（毫秒，process_time 统计，含首帧）"""
+    t0 = time.process_time()
+    for _ in range(ticks):
+        step()
+    return (time.process_time() - t0) / ticks * 1000
+
+
+def bench_legacy(path: str, scale: float, ticks: int, root) -> float:
+    """旧路径：每帧 pygame -> PIL 转换 + 缩放 + 新建 PhotoImage（不缓存）"""
+    pa = PetAnimator(path, scale=scale, cache=FrameCache(0))
+
+    def step() -> None:
+        pa.next_frame()
+        img = pa.get_image()
+        if root is not None:
+            ImageTk.PhotoImage(img, master=root)
+
+    return cpu_per_frame(step, ticks)
+
+
+def bench_tk_live(path: str, scale: float, ticks: int, root) -> float:
+    """Tk 后端：缓存缩放帧 + 持久 PhotoImage 脏矩形更新"""
+    pa = PetAnimator(path, scale=scale, cache=FrameCache())
+
+    def step() -> None:
+        pa.next_frame()
+        pa.update_photo(root, dry_run=root is None)
+
+    return cpu_per_frame(step, ticks)
+
+
+def bench_pygame(path: str, scale: float, ticks: int) -> float:
+    """pygame 后端：缓存缩放 Surface 直接 blit 到 SDL 窗口"""
+    pa = PetAnimator(path, scale=scale, cache=FrameCache())
+    renderer = PygameRenderer(None, pa.w, pa.h)
+
+    def step() -> None:
+        pa.next_frame()
+        renderer.present(pa)
+
+    try:
+        return cpu_per_frame(step, ticks)
+    finally:
+        renderer.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="悬浮窗渲染后端 CPU 基准：旧 Tk 路径 / Tk 脏矩形 / pygame blit")
+    parser.add_argument("--size", type=int, default=64, help="精灵边长（默认 64）")
+    parser.add_argument("--scale", type=float, default=5, help="缩放倍数（默认 5）")
+    parser.add_argument("--changed", type=int, default=12, help="每帧变化的像素数（默认 12）")
+    parser.add_argument("--ticks", type=int, default=300, help="帧数（默认 300）")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        root = None
+        print("no Tk display: Tk rows exclude PhotoImage creation / Tk put calls")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sprite.json")
+        make_sprite(path, args.size, 8, args.changed)
+        print(f"sprite {args.size}x{args.size} @ {args.scale:g}x, {args.ticks} frames, CPU ms/frame")
+        print(f"{'tk legacy':>12}: {bench_legacy(path, args.scale, args.ticks, root):.3f}")
+        print(f"{'tk live':>12}: {bench_tk_live(path, args.scale, args.ticks, root):.3f}")
+        try:
+            ms = bench_pygame(path, args.scale, args.ticks)
+            driver = os.environ.get("SDL_VIDEODRIVER", "default")
+            print(f"{'pygame':>12}: {ms:.3f}  (SDL video driver: {driver})")
+        except Exception as e:
+            print(f"{'pygame':>12}: unavailable ({e})")
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import filecmp
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+# 将项目根目录添加到路径以便导入 core 模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from core.snapshot_repo import SnapshotRepo
+
+
+def make_users(n: int, rnd: random.Random) -> dict:
+    """合成用户数据：运行时间、粮仓、已解锁宠物与已用卡密"""
+    users = {}
+    for i in range(n):
+        users[f"user{i:05d}"] = {
+            "password_hash": "%064x" % rnd.getrandbits(256),
+            "total_run_time": rnd.randint(0, 10 ** 6),
+            "pet_run_time": {f"pet{j}": rnd.randint(0, 10 ** 5) for j in range(rnd.randint(1, 8))},
+            "unlocked_pets": [f"pet{j}" for j in range(rnd.randint(1, 8))],
+            "inventory": {f"food{j}": rnd.randint(0, 99) for j in range(rnd.randint(0, 12))},
+            "used_transfer_keys": ["%032x" % rnd.getrandbits(128) for _ in range(rnd.randint(0, 20))],
+            "settings": {"pet_zoom": 5, "warm_greetings": True},
+        }
+    return users
+
+
+def write_users(data_dir: str, users: dict) -> None:
+    """与 DataManager 相同的写法（indent=2 + 原子替换）"""
+    path = os.path.join(data_dir, "users.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(users, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def report(name: str, info: dict) -> None:
+    st = info["stats"]
+    added = st["new_bytes"] + st["manifest_bytes"]
+    print(
+        f"{name:>22}: {st['seconds'] * 1000:8.1f} ms  +{added / 1024:9.1f} KiB  "
+        f"({st['new_chunks']}/{st['chunks']} new chunks in changed files, {st['reused_files']}/{st['files']} files unchanged)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="增量快照基准：首次 / 未变化 / 修改一个用户 / 新增用户 的耗时与新增存储")
+    parser.add_argument("--users", type=int, default=20000, help="合成用户数（默认 20000）")
+    parser.add_argument("--assets", action="store_true", help="同时快照项目 assets/ 目录")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, "app")
+        data_dir = os.path.join(base, "data")
+        os.makedirs(data_dir)
+        for fn in ("pets.json", "foods.json", "config.json"):
+            src = os.path.join(ROOT_DIR, "data", fn)
+            if os.path.exists(src):
+                shutil.copy2(src, data_dir)
+        sources = ["data"]
+        if args.assets:
+            shutil.copytree(os.path.join(ROOT_DIR, "assets"), os.path.join(base, "assets"))
+            sources.append("assets")
+        users = make_users(args.users, rnd)
+        write_users(data_dir, users)
+        size = sum(os.path.getsize(os.path.join(dp, fn)) for src in sources for dp, _, fns in os.walk(os.path.join(base, src)) for fn in fns)
+        print(f"{args.users} users, {size / 1024 / 1024:.1f} MiB in {', '.join(sources)}")
+
+        repo = SnapshotRepo(os.path.join(tmp, "repo"))
+        report("initial", repo.create(sources, base_dir=base))
+        report("unchanged", repo.create(sources, base_dir=base))
+
+        name = rnd.choice(list(users))
+        users[name]["total_run_time"] += 3600
+        users[name]["inventory"]["food1"] = 42
+        write_users(data_dir, users)
+        report("one user modified", repo.create(sources, base_dir=base))
+
+        for i in range(10):
+            users[f"new{i:03d}"] = make_users(1, rnd)["user00000"]
+        write_users(data_dir, users)
+        last = repo.create(sources, base_dir=base)
+        report("10 users added", last)
+
+        restore_dir = os.path.join(tmp, "restore")
+        repo.restore(last["id"], target_dir=restore_dir)
+        same = filecmp.cmp(os.path.join(data_dir, "users.json"), os.path.join(restore_dir, "data", "users.json"), shallow=False)
+        stats = repo.stats()
+        print(f"repo: {stats['objects']} objects, {stats['object_bytes'] / 1024:.1f} KiB for {stats['snapshots']} snapshots; restore {'ok' if same else 'MISMATCH'}")
+        if not same:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 将项目根目录添加到路径以便导入 core 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from core.clock import VirtualClock
+from core.data_manager import DataManager
+from core.float_window import FloatWindow, StaticFatigueSource
+from core.runtime_tracker import RuntimeTracker
+from core.timer_wheel import TimerWheel
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PET = os.path.join(ROOT_DIR, "assets", "pets", "pixel_dog.json")
+HOUR_MS = 3600 * 1000
+WATCH_POLL_MS = 500  # 与 AssetWatcher.POLL_INTERVAL_MS 相同
+
+
+def idle_session(pet: str, hours: float, use_wheel: bool) -> dict:
+    """空闲的无界面宠物：动画 tick、问候、计时、落盘与热加载轮询，返回驱动唤醒次数"""
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = VirtualClock(start=time.time())
+        wheel = TimerWheel(clock) if use_wheel else None
+        sched = wheel if use_wheel else clock
+        dm = DataManager(tmp, scheduler=wheel)
+        dm.upsert_user("bench", {"total_run_time": 0, "pet_run_time": {}, "inventory": {}, "settings": {}})
+        tracker = RuntimeTracker(dm, scheduler=wheel)
+        fw = FloatWindow(
+            root=None,
+            username="bench",
+            pet_frames_path=pet,
+            tracker=tracker,
+            data_manager=dm,
+            backend="null",
+            clock=sched,
+            fatigue=StaticFatigueSource(StaticFatigueSource.STATUS_NORMAL),
+            audio=False,
+        )
+        fw.update_settings({"warm_greetings": True})
+
+        def poll() -> None:
+            sched.after(WATCH_POLL_MS, poll)
+
+        sched.after(WATCH_POLL_MS, poll)
+        total_ms = int(hours * HOUR_MS)
+        t0 = time.perf_counter()
+        ran = clock.advance(total_ms)
+        wall = time.perf_counter() - t0
+        seconds = total_ms / 1000.0
+        # 独立调度：计时线程与写线程各每秒醒来一次；时间轮：只有写线程在落盘信号到来时醒来
+        threads = 1 if use_wheel else 2
+        result = {
+            "driver": ran / seconds,
+            "threads": threads,
+            "total": ran / seconds + threads,
+            "run_time": int(dm.get_user("bench").get("total_run_time", 0)),
+            "wall": wall,
+        }
+        if wheel is not None:
+            result.update(wheel.stats())
+        fw.close()
+        dm.stop()
+        return result
+
+
+def bench_schedule(n: int, seed: int) -> dict:
+    """登记 / 取消吞吐：n 个随机延时定时器，取消一半后推进到全部到期"""
+    rnd = random.Random(seed)
+    clock = VirtualClock()
+    wheel = TimerWheel(clock)
+    noop = lambda: None
+    delays = [rnd.choice((rnd.randint(0, 500), rnd.randint(0, 60000), rnd.randint(0, 3 * HOUR_MS))) for _ in range(n)]
+    t0 = time.perf_counter()
+    handles = [wheel.call_later(d, noop) for d in delays]
+    t1 = time.perf_counter()
+    for h in handles[::2]:
+        h.cancel()
+    t2 = time.perf_counter()
+    clock.advance(3 * HOUR_MS + 1000)
+    t3 = time.perf_counter()
+    return {
+        "schedule": n / (t1 - t0),
+        "cancel": (n // 2) / max(t2 - t1, 1e-9),
+        "fire": wheel.fired / max(t3 - t2, 1e-9),
+        "wakeups": wheel.wakeups,
+        "pending": wheel.pending(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="统一时间轮基准：空闲悬浮窗每秒唤醒次数，以及定时器登记 / 取消吞吐")
+    parser.add_argument("--pet", default=DEFAULT_PET, help="宠物资源文件（默认 pixel_dog.json）")
+    parser.add_argument("--hours", type=float, default=1, help="模拟时长（小时，默认 1）")
+    parser.add_argument("--timers", type=int, default=100000, help="吞吐测试的定时器数量（默认 100000）")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print(f"idle pet, {args.hours:g} h simulated: wake-ups per second")
+    print(f"{'scheduler':>12} {'driver':>8} {'threads':>8} {'total':>8} {'run_time':>9} {'wall s':>7}")
+    for name, use_wheel in (("separate", False), ("timer wheel", True)):
+        random.seed(args.seed)
+        r = idle_session(args.pet, args.hours, use_wheel)
+        print(f"{name:>12} {r['driver']:>8.2f} {r['threads']:>8d} {r['total']:>8.2f} {r['run_time']:>9d} {r['wall']:>7.2f}")
+        if use_wheel:
+            print(f"{'':>12} fired {r['fired']}, coalesced {r['coalesced']}, pending {r['pending']}")
+
+    r = bench_schedule(args.timers, args.seed)
+    print()
+    print(
+        f"{args.timers} timers: schedule {r['schedule']:.0f}/s, cancel {r['cancel']:.0f}/s, "
+        f"fire {r['fire']:.0f}/s, {r['wakeups']} driver wake-ups, {r['pending']} pending after run"
+    )
+
+
+if __name__ == "__main__":
+    main()
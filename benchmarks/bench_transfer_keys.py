@@ -0,0 +1,76 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# 将项目根目录添加到路径以便导入 core 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_manager import DataManager
+from core.license_manager import LicenseManager
+
+
+def legacy_is_used(user: dict, key: str) -> bool:
+    """旧实现：每次把已用列表转成集合再查询"""
+    return key in set(user.get("used_transfer_keys", []))
+
+
+def legacy_mark(user: dict, key: str) -> None:
+    """旧实现：转集合、加入后整体写回列表"""
+    used = set(user.get("used_transfer_keys", []))
+    used.add(key)
+    user["used_transfer_keys"] = list(used)
+
+
+def _us(samples: list) -> str:
+    return f"{statistics.median(samples) * 1e6:10.1f} us"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="转账卡密防重放基准：旧的列表转集合 vs 摘要索引（含有效期清理）")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="历史已用卡密数量列表（逗号分隔）")
+    parser.add_argument("--ops", type=int, default=50, help="每种规模的检查 + 登记次数（默认 50）")
+    args = parser.parse_args()
+
+    now = int(time.time())
+    print(f"{'history':>8} {'legacy check':>13} {'legacy mark':>13} {'index check':>13} {'index mark':>13} {'stored (index)':>15}")
+    for n in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        # 历史卡密按登记顺序均匀分布在过去 90 天内；有效期 30 天，约三分之二在首次登记时被清理
+        history = [f"TR-{i:08d}-{i:012X}" for i in range(n)]
+        stamps = [now - ((n - 1 - i) * 90 * 86400) // max(1, n) for i in range(n)]
+        keys = [LicenseManager.generate_transfer_key("alice", f"bob{i}", 60) for i in range(args.ops)]
+
+        legacy_user = {"used_transfer_keys": list(history)}
+        legacy_check, legacy_marks = [], []
+        for key in keys:
+            t0 = time.perf_counter()
+            legacy_is_used(legacy_user, key)
+            legacy_check.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            legacy_mark(legacy_user, key)
+            legacy_marks.append(time.perf_counter() - t0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            dm = DataManager(tmp)
+            used = {DataManager.transfer_key_digest(k): ts for k, ts in zip(history, stamps)}
+            dm.upsert_user("bob", {"total_run_time": 0, "used_transfer_keys": used})
+            index_check, index_marks = [], []
+            for key in keys:
+                ts = LicenseManager.transfer_key_ts(key)
+                t0 = time.perf_counter()
+                status = dm.transfer_key_status("bob", key, ts)
+                index_check.append(time.perf_counter() - t0)
+                assert status == "ok"
+                t0 = time.perf_counter()
+                dm.mark_transfer_key_used("bob", key, ts)
+                index_marks.append(time.perf_counter() - t0)
+                assert dm.transfer_key_status("bob", key, ts) == "used"
+            stored = len(dm.get_user("bob")["used_transfer_keys"])
+            dm.stop()
+        print(f"{n:>8} {_us(legacy_check)} {_us(legacy_marks)} {_us(index_check)} {_us(index_marks)} {stored:>15}")
+
+
+if __name__ == "__main__":
+    main()
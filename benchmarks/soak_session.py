@@ -0,0 +1,263 @@
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tkinter as tk
+import tracemalloc
+from typing import Dict, List, Optional
+
+# 将项目根目录添加到路径以便导入 core / ui 模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from core.clock import VirtualClock
+from core.data_manager import DataManager
+from core.float_window import FloatWindow, StaticFatigueSource
+from core.renderers import PointerEvent
+from core.runtime_tracker import RuntimeTracker
+
+HOUR_MS = 3600 * 1000
+USERNAME = "soak"
+PAGES = ["home", "mall", "inventory", "settings", "account"]
+
+# 每模拟小时允许的增长量（第 1 小时为预热，不计入）
+DEFAULT_LIMITS = {
+    "widgets": 2.0,
+    "canvas_items": 2.0,
+    "tk_images": 1.0,
+    "traced_kib": 256.0,
+    "threads": 0.5,
+    "tracker_subs": 0.0,
+    "timers": 1.0,
+}
+
+
+def count_widgets(w: tk.Misc) -> int:
+    return 1 + sum(count_widgets(c) for c in w.winfo_children())
+
+
+def count_canvas_items(w: tk.Misc) -> int:
+    n = len(w.find_all()) if isinstance(w, tk.Canvas) else 0
+    return n + sum(count_canvas_items(c) for c in w.winfo_children())
+
+
+def collect(root: Optional[tk.Misc], tracker: RuntimeTracker, clock: VirtualClock) -> Dict[str, float]:
+    """采集一次资源计数"""
+    m: Dict[str, float] = {
+        "traced_kib": tracemalloc.get_traced_memory()[0] / 1024,
+        "threads": threading.active_count(),
+        "tracker_subs": tracker.subscriber_count,
+        "timers": clock.pending(),
+    }
+    if root is not None:
+        m["widgets"] = count_widgets(root)
+        m["canvas_items"] = count_canvas_items(root)
+        m["tk_images"] = len(root.tk.call("image", "names"))
+    return m
+
+
+def prepare_data(tmp: str) -> None:
+    """在临时目录准备目录配置与一个已解锁全部宠物、粮仓充足的测试用户"""
+    for fn in ("pets.json", "foods.json"):
+        src = os.path.join(ROOT_DIR, "data", fn)
+        if os.path.exists(src):
+            shutil.copy(src, os.path.join(tmp, fn))
+    dm = DataManager(tmp)
+    dm.upsert_user(USERNAME, {
+        "total_run_time": 10 ** 7,
+        "pet_run_time": {},
+        "unlocked_pets": list(dm.get_pets()),
+        "inventory": {name: 10 ** 6 for name in dm.get_foods()},
+        "settings": {"warm_greetings": True},
+    })
+    dm.stop()
+
+
+def schedule_actions(fw: FloatWindow, app, dm: DataManager, clock: VirtualClock, rnd: random.Random) -> Dict[str, int]:
+    """按虚拟时间高频模拟用户操作，返回各操作的执行次数"""
+    counts = {"click": 0, "menu": 0, "page": 0, "feed": 0, "switch": 0, "greeting_closed": 0}
+    pets = [(n, cfg.get("frames", "")) for n, cfg in dm.get_pets().items()
+            if os.path.exists(cfg.get("frames", "").replace("\\", "/"))]
+    foods = list(dm.get_foods())
+
+    def every(ms: int, fn) -> None:
+        def run() -> None:
+            try:
+                fn()
+            except Exception as e:
+                print(f"soak action failed: {fn.__name__}: {e}")
+            clock.after(int(ms * rnd.uniform(0.5, 1.5)), run)
+        clock.after(int(ms * rnd.uniform(0.5, 1.5)), run)
+
+    def click() -> None:
+        x, y = fw.renderer.position()
+        fw._on_press(PointerEvent(10, 10, x + 10, y + 10))
+        fw._on_release(PointerEvent(10, 10, x + 10, y + 10))
+        counts["click"] += 1
+
+    def menu() -> None:
+        if fw.top is None:
+            fw._update_menu()
+        else:
+            x, y = fw.renderer.position()
+            try:
+                fw._show_menu(PointerEvent(10, 10, x + 10, y + 10))
+            finally:
+                if fw.menu is not None:
+                    fw.menu.hide()
+        counts["menu"] += 1
+
+    def page() -> None:
+        app.show(rnd.choice(PAGES))
+        counts["page"] += 1
+
+    def feed() -> None:
+        if foods:
+            fw._feed_item(rnd.choice(foods))
+            counts["feed"] += 1
+
+    def switch() -> None:
+        if pets:
+            name, path = rnd.choice(pets)
+            fw._switch_pet(name, path)
+            counts["switch"] += 1
+
+    def close_greeting() -> None:
+        if fw._greeting_win is not None:
+            fw._close_greeting()
+            counts["greeting_closed"] += 1
+
+    every(5000, click)
+    every(45000, menu)
+    every(60000, feed)
+    every(300000, switch)
+    every(40000, close_greeting)
+    if app is not None:
+        every(20000, page)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="长时间运行泄漏浸泡测试：虚拟时钟高速驱动点击、切页、投喂、换宠与问候")
+    parser.add_argument("--hours", type=float, default=8, help="模拟时长（小时，默认 8）")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--headless", action="store_true", help="不创建 Tk 界面（无界面后端，只统计内存 / 线程 / 定时器）")
+    for key, limit in DEFAULT_LIMITS.items():
+        parser.add_argument(f"--max-{key.replace('_', '-')}", type=float, default=limit, help=f"{key} 每小时增长上限（默认 {limit:g}）")
+    args = parser.parse_args()
+    os.chdir(ROOT_DIR)
+
+    rnd = random.Random(args.seed)
+    random.seed(args.seed)
+    tmp = tempfile.mkdtemp(prefix="pet_soak_")
+    prepare_data(tmp)
+    tracemalloc.start()
+    clock = VirtualClock(start=time.time())
+    app = None
+    root = None
+    if not args.headless:
+        try:
+            from main import AppController
+
+            app = AppController(data_dir=tmp)
+            root = app.root
+        except tk.TclError as e:
+            print(f"no Tk display ({e}); running headless")
+
+    if app is not None:
+        dm, tracker = app.dm, app.tracker
+        app.set_current_user(USERNAME)
+        app.show("home")
+    else:
+        dm = DataManager(tmp)
+        tracker = RuntimeTracker(dm)
+
+    pets = dm.get_pets()
+    first = next(iter(pets.values()), {}).get("frames", os.path.join("assets", "pets", "pixel_dog.json"))
+    fw = FloatWindow(
+        root=root,
+        username=USERNAME,
+        pet_frames_path=first,
+        tracker=tracker,
+        data_manager=dm,
+        backend="tk" if root is not None else "null",
+        clock=clock,
+        fatigue=StaticFatigueSource(StaticFatigueSource.STATUS_NORMAL),
+        audio=False,
+    )
+    if app is not None:
+        app.float_window = fw
+    fw.update_settings({"warm_greetings": True, "pet_zoom": 4})
+    counts = schedule_actions(fw, app, dm, clock, rnd)
+
+    print(f"soak {args.hours:g} h simulated ({'tk' if root is not None else 'headless'})")
+    samples: List[Dict[str, float]] = []
+    snapshots = []
+    snapshot_kib = 0.0  # 基线快照自身占用的内存，从之后的采样中扣除
+    total_ms = int(args.hours * HOUR_MS)
+    done = 0
+    t_wall = time.perf_counter()
+    while done < total_ms:
+        step = min(1000, total_ms - done)
+        clock.advance(step)
+        done += step
+        if root is not None:
+            root.update()
+        if done % HOUR_MS == 0 or done == total_ms:
+            m = collect(root, tracker, clock)
+            m["traced_kib"] -= snapshot_kib
+            samples.append(m)
+            if len(samples) == 1 or done == total_ms:
+                before = tracemalloc.get_traced_memory()[0]
+                snapshots.append(tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]))
+                if len(samples) == 1:
+                    snapshot_kib = (tracemalloc.get_traced_memory()[0] - before) / 1024
+            print(f"  hour {done / HOUR_MS:5.2f}: " + "  ".join(f"{k} {v:.0f}" for k, v in m.items()))
+    wall = time.perf_counter() - t_wall
+    print(f"{wall:.1f} s wall; actions: " + ", ".join(f"{k} {v}" for k, v in counts.items()))
+
+    failures = []
+    if len(samples) >= 2:
+        hours = max(1e-9, (total_ms - HOUR_MS) / HOUR_MS)
+        base, last = samples[0], samples[-1]
+        for key, limit in DEFAULT_LIMITS.items():
+            if key not in base:
+                continue
+            limit = getattr(args, f"max_{key}")
+            rate = (last[key] - base[key]) / hours
+            status = "FAIL" if rate > limit else "ok"
+            print(f"  {key:>13}: {rate:+9.2f}/h (limit {limit:g})  {status}")
+            if rate > limit:
+                failures.append(key)
+        if len(snapshots) == 2:
+            print("top allocation growth since hour 1:")
+            for stat in snapshots[1].compare_to(snapshots[0], "lineno")[:5]:
+                print(f"  {stat}")
+    else:
+        print("run at least 2 simulated hours to measure growth")
+
+    try:
+        fw.close()
+    except Exception:
+        pass
+    if app is not None:
+        app._on_close()
+    else:
+        dm.stop()
+    shutil.rmtree(tmp, ignore_errors=True)
+    if failures:
+        print("soak FAILED: " + ", ".join(failures))
+        sys.exit(1)
+    print("soak passed")
+
+
+if __name__ == "__main__":
+    main()
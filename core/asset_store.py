@@ -0,0 +1,251 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+RGBA = Tuple[int, int, int, int]
+TRANSPARENT: RGBA = (0, 0, 0, 0)
+
+
+def _digest(data: bytes) -> str:
+    """内容哈希（sha1 前 16 位十六进制，资源库规模下足以避免碰撞）"""
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def _pack_z(data: bytes) -> str:
+    return base64.b64encode(zlib.compress(data, 9)).decode("ascii")
+
+
+def _unpack_z(text: str) -> bytes:
+    return zlib.decompress(base64.b64decode(text))
+
+
+class AssetStore:
+    """内容寻址资源库：调色板与帧按内容哈希存放在同一个 pack 文件中，相同内容只存一份
+    结构（<root>/pack.json）：
+        {"version": 1,
+         "palettes": {哈希: [[r, g, b, a], ...]},            # 0 号固定为透明色
+         "frames":   {哈希: {"w": 32, "h": 32, "z": ...}       # 关键帧：zlib 压缩的调色板下标
+                      或 {"w", "h", "base": 关键帧哈希, "d": ...}}}  # 差分帧：与关键帧下标逐字节异或后压缩
+    宠物资源文件只保存引用（"format": "cas"）：
+        {"format": "cas", "store": "../store", "size": [w, h], "palette": 哈希,
+         "frames": [{"name": "idle1", "ref": 帧哈希}, ...]}
+    说明：
+        - 帧内容只包含调色板下标，不同宠物只要下标相同即可共享同一帧对象
+        - 调色板按颜色排序规范化，颜色集合相同的宠物共享同一调色板
+        - 解码结果按 (调色板, 帧) 与 (调色板, 行) 驻留复用，返回的帧为共享只读对象
+    """
+
+    PACK_NAME = "pack.json"
+    VERSION = 1
+
+    _instances: Dict[str, "AssetStore"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.pack_path = os.path.join(root, self.PACK_NAME)
+        self._lock = threading.RLock()
+        self._palettes: Dict[str, List[List[int]]] = {}
+        self._frames: Dict[str, Dict[str, Any]] = {}
+        self._pack_sig: Optional[Tuple[int, int]] = None
+        self._dirty = False
+        # 解码缓存
+        self._raw_cache: Dict[str, bytes] = {}
+        self._rows: Dict[Tuple[str, bytes], List[RGBA]] = {}
+        self._decoded: Dict[Tuple[str, str], List[List[RGBA]]] = {}
+        self._load()
+
+    @classmethod
+    def open(cls, root: str) -> "AssetStore":
+        """获取指定目录的共享实例（进程内复用解码缓存）；pack 文件变化时自动重新加载"""
+        key = os.path.abspath(root)
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls(key)
+                cls._instances[key] = store
+                return store
+        store.reload_if_changed()
+        return store
+
+    # ===== 读取 =====
+
+    def _stat_sig(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.pack_path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _load(self) -> None:
+        sig = self._stat_sig()
+        data: Dict[str, Any] = {}
+        if sig is not None:
+            try:
+                with open(self.pack_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception:
+                data = {}
+        self._palettes = dict(data.get("palettes", {}))
+        self._frames = dict(data.get("frames", {}))
+        self._pack_sig = sig
+        self._dirty = False
+        self._raw_cache.clear()
+        self._rows.clear()
+        self._decoded.clear()
+
+    def reload_if_changed(self) -> bool:
+        """pack 文件被外部改写时重新加载并清空解码缓存，返回是否重新加载"""
+        with self._lock:
+            if self._dirty or self._stat_sig() == self._pack_sig:
+                return False
+            self._load()
+            return True
+
+    def has_frame(self, frame_hash: str) -> bool:
+        return frame_hash in self._frames
+
+    def palette(self, palette_hash: str) -> List[RGBA]:
+        """返回调色板颜色列表（0 号为透明色）"""
+        return [tuple(int(c) for c in rgba) for rgba in self._palettes.get(palette_hash, [list(TRANSPARENT)])]
+
+    def frame_indices(self, frame_hash: str) -> Tuple[int, int, bytes]:
+        """还原帧的调色板下标字节（差分帧与其关键帧异或），返回 (w, h, 下标字节)"""
+        with self._lock:
+            obj = self._frames[frame_hash]
+            w, h = int(obj["w"]), int(obj["h"])
+            raw = self._raw_cache.get(frame_hash)
+            if raw is None:
+                if "base" in obj:
+                    _, _, base = self.frame_indices(obj["base"])
+                    delta = _unpack_z(obj["d"])
+                    raw = (int.from_bytes(base, "little") ^ int.from_bytes(delta, "little")).to_bytes(w * h, "little")
+                else:
+                    raw = _unpack_z(obj["z"])
+                self._raw_cache[frame_hash] = raw
+            return w, h, raw
+
+    def decode_frame(self, palette_hash: str, frame_hash: str) -> List[List[RGBA]]:
+        """解码为 [row][col] -> RGBA 的帧；相同帧与相同行在进程内共享同一对象"""
+        key = (palette_hash, frame_hash)
+        with self._lock:
+            frame = self._decoded.get(key)
+            if frame is not None:
+                return frame
+            w, h, raw = self.frame_indices(frame_hash)
+            colors = self.palette(palette_hash)
+            n = len(colors)
+            frame = []
+            for y in range(h):
+                row_bytes = raw[y * w:(y + 1) * w]
+                row_key = (palette_hash, row_bytes)
+                row = self._rows.get(row_key)
+                if row is None:
+                    row = [colors[i] if i < n else TRANSPARENT for i in row_bytes]
+                    self._rows[row_key] = row
+                frame.append(row)
+            self._decoded[key] = frame
+            return frame
+
+    # ===== 写入 =====
+
+    def put_palette(self, colors: Sequence[Sequence[int]]) -> str:
+        """登记调色板（0 号须为透明色），返回哈希"""
+        norm = [[int(c) for c in rgba] for rgba in colors]
+        h = _digest(json.dumps(norm, separators=(",", ":")).encode("utf-8"))
+        with self._lock:
+            if h not in self._palettes:
+                self._palettes[h] = norm
+                self._dirty = True
+        return h
+
+    def put_frame(self, w: int, h: int, raw: bytes, base: Optional[str] = None) -> str:
+        """登记帧（调色板下标字节）；提供关键帧且差分更小时按差分存储，返回哈希"""
+        fh = _digest(f"{w}x{h}:".encode("ascii") + raw)
+        with self._lock:
+            if fh in self._frames:
+                return fh
+            obj: Dict[str, Any] = {"w": w, "h": h, "z": _pack_z(raw)}
+            if base is not None and base != fh and base in self._frames:
+                bw, bh, base_raw = self.frame_indices(base)
+                if (bw, bh) == (w, h) and "base" not in self._frames[base]:
+                    delta = (int.from_bytes(raw, "little") ^ int.from_bytes(base_raw, "little")).to_bytes(w * h, "little")
+                    d = _pack_z(delta)
+                    if len(d) < len(obj["z"]):
+                        obj = {"w": w, "h": h, "base": base, "d": d}
+            self._frames[fh] = obj
+            self._raw_cache[fh] = bytes(raw)
+            self._dirty = True
+        return fh
+
+    def add_frames(self, w: int, h: int, frames: Iterable[Tuple[str, List[List[RGBA]]]]) -> Dict[str, Any]:
+        """
+        将一组 RGBA 帧写入资源库，返回可直接保存为宠物资源文件的引用结构（不含 store 字段）
+        - alpha 为 0 的像素统一视为透明色
+        - 首帧作为关键帧，其余帧尝试以差分存储
+        """
+        frames = list(frames)
+        colors = sorted({px for _, fr in frames for row in fr for px in row if px[3] != 0})
+        if len(colors) > 255:
+            raise ValueError(f"颜色数 {len(colors)} 超过 255，无法以单字节下标存储")
+        palette = [TRANSPARENT] + colors
+        index = {c: i for i, c in enumerate(palette)}
+        pal_hash = self.put_palette(palette)
+        refs = []
+        key_hash: Optional[str] = None
+        for name, fr in frames:
+            raw = bytes(index.get(px, 0) if px[3] != 0 else 0 for row in fr for px in row)
+            fh = self.put_frame(w, h, raw, base=key_hash)
+            if key_hash is None:
+                key_hash = fh
+            refs.append({"name": name, "ref": fh})
+        return {"format": "cas", "size": [w, h], "palette": pal_hash, "frames": refs}
+
+    def prune(self, palettes: Iterable[str], frames: Iterable[str]) -> int:
+        """只保留被引用的对象（差分帧依赖的关键帧一并保留），返回删除的对象数"""
+        with self._lock:
+            keep_frames = set(f for f in frames if f in self._frames)
+            keep_frames |= {self._frames[f]["base"] for f in list(keep_frames) if "base" in self._frames[f]}
+            keep_palettes = set(palettes)
+            removed = 0
+            for fh in [f for f in self._frames if f not in keep_frames]:
+                del self._frames[fh]
+                self._raw_cache.pop(fh, None)
+                removed += 1
+            for ph in [p for p in self._palettes if p not in keep_palettes]:
+                del self._palettes[ph]
+                removed += 1
+            if removed:
+                self._decoded.clear()
+                self._rows.clear()
+                self._dirty = True
+            return removed
+
+    def save(self) -> bool:
+        """原子写入 pack 文件；无变化时不写盘，返回是否写入"""
+        with self._lock:
+            if not self._dirty:
+                return False
+            os.makedirs(self.root, exist_ok=True)
+            data = {"version": self.VERSION, "palettes": self._palettes, "frames": self._frames}
+            tmp_path = f"{self.pack_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+            os.replace(tmp_path, self.pack_path)
+            self._pack_sig = self._stat_sig()
+            self._dirty = False
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        """对象数量统计：调色板、关键帧、差分帧"""
+        with self._lock:
+            deltas = sum(1 for obj in self._frames.values() if "base" in obj)
+            return {
+                "palettes": len(self._palettes),
+                "keyframes": len(self._frames) - deltas,
+                "deltas": deltas,
+            }
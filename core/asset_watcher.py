@@ -0,0 +1,258 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import tkinter as tk
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+
+def norm_asset_path(path: str) -> str:
+    """规范化资源路径用于比较（兼容配置中的 Windows 反斜杠写法与相对路径）"""
+    return os.path.normcase(os.path.abspath(str(path).replace("\\", "/")))
+
+
+class _Inotify:
+    """Linux inotify 的最小 ctypes 封装（非阻塞读取，仅监听目录）"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+
+    def add_dir(self, path: str) -> bool:
+        wd = self._add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            return False
+        self._dirs[wd] = path
+        return True
+
+    def read_events(self) -> List[str]:
+        """读取已到达的事件，返回涉及的文件路径（无事件时立即返回）"""
+        paths: List[str] = []
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                break
+            if not buf:
+                break
+            pos = 0
+            while pos + self._HEADER.size <= len(buf):
+                wd, _mask, _cookie, length = self._HEADER.unpack_from(buf, pos)
+                pos += self._HEADER.size
+                name = buf[pos:pos + length].rstrip(b"\0").decode("utf-8", "replace")
+                pos += length
+                base = self._dirs.get(wd)
+                if base and name:
+                    paths.append(os.path.join(base, name))
+        return paths
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class AssetWatcher:
+    """资源热加载监视器：监听资源目录与目录配置文件，变化时通知订阅者
+    使用：
+        watcher = AssetWatcher()
+        watcher.watch_dir("assets/pets")                 # 目录下的 *.json
+        watcher.watch_file("data/pets.json")
+        watcher.subscribe(lambda paths: ...)             # 在 Tk 线程回调，参数为规范化后的路径列表
+        watcher.bind_tk(root)                            # 由 Tk after 循环驱动 poll()
+    说明：
+        - Linux 优先使用 inotify，每次 poll 只读取已到达的事件
+        - 其他平台使用 mtime 索引轮询：每次只检查固定数量的目录 mtime 与 POLL_BATCH 个文件，
+          单次开销与资源数量无关；目录 mtime 变化（新增/删除/原子替换）时才重新列目录
+        - 只报告内容确实变化的文件（按 mtime/大小去重），忽略 *.tmp 等临时文件
+    """
+
+    POLL_INTERVAL_MS = 500
+    POLL_BATCH = 16  # 轮询模式下每次检查的文件数
+
+    def __init__(self, use_inotify: bool = True) -> None:
+        self._dirs: Dict[str, str] = {}  # 规范化目录 -> 文件后缀
+        self._files: Set[str] = set()  # 单独监听的文件
+        self._index: Dict[str, Tuple[int, int]] = {}  # 文件 -> (mtime_ns, 大小)
+        self._dir_sig: Dict[str, int] = {}
+        self._order: List[str] = []
+        self._cursor = 0
+        self._subscribers: List[Callable[[List[str]], None]] = []
+        self._tk_widget: Optional[tk.Misc] = None
+        self._poll_job: Optional[str] = None
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except Exception:
+                self._inotify = None
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "poll"
+
+    def watch_dir(self, path: str, suffix: str = ".json") -> None:
+        """监听目录下指定后缀的文件（不递归）"""
+        d = norm_asset_path(path)
+        self._dirs[d] = suffix
+        if self._inotify is not None and os.path.isdir(d):
+            self._inotify.add_dir(d)
+        self._scan_dir(d)
+
+    def watch_file(self, path: str) -> None:
+        """监听单个文件（通过其所在目录的事件或轮询）"""
+        f = norm_asset_path(path)
+        self._files.add(f)
+        d = os.path.dirname(f)
+        if self._inotify is not None and os.path.isdir(d):
+            self._inotify.add_dir(d)
+        sig = self._stat(f)
+        if sig is not None:
+            self._index[f] = sig
+        self._rebuild_order()
+
+    def subscribe(self, cb: Callable[[List[str]], None]) -> None:
+        self._subscribers.append(cb)
+
+    def unsubscribe(self, cb: Callable[[List[str]], None]) -> None:
+        try:
+            self._subscribers.remove(cb)
+        except ValueError:
+            pass
+
+    def bind_tk(self, widget: tk.Misc, interval_ms: Optional[int] = None) -> None:
+        """绑定 Tk 控件（或任何提供 after / after_cancel 的调度器，如 TimerWheel）并启动轮询循环"""
+        self._tk_widget = widget
+        interval = int(interval_ms or self.POLL_INTERVAL_MS)
+
+        def loop() -> None:
+            self._poll_job = None
+            self.poll()
+            if self._tk_widget is not None:
+                self._poll_job = self._tk_widget.after(interval, loop)
+
+        if self._poll_job is None:
+            self._poll_job = widget.after(interval, loop)
+
+    def stop(self) -> None:
+        """停止轮询并释放 inotify 句柄"""
+        if self._poll_job and self._tk_widget is not None:
+            try:
+                self._tk_widget.after_cancel(self._poll_job)
+            except Exception:
+                pass
+        self._poll_job = None
+        self._tk_widget = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    # ===== 检测 =====
+
+    def poll(self) -> List[str]:
+        """检测一次变化并通知订阅者，返回变化的文件列表"""
+        if self._inotify is not None:
+            candidates = {norm_asset_path(p) for p in self._inotify.read_events()}
+        else:
+            candidates = self._poll_candidates()
+        changed = [p for p in sorted(candidates) if self._is_watched(p) and self._refresh_sig(p)]
+        if changed:
+            for cb in list(self._subscribers):
+                try:
+                    cb(changed)
+                except Exception as e:
+                    print(f"资源热加载回调失败: {e}")
+        return changed
+
+    def _poll_candidates(self) -> Set[str]:
+        """轮询模式：目录 mtime 变化时重新列目录，另按轮转游标检查固定数量的文件"""
+        candidates: Set[str] = set()
+        for d in list(self._dirs) + sorted({os.path.dirname(f) for f in self._files}):
+            try:
+                sig = os.stat(d).st_mtime_ns
+            except OSError:
+                continue
+            if self._dir_sig.get(d) != sig:
+                self._dir_sig[d] = sig
+                candidates.update(self._list_dir(d))
+                candidates.update(p for p in list(self._index) if os.path.dirname(p) == d)
+        if self._order:
+            n = min(self.POLL_BATCH, len(self._order))
+            for i in range(n):
+                candidates.add(self._order[(self._cursor + i) % len(self._order)])
+            self._cursor = (self._cursor + n) % len(self._order)
+        return candidates
+
+    def _is_watched(self, path: str) -> bool:
+        if path in self._files:
+            return True
+        suffix = self._dirs.get(os.path.dirname(path))
+        return suffix is not None and path.endswith(suffix)
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _refresh_sig(self, path: str) -> bool:
+        """更新文件在 mtime 索引中的签名，返回是否发生变化（含新增与删除）"""
+        sig = self._stat(path)
+        old = self._index.get(path)
+        if sig == old:
+            return False
+        if sig is None:
+            self._index.pop(path, None)
+        else:
+            self._index[path] = sig
+        if (old is None) != (sig is None):
+            self._rebuild_order()
+        return True
+
+    def _list_dir(self, d: str) -> List[str]:
+        suffix = self._dirs.get(d)
+        if suffix is None:
+            return [f for f in self._files if os.path.dirname(f) == d]
+        try:
+            return [os.path.join(d, fn) for fn in os.listdir(d) if fn.endswith(suffix)]
+        except OSError:
+            return []
+
+    def _scan_dir(self, d: str) -> None:
+        try:
+            self._dir_sig[d] = os.stat(d).st_mtime_ns
+        except OSError:
+            pass
+        for p in self._list_dir(d):
+            sig = self._stat(p)
+            if sig is not None:
+                self._index[p] = sig
+        self._rebuild_order()
+
+    def _rebuild_order(self) -> None:
+        self._order = sorted(self._index)
+        if self._order:
+            self._cursor %= len(self._order)
+        else:
+            self._cursor = 0
@@ -1,7 +1,10 @@
+import base64
 import json
 import os
 from typing import Any, Dict, List, Tuple
 
+from .asset_store import AssetStore
+
 try:
     import pygame
 except Exception as e:  # pragma: no cover
@@ -11,10 +14,14 @@ except Exception as e:  # pragma: no cover
 class AssetsLoader:
     """资源加载器：负责从 JSON 像素矩阵生成 Pygame Surface 帧
     支持 palette 名称到 RGBA 的映射；若 pixels 为 null 或资源缺失，则生成透明占位帧。
+    同时支持构建工具输出的编译格式（"encoding": "indexed"）：
+        palette 为 [[名称, RGBA], ...] 列表，每帧 data 为 base64 编码的调色板下标字节（行优先）。
+    以及内容寻址资源库的引用格式（"format": "cas"），帧与调色板从 AssetStore 还原，见 asset_store.py。
     """
 
-    def __init__(self) -> None:
-        if pygame is None:
+    def __init__(self, require_pygame: bool = True) -> None:
+        # 仅做像素解码（如后台生成缩略图）时可不依赖 pygame
+        if require_pygame and pygame is None:
             raise RuntimeError("未检测到 pygame，请先安装：pip install pygame")
 
     def load_frames(self, frames_json_path: str) -> Tuple[int, int, List[List[List[Tuple[int, int, int, int]]]]]:
@@ -27,6 +34,10 @@ class AssetsLoader:
             obj: Dict[str, Any] = json.load(f)
         size = obj.get("size", [32, 32])
         w, h = int(size[0]), int(size[1])
+        if obj.get("encoding") == "indexed":
+            return w, h, self._load_indexed(obj, w, h)
+        if obj.get("format") == "cas":
+            return w, h, self._load_cas(obj, frames_json_path, w, h)
         palette: Dict[str, List[int]] = obj.get("palette", {})
         frames_def = obj.get("frames", [])
         frames_rgba: List[List[List[Tuple[int, int, int, int]]]] = []
@@ -40,6 +51,42 @@ class AssetsLoader:
             frames_rgba.append(self._make_blank_frame(w, h))
         return w, h, frames_rgba
 
+    def _load_indexed(self, obj: Dict[str, Any], w: int, h: int) -> List[List[List[Tuple[int, int, int, int]]]]:
+        """解码编译格式：按调色板下标查表还原 RGBA 帧"""
+        colors = [tuple(int(c) for c in rgba) for _, rgba in obj.get("palette", [])]
+        transparent = (0, 0, 0, 0)
+        frames_rgba: List[List[List[Tuple[int, int, int, int]]]] = []
+        for fr in obj.get("frames", []):
+            data = fr.get("data")
+            if not data:
+                frames_rgba.append(self._make_blank_frame(w, h))
+                continue
+            raw = base64.b64decode(data)
+            frame: List[List[Tuple[int, int, int, int]]] = []
+            for y in range(h):
+                row = raw[y * w:(y + 1) * w]
+                frame.append([colors[i] if i < len(colors) else transparent for i in row] + [transparent] * (w - len(row)))
+            frames_rgba.append(frame)
+        if not frames_rgba:
+            frames_rgba.append(self._make_blank_frame(w, h))
+        return frames_rgba
+
+    def _load_cas(self, obj: Dict[str, Any], path: str, w: int, h: int) -> List[List[List[Tuple[int, int, int, int]]]]:
+        """从内容寻址资源库还原帧（store 为相对资源文件所在目录的路径）；缺失的帧使用透明占位"""
+        store_dir = os.path.join(os.path.dirname(os.path.abspath(path)), obj.get("store", "../store"))
+        store = AssetStore.open(os.path.normpath(store_dir))
+        palette_hash = obj.get("palette", "")
+        frames_rgba: List[List[List[Tuple[int, int, int, int]]]] = []
+        for fr in obj.get("frames", []):
+            ref = fr.get("ref")
+            if not ref or not store.has_frame(ref):
+                frames_rgba.append(self._make_blank_frame(w, h))
+                continue
+            frames_rgba.append(store.decode_frame(palette_hash, ref))
+        if not frames_rgba:
+            frames_rgba.append(self._make_blank_frame(w, h))
+        return frames_rgba
+
     def to_surfaces(self, frames_rgba: List[List[List[Tuple[int, int, int, int]]]]) -> List["pygame.Surface"]:
         """将 RGBA 帧转为 Pygame Surface 列表"""
         surfaces: List["pygame.Surface"] = []
@@ -55,6 +102,15 @@ class AssetsLoader:
             surfaces.append(surf)
         return surfaces
 
+    @staticmethod
+    def to_rgba_bytes(frame: List[List[Tuple[int, int, int, int]]]) -> bytes:
+        """将 RGBA 帧展平为行优先的原始字节（可直接用于 PIL Image.frombytes）"""
+        buf = bytearray()
+        for row in frame:
+            for px in row:
+                buf.extend(px)
+        return bytes(buf)
+
     def _make_blank_frame(self, w: int, h: int) -> List[List[Tuple[int, int, int, int]]]:
         """生成全透明占位帧"""
         row = [(0, 0, 0, 0)] * w
@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .backup_manager import BackupManager
+
+BACKUP_PREFIX = "users-"
+BACKUP_SUFFIX = ".bak"
+
+
+def list_generations(backup_dir: str) -> List[str]:
+    """列出备份目录中的各代备份文件（按时间从新到旧）"""
+    try:
+        names = [n for n in os.listdir(backup_dir) if n.startswith(BACKUP_PREFIX) and n.endswith(BACKUP_SUFFIX)]
+    except OSError:
+        return []
+    # 文件名含时间戳，按名称倒序即按时间从新到旧
+    return [os.path.join(backup_dir, n) for n in sorted(names, reverse=True)]
+
+
+def load_latest_good(backup_dir: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """从最新一代开始尝试读取备份（校验签名），返回 (文件路径, 用户数据)；全部损坏时返回 None"""
+    for path in list_generations(backup_dir):
+        try:
+            data = BackupManager.import_file(path)
+        except Exception:
+            continue
+        if isinstance(data, dict):
+            return path, data
+    return None
+
+
+class AutoBackup:
+    """用户数据自动备份：周期性将 users 的时间点视图写为加密压缩的 v2 备份，并轮转保留若干代
+    属性：
+        dm: DataManager 实例（提供 snapshot_users 时间点视图）
+        backup_dir: 备份目录（默认 data/backups）
+        keep: 保留的备份代数
+        cpu_share: 备份允许占用的 CPU 时间比例；单次备份越耗时，下一次间隔越长
+    方法：
+        start()/stop(): 启动或停止周期备份
+        backup_now(force): 同步执行一次备份（数据无变化且未 force 时跳过）
+        trigger(): 在后台线程立即执行一次备份（不阻塞界面）
+        stats(): 备份统计（代数、最近一次耗时与 CPU 时间、累计 CPU 时间等）
+    说明：
+        仅在取时间点视图时短暂持有 DataManager 的锁，序列化、压缩与加密均在锁外的后台线程进行。
+    """
+
+    INTERVAL_MS = 10 * 60 * 1000
+    SLACK_MS = 30 * 1000
+    FIRST_DELAY_MS = 60 * 1000
+    KEEP = 8
+    CPU_SHARE = 0.01
+
+    def __init__(
+        self,
+        dm,
+        backup_dir: Optional[str] = None,
+        scheduler=None,
+        interval_ms: int = INTERVAL_MS,
+        keep: int = KEEP,
+        cpu_share: float = CPU_SHARE,
+    ) -> None:
+        """scheduler：可选的 TimerWheel；提供时由时间轮触发备份，否则单独起一个守护线程"""
+        self.dm = dm
+        self.backup_dir = backup_dir or os.path.join(dm.data_dir, "backups")
+        self.scheduler = scheduler
+        self.interval_ms = max(1000, int(interval_ms))
+        self.keep = max(1, int(keep))
+        self.cpu_share = max(1e-4, float(cpu_share))
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timer = None
+        self._thread: Optional[threading.Thread] = None
+        self._worker: Optional[threading.Thread] = None
+        self._last_version: Optional[int] = None
+        self._stats: Dict[str, Any] = {
+            "backups": 0,
+            "skipped": 0,
+            "failures": 0,
+            "last_time": 0.0,
+            "last_path": "",
+            "last_bytes": 0,
+            "last_wall_ms": 0.0,
+            "last_cpu_ms": 0.0,
+            "last_lock_ms": 0.0,
+            "total_cpu_ms": 0.0,
+            "last_error": "",
+        }
+
+    def start(self) -> None:
+        """启动周期备份（首次备份在启动后 FIRST_DELAY_MS 进行）"""
+        self._stop.clear()
+        if self.scheduler is not None:
+            self._timer = self.scheduler.call_later(self.FIRST_DELAY_MS, self._kick, slack_ms=self.SLACK_MS)
+        elif self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """停止周期备份并等待进行中的备份结束"""
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for t in (self._thread, self._worker):
+            try:
+                if t is not None:
+                    t.join(timeout=5.0)
+            except RuntimeError:
+                pass
+        self._thread = None
+
+    def _next_delay_ms(self) -> float:
+        """CPU 时间上限：单次备份耗时 c 秒时，两次备份至少间隔 c / cpu_share 秒"""
+        return max(self.interval_ms, self._stats["last_cpu_ms"] / self.cpu_share)
+
+    def _kick(self) -> None:
+        """时间轮回调（界面线程）：启动后台备份并安排下一次"""
+        if self._stop.is_set():
+            return
+        self.trigger(force=False)
+        self._timer = self.scheduler.call_later(self._next_delay_ms(), self._kick, slack_ms=self.SLACK_MS)
+
+    def _loop(self) -> None:
+        """未提供 scheduler 时的守护线程"""
+        delay = self.FIRST_DELAY_MS
+        while not self._stop.wait(delay / 1000.0):
+            self._backup_quietly(False)
+            delay = self._next_delay_ms()
+
+    def trigger(self, force: bool = True) -> bool:
+        """在后台线程执行一次备份；已有备份进行中时返回 False"""
+        if self._worker is not None and self._worker.is_alive():
+            return False
+        self._worker = threading.Thread(target=self._backup_quietly, args=(force,), daemon=True)
+        self._worker.start()
+        return True
+
+    def _backup_quietly(self, force: bool) -> None:
+        try:
+            self.backup_now(force)
+        except Exception:
+            pass
+
+    def backup_now(self, force: bool = False) -> bool:
+        """执行一次备份；数据自上次备份后无变化且未 force 时跳过并返回 False"""
+        with self._run_lock:
+            c0 = time.thread_time()
+            t0 = time.perf_counter()
+            version, users = self.dm.snapshot_users()
+            lock_ms = (time.perf_counter() - t0) * 1000
+            if not force and version == self._last_version:
+                self._stats["skipped"] += 1
+                return False
+            now = time.time()
+            name = f"{BACKUP_PREFIX}{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}{BACKUP_SUFFIX}"
+            path = os.path.join(self.backup_dir, name)
+            try:
+                os.makedirs(self.backup_dir, exist_ok=True)
+                BackupManager.export_to_file(users, path)
+                size = os.path.getsize(path)
+            except Exception as e:
+                self._stats["failures"] += 1
+                self._stats["last_error"] = str(e)
+                return False
+            self._last_version = version
+            self._rotate()
+            cpu_ms = (time.thread_time() - c0) * 1000
+            self._stats.update({
+                "backups": self._stats["backups"] + 1,
+                "last_time": now,
+                "last_path": path,
+                "last_bytes": size,
+                "last_wall_ms": (time.perf_counter() - t0) * 1000,
+                "last_cpu_ms": cpu_ms,
+                "last_lock_ms": lock_ms,
+                "total_cpu_ms": self._stats["total_cpu_ms"] + cpu_ms,
+                "last_error": "",
+            })
+            return True
+
+    def _rotate(self) -> None:
+        """删除超出保留代数的旧备份"""
+        for path in list_generations(self.backup_dir)[self.keep:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """备份统计；generations 为目录中现存的备份代数，next_interval_s 为受 CPU 上限约束后的备份间隔"""
+        out = dict(self._stats)
+        out["generations"] = len(list_generations(self.backup_dir))
+        out["next_interval_s"] = self._next_delay_ms() / 1000.0
+        out["cpu_share"] = self.cpu_share
+        return out
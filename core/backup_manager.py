@@ -1,18 +1,94 @@
 import base64
 import hashlib
 import hmac
+import io
+import itertools
 import json
 import os
+import struct
 import time
-from typing import Any, Dict, Optional, Tuple
+import zlib
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import lzma
+except Exception:
+    lzma = None
+
+
+class _KeyStream:
+    """v1 密钥流：block_n = sha256(block_{n-1} + str(n))，初始 block 为会话密钥
+    哈希链只能顺序计算，这里按需一次生成整段密钥流，再以大整数整段异或，避免逐字节循环。
+    状态跨调用保留，可按任意大小分块加解密。
+    """
+
+    __slots__ = ("_block", "_idx", "_buf", "_pos")
+
+    def __init__(self, key: bytes) -> None:
+        self._block = key
+        self._idx = 0
+        self._buf = b""
+        self._pos = 0
+
+    def take(self, n: int) -> bytes:
+        """取出接下来的 n 字节密钥流"""
+        have = len(self._buf) - self._pos
+        if have >= n:
+            out = self._buf[self._pos:self._pos + n]
+            self._pos += n
+            return out
+        parts = [self._buf[self._pos:]]
+        sha256 = hashlib.sha256
+        block, idx = self._block, self._idx
+        for _ in range((n - have + 31) // 32):
+            block = sha256(block + b"%d" % idx).digest()
+            parts.append(block)
+            idx += 1
+        self._block, self._idx = block, idx
+        self._buf = b"".join(parts)
+        self._pos = n
+        return self._buf[:n]
+
+    def xor(self, data: bytes) -> bytes:
+        """整段异或（加密与解密相同）"""
+        n = len(data)
+        if not n:
+            return b""
+        ks = self.take(n)
+        return (int.from_bytes(data, "little") ^ int.from_bytes(ks, "little")).to_bytes(n, "little")
+
 
 class BackupManager:
     """备份管理器：负责用户数据的加密导出与解密导入
     采用“哈希算法加密”（自定义流加密 + HMAC 签名）以满足需求。
+    文件格式：
+        v1（文本）：Base64(IV + 密文) + "|" + HMAC 十六进制签名
+        v2（二进制）：头部 MAGIC | 版本 | 压缩算法 | 块大小 | IV，之后为若干记录
+            记录 = 标志(1) | 长度(4) | 密文 | HMAC(32)；先压缩再加密，最后一条记录带 LAST 标志
+            每块 HMAC 覆盖头部、块序号与标志，导入时逐块验签，调换顺序或截断均会被拒绝
+    说明：
+        - 加解密按 CHUNK_SIZE 分块流式进行；export_to_file / import_file 不在内存中拼出完整文件内容
+        - export_to_file 默认写 v2（zlib）；export_data 仍输出 v1 字符串
+        - import_data / import_file 自动识别 v1 与 v2
     """
     
     _SALT = b"TraePet_Backup_Salt_v1"
     _sk = b"TraePet_Secret_Key_For_Obfuscation"
+    CHUNK_SIZE = 64 * 1024
+    _JSON_BATCH = 2048  # 大容器每批交给 json.dumps 的元素数
+
+    MAGIC = b"TPBK"
+    VERSION_V2 = 2
+    CODECS = {"none": 0, "zlib": 1, "lzma": 2}
+    DEFAULT_CODEC = "zlib"
+    # 压缩级别：更高级别对用户数据几乎不再缩小体积，却慢数倍（见 benchmarks/bench_backup_format.py）
+    ZLIB_LEVEL = 1
+    LZMA_PRESET = 1
+    MAX_CHUNK_SIZE = 16 * 1024 * 1024  # 读取时拒绝更大的块，防止损坏的长度字段耗尽内存
+    _HEADER = struct.Struct(">4sBBI16s")
+    _RECORD = struct.Struct(">BI")
+    _TAG_SIZE = 32
+    _FLAG_LAST = 1
 
     @staticmethod
     def _derive_key(iv: bytes) -> bytes:
@@ -21,72 +97,290 @@ class BackupManager:
 
     @staticmethod
     def _xor_cipher(data: bytes, key: bytes) -> bytes:
-        """简单的 XOR 流加密"""
-        # 扩展密钥流以覆盖数据长度
-        # 使用 key 的反复哈希作为密钥流生成器
-        out = bytearray(len(data))
-        stream_block = key
-        block_idx = 0
-        
-        for i in range(len(data)):
-            if i % 32 == 0:
-                # 每 32 字节更新一次密钥流块
-                stream_block = hashlib.sha256(stream_block + str(block_idx).encode()).digest()
-                block_idx += 1
-            out[i] = data[i] ^ stream_block[i % 32]
-        return bytes(out)
+        """XOR 流加密（一次性处理整段数据）"""
+        return _KeyStream(key).xor(data)
+
+    @staticmethod
+    def _iter_json(user_data: Dict[str, Any]) -> Iterator[str]:
+        """增量序列化：顶层逐键、大容器按批次交给 C 编码器，拼接结果与 json.dumps(ensure_ascii=False) 一致
+        （JSONEncoder.iterencode 流式输出时不走 C 加速，逐个元素生成，明显更慢）
+        """
+        def dumps(obj: Any) -> str:
+            return json.dumps(obj, ensure_ascii=False)
+
+        if not isinstance(user_data, dict):
+            yield dumps(user_data)
+            return
+        batch = BackupManager._JSON_BATCH
+        yield "{"
+        for i, (k, v) in enumerate(user_data.items()):
+            # 键按 json 规则编码（非字符串键同样转换），去掉 "{" 与 "0}"
+            yield (", " if i else "") + dumps({k: 0})[1:-2]
+            if isinstance(v, dict) and len(v) > batch:
+                items = iter(v.items())
+                yield "{"
+                for j in range(0, len(v), batch):
+                    yield (", " if j else "") + dumps(dict(itertools.islice(items, batch)))[1:-1]
+                yield "}"
+            elif isinstance(v, list) and len(v) > batch:
+                yield "["
+                for j in range(0, len(v), batch):
+                    yield (", " if j else "") + dumps(v[j:j + batch])[1:-1]
+                yield "]"
+            else:
+                yield dumps(v)
+        yield "}"
+
+    @staticmethod
+    def _iter_json_chunks(user_data: Dict[str, Any]) -> Iterator[bytes]:
+        """按 CHUNK_SIZE 聚合序列化片段，输出 UTF-8 块"""
+        parts: List[str] = []
+        size = 0
+        for piece in BackupManager._iter_json(user_data):
+            parts.append(piece)
+            size += len(piece)
+            if size >= BackupManager.CHUNK_SIZE:
+                yield "".join(parts).encode("utf-8")
+                parts, size = [], 0
+        if parts:
+            yield "".join(parts).encode("utf-8")
+
+    @staticmethod
+    def iter_export(user_data: Dict[str, Any]) -> Iterator[str]:
+        """流式导出：依次产出文件文本片段，拼接后即为完整备份内容"""
+        # 1. 生成随机 IV 并派生密钥
+        iv = os.urandom(16)
+        stream = _KeyStream(BackupManager._derive_key(iv))
+        # 2. HMAC 签名覆盖 IV + 密文
+        mac = hmac.new(BackupManager._SALT, iv, hashlib.sha256)
+        # 3. 分块加密；Base64 按 3 字节对齐输出，余下部分留到下一块
+        carry = iv
+        for chunk in BackupManager._iter_json_chunks(user_data):
+            ciphertext = stream.xor(chunk)
+            mac.update(ciphertext)
+            carry += ciphertext
+            cut = len(carry) - len(carry) % 3
+            if cut:
+                yield base64.urlsafe_b64encode(carry[:cut]).decode("ascii")
+                carry = carry[cut:]
+        yield base64.urlsafe_b64encode(carry).decode("ascii")
+        yield "|" + mac.hexdigest()
 
     @staticmethod
     def export_data(user_data: Dict[str, Any]) -> str:
         """将用户数据序列化并加密导出为字符串"""
-        # 1. 序列化
-        json_bytes = json.dumps(user_data, ensure_ascii=False).encode("utf-8")
-        
-        # 2. 生成随机 IV
-        iv = os.urandom(16)
-        
-        # 3. 派生密钥并加密
-        key = BackupManager._derive_key(iv)
-        ciphertext = BackupManager._xor_cipher(json_bytes, key)
-        
-        # 4. 计算 HMAC 签名 (对 IV + Ciphertext)
-        sig_payload = iv + ciphertext
-        sig = hmac.new(BackupManager._SALT, sig_payload, hashlib.sha256).hexdigest()
-        
-        # 5. 编码：Base64(IV + Ciphertext) + "|" + Sig
-        # IV (16) + Ciphertext (N)
-        payload_b64 = base64.urlsafe_b64encode(iv + ciphertext).decode("ascii")
-        return f"{payload_b64}|{sig}"
-
-    @staticmethod
-    def import_data(file_content: str) -> Optional[Dict[str, Any]]:
-        """解析并解密备份文件内容，返回用户数据字典"""
+        return "".join(BackupManager.iter_export(user_data))
+
+    @staticmethod
+    def export_bytes(user_data: Dict[str, Any], codec: str = DEFAULT_CODEC) -> bytes:
+        """导出为 v2 二进制内容"""
+        return b"".join(BackupManager.iter_export_v2(user_data, codec))
+
+    @staticmethod
+    def export_to_file(user_data: Dict[str, Any], path: str, version: int = VERSION_V2, codec: str = DEFAULT_CODEC) -> None:
+        """流式导出到文件（先写临时文件再替换，避免中途失败留下残缺备份）
+        version=1 时写旧版文本格式（codec 忽略），便于旧版本程序读取
+        """
+        tmp = f"{path}.tmp"
         try:
-            parts = file_content.strip().split("|")
-            if len(parts) != 2:
+            if version == 1:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    for text in BackupManager.iter_export(user_data):
+                        f.write(text)
+            else:
+                with open(tmp, "wb") as f:
+                    for data in BackupManager.iter_export_v2(user_data, codec):
+                        f.write(data)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    # ===== v2 二进制容器 =====
+
+    @staticmethod
+    def _v2_keys(iv: bytes) -> Tuple[bytes, bytes]:
+        """由 IV 派生加密密钥与签名密钥"""
+        key = BackupManager._derive_key(iv)
+        return hashlib.sha256(key + b"enc").digest(), hashlib.sha256(key + b"mac").digest()
+
+    @staticmethod
+    def _v2_xor(data: bytes, enc_key: bytes, idx: int) -> bytes:
+        """计数器模式：每块密钥流为 shake_256(密钥 + 块序号)，一次生成整块"""
+        n = len(data)
+        if not n:
+            return b""
+        ks = hashlib.shake_256(enc_key + idx.to_bytes(8, "big")).digest(n)
+        return (int.from_bytes(data, "little") ^ int.from_bytes(ks, "little")).to_bytes(n, "little")
+
+    @staticmethod
+    def _v2_tag(mac_key: bytes, header: bytes, idx: int, flags: int, ciphertext: bytes) -> bytes:
+        mac = hmac.new(mac_key, header + idx.to_bytes(8, "big") + BackupManager._RECORD.pack(flags, len(ciphertext)), hashlib.sha256)
+        mac.update(ciphertext)
+        return mac.digest()
+
+    @staticmethod
+    def _compressor(codec_id: int):
+        """返回流式压缩器（不压缩时为 None）"""
+        if codec_id == BackupManager.CODECS["zlib"]:
+            return zlib.compressobj(BackupManager.ZLIB_LEVEL)
+        if codec_id == BackupManager.CODECS["lzma"]:
+            if lzma is None:
+                raise ValueError("当前 Python 未提供 lzma 模块")
+            return lzma.LZMACompressor(preset=BackupManager.LZMA_PRESET)
+        return None
+
+    @staticmethod
+    def _decompressor(codec_id: int):
+        """返回流式解压器（不压缩时为 None），未知算法抛出 ValueError"""
+        if codec_id == BackupManager.CODECS["none"]:
+            return None
+        if codec_id == BackupManager.CODECS["zlib"]:
+            return zlib.decompressobj()
+        if codec_id == BackupManager.CODECS["lzma"] and lzma is not None:
+            return lzma.LZMADecompressor()
+        raise ValueError(f"不支持的压缩算法: {codec_id}")
+
+    @staticmethod
+    def iter_export_v2(user_data: Dict[str, Any], codec: str = DEFAULT_CODEC, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """流式导出 v2：依次产出头部与各条记录"""
+        if codec not in BackupManager.CODECS:
+            raise ValueError(f"未知压缩算法: {codec}")
+        codec_id = BackupManager.CODECS[codec]
+        chunk_size = max(1, min(int(chunk_size), BackupManager.MAX_CHUNK_SIZE))
+        comp = BackupManager._compressor(codec_id)
+        iv = os.urandom(16)
+        header = BackupManager._HEADER.pack(BackupManager.MAGIC, BackupManager.VERSION_V2, codec_id, chunk_size, iv)
+        enc_key, mac_key = BackupManager._v2_keys(iv)
+        yield header
+
+        idx = 0
+
+        def record(data: bytes, flags: int) -> bytes:
+            ciphertext = BackupManager._v2_xor(data, enc_key, idx)
+            tag = BackupManager._v2_tag(mac_key, header, idx, flags, ciphertext)
+            return BackupManager._RECORD.pack(flags, len(ciphertext)) + ciphertext + tag
+
+        buf = bytearray()
+        for chunk in BackupManager._iter_json_chunks(user_data):
+            buf += comp.compress(chunk) if comp is not None else chunk
+            while len(buf) >= chunk_size:
+                yield record(bytes(buf[:chunk_size]), 0)
+                del buf[:chunk_size]
+                idx += 1
+        if comp is not None:
+            buf += comp.flush()
+        while len(buf) > chunk_size:
+            yield record(bytes(buf[:chunk_size]), 0)
+            del buf[:chunk_size]
+            idx += 1
+        yield record(bytes(buf), BackupManager._FLAG_LAST)
+
+    @staticmethod
+    def _read_v2(fp: IO[bytes]) -> Optional[Dict[str, Any]]:
+        """流式读取 v2：逐块验签后解密并解压；任一块校验失败、截断或带多余数据返回 None"""
+        header = fp.read(BackupManager._HEADER.size)
+        if len(header) != BackupManager._HEADER.size:
+            return None
+        magic, version, codec_id, chunk_size, iv = BackupManager._HEADER.unpack(header)
+        if magic != BackupManager.MAGIC or version != BackupManager.VERSION_V2:
+            return None
+        if not 0 < chunk_size <= BackupManager.MAX_CHUNK_SIZE:
+            return None
+        decomp = BackupManager._decompressor(codec_id)
+        enc_key, mac_key = BackupManager._v2_keys(iv)
+        plain: List[bytes] = []
+        idx = 0
+        while True:
+            rec = fp.read(BackupManager._RECORD.size)
+            if len(rec) != BackupManager._RECORD.size:
                 return None
-                
-            payload_b64, sig_hex = parts[0], parts[1]
-            
-            # 1. 解码载荷
-            raw_payload = base64.urlsafe_b64decode(payload_b64.encode("ascii"))
-            if len(raw_payload) < 16:
+            flags, n = BackupManager._RECORD.unpack(rec)
+            if n > chunk_size:
                 return None
-                
-            iv = raw_payload[:16]
-            ciphertext = raw_payload[16:]
-            
-            # 2. 验证签名
-            calc_sig = hmac.new(BackupManager._SALT, raw_payload, hashlib.sha256).hexdigest()
-            if not hmac.compare_digest(calc_sig.upper(), sig_hex.upper()):
+            ciphertext = fp.read(n)
+            tag = fp.read(BackupManager._TAG_SIZE)
+            if len(ciphertext) != n or len(tag) != BackupManager._TAG_SIZE:
                 return None
-                
-            # 3. 解密
-            key = BackupManager._derive_key(iv)
-            json_bytes = BackupManager._xor_cipher(ciphertext, key)
-            
-            # 4. 反序列化
-            return json.loads(json_bytes.decode("utf-8"))
-            
+            if not hmac.compare_digest(tag, BackupManager._v2_tag(mac_key, header, idx, flags, ciphertext)):
+                return None
+            data = BackupManager._v2_xor(ciphertext, enc_key, idx)
+            plain.append(decomp.decompress(data) if decomp is not None else data)
+            if flags & BackupManager._FLAG_LAST:
+                break
+            idx += 1
+        if fp.read(1):
+            return None
+        if decomp is not None:
+            # zlib 解压器可能仍缓存有输出；压缩流必须完整结束
+            if hasattr(decomp, "flush"):
+                plain.append(decomp.flush())
+            if not decomp.eof:
+                return None
+        return json.loads(b"".join(plain).decode("utf-8"))
+
+    @staticmethod
+    def _read_v1(fp: IO[str]) -> Optional[Dict[str, Any]]:
+        """流式解码、验签与解密；签名不符或格式错误返回 None"""
+        mac = hmac.new(BackupManager._SALT, digestmod=hashlib.sha256)
+        stream: Optional[_KeyStream] = None
+        head = b""  # 尚未凑满 16 字节的 IV
+        pending = ""  # 未对齐 4 字符的 Base64 余量
+        plain: List[bytes] = []
+        sig_parts: Optional[List[str]] = None
+        while True:
+            chunk = fp.read(BackupManager.CHUNK_SIZE)
+            if not chunk:
+                break
+            if sig_parts is not None:
+                sig_parts.append(chunk)
+                continue
+            # Base64 字符集不含 "|"，遇到即进入签名部分
+            text, bar, rest = chunk.partition("|")
+            if bar:
+                sig_parts = [rest]
+            text = pending + "".join(text.split())
+            cut = len(text) if bar else len(text) - len(text) % 4
+            pending = text[cut:]
+            if not cut:
+                continue
+            raw = base64.urlsafe_b64decode(text[:cut].encode("ascii"))
+            mac.update(raw)
+            if stream is None:
+                head += raw
+                if len(head) < 16:
+                    continue
+                stream = _KeyStream(BackupManager._derive_key(head[:16]))
+                raw = head[16:]
+            plain.append(stream.xor(raw))
+        if stream is None or sig_parts is None:
+            return None
+        sig_hex = "".join(sig_parts).strip()
+        if "|" in sig_hex or not hmac.compare_digest(mac.hexdigest().upper(), sig_hex.upper()):
+            return None
+        return json.loads(b"".join(plain).decode("utf-8"))
+
+    @staticmethod
+    def import_data(file_content: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        """解析并解密备份文件内容（自动识别 v1 文本 / v2 二进制），返回用户数据字典"""
+        try:
+            if isinstance(file_content, (bytes, bytearray)):
+                if file_content.startswith(BackupManager.MAGIC):
+                    return BackupManager._read_v2(io.BytesIO(file_content))
+                file_content = bytes(file_content).decode("utf-8")
+            return BackupManager._read_v1(io.StringIO(file_content))
+        except Exception:
+            return None
+
+    @staticmethod
+    def import_file(path: str) -> Optional[Dict[str, Any]]:
+        """流式读取备份文件并解密（自动识别 v1 / v2），返回用户数据字典"""
+        try:
+            with open(path, "rb") as f:
+                magic = f.read(len(BackupManager.MAGIC))
+                f.seek(0)
+                if magic == BackupManager.MAGIC:
+                    return BackupManager._read_v2(f)
+                return BackupManager._read_v1(io.TextIOWrapper(f, encoding="utf-8"))
         except Exception:
             return None
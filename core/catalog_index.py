@@ -0,0 +1,221 @@
+import bisect
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except Exception:  # pragma: no cover
+    lazy_pinyin = None
+    Style = None
+
+
+class CatalogIndex:
+    """目录索引：为宠物/粮食目录建立名称 n-gram、价格分桶与解锁方式索引
+    支持增量输入联想（type-ahead）、价格区间过滤与排序，查询时无需重新扫描目录字典。
+    使用：
+        idx = CatalogIndex()
+        idx.update(pets_cfg)                      # 首次构建或目录重载后增量更新
+        idx.search("小猫", price_max=3600, sort="price_asc")
+    说明：
+        - 名称关键词：原名小写、（若安装 pypinyin）全拼与首字母，均按 1/2-gram 建倒排表
+        - 查询词按空格拆分，所有词都需命中（子串匹配）
+        - unlock_type 缺省视为 "price"（运行时间购买）
+    """
+
+    SORT_KEYS = ("default", "price_asc", "price_desc", "name")
+    BUCKET_SIZE = 600  # 价格分桶宽度（秒）
+
+    def __init__(self, items: Optional[Mapping[str, Dict[str, Any]]] = None) -> None:
+        # name -> (签名, 关键词元组, 价格, 解锁方式)
+        self._entries: Dict[str, Tuple[Tuple, Tuple[str, ...], int, str]] = {}
+        self._seq: Dict[str, int] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._buckets: Dict[int, Set[str]] = {}
+        self._bucket_ids: List[int] = []
+        self._by_unlock: Dict[str, Set[str]] = {}
+        self._sorted_cache: Dict[str, List[str]] = {}
+        # 输入联想缓存：上一次查询词及其命中集合
+        self._generation = 0
+        self._last_term: Tuple[int, str] = (-1, "")
+        self._last_hits: Set[str] = set()
+        if items:
+            self.update(items)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    @staticmethod
+    def _signature(cfg: Dict[str, Any]) -> Tuple:
+        """影响索引的字段签名，未变化的条目在重载时跳过"""
+        return (int(cfg.get("price", 0) or 0), str(cfg.get("unlock_type") or "price"))
+
+    @staticmethod
+    def name_keys(name: str) -> Tuple[str, ...]:
+        """生成名称的检索关键词：原名、拼音全拼与首字母（pypinyin 可用时）"""
+        keys = [name.lower()]
+        if lazy_pinyin is not None and any("一" <= ch <= "鿿" for ch in name):
+            try:
+                syllables = lazy_pinyin(name)
+                initials = lazy_pinyin(name, style=Style.FIRST_LETTER)
+                keys.append("".join(syllables).lower())
+                keys.append("".join(initials).lower())
+            except Exception:
+                pass
+        return tuple(dict.fromkeys(keys))
+
+    @staticmethod
+    def _grams_of(text: str) -> Set[str]:
+        """文本的 1-gram 与 2-gram 集合"""
+        grams = set(text)
+        grams.update(text[i:i + 2] for i in range(len(text) - 1))
+        return grams
+
+    def update(self, items: Mapping[str, Dict[str, Any]]) -> int:
+        """与新目录做差异比较并增量更新索引，返回变化（新增/删除/修改）的条目数"""
+        changed = 0
+        for name in [n for n in self._entries if n not in items]:
+            self._remove(name)
+            changed += 1
+        for name, cfg in items.items():
+            sig = self._signature(cfg)
+            old = self._entries.get(name)
+            if old is not None and old[0] == sig:
+                continue
+            if old is not None:
+                self._remove(name)
+            self._add(name, sig)
+            changed += 1
+        # 目录顺序即默认排序；仅在顺序可能变化时重新编号
+        order = list(items.keys())
+        if changed or order != list(self._seq):
+            self._seq = {name: i for i, name in enumerate(order)}
+            self._sorted_cache.clear()
+            self._generation += 1
+        return changed
+
+    def _add(self, name: str, sig: Tuple) -> None:
+        price, unlock = sig
+        keys = self.name_keys(name)
+        self._entries[name] = (sig, keys, price, unlock)
+        for key in keys:
+            for g in self._grams_of(key):
+                self._grams.setdefault(g, set()).add(name)
+        b = price // self.BUCKET_SIZE
+        if b not in self._buckets:
+            self._buckets[b] = set()
+            bisect.insort(self._bucket_ids, b)
+        self._buckets[b].add(name)
+        self._by_unlock.setdefault(unlock, set()).add(name)
+
+    def _remove(self, name: str) -> None:
+        _, keys, price, unlock = self._entries.pop(name)
+        for key in keys:
+            for g in self._grams_of(key):
+                posting = self._grams.get(g)
+                if posting is not None:
+                    posting.discard(name)
+                    if not posting:
+                        del self._grams[g]
+        b = price // self.BUCKET_SIZE
+        bucket = self._buckets.get(b)
+        if bucket is not None:
+            bucket.discard(name)
+            if not bucket:
+                del self._buckets[b]
+                self._bucket_ids.remove(b)
+        group = self._by_unlock.get(unlock)
+        if group is not None:
+            group.discard(name)
+            if not group:
+                del self._by_unlock[unlock]
+
+    def price_of(self, name: str) -> int:
+        """返回索引中的价格（不存在时为 0）"""
+        entry = self._entries.get(name)
+        return entry[2] if entry else 0
+
+    def _match_term(self, term: str) -> Set[str]:
+        """单个查询词的命中集合；若是上一次查询词的延长，则只在上次结果中过滤"""
+        last_gen, last_term = self._last_term
+        if last_gen == self._generation and last_term and term.startswith(last_term):
+            pool: Iterable[str] = self._last_hits
+        else:
+            grams = [term[i:i + 2] for i in range(len(term) - 1)] or [term]
+            postings = []
+            for g in set(grams):
+                posting = self._grams.get(g)
+                if not posting:
+                    return set()
+                postings.append(posting)
+            postings.sort(key=len)
+            pool = postings[0].intersection(*postings[1:]) if len(postings) > 1 else postings[0]
+        hits = {name for name in pool if any(term in key for key in self._entries[name][1])}
+        self._last_term = (self._generation, term)
+        self._last_hits = hits
+        return hits
+
+    def _match_price(self, price_min: Optional[int], price_max: Optional[int]) -> Set[str]:
+        """价格区间 [price_min, price_max] 的命中集合，仅边界桶需要逐项比较"""
+        lo_b = 0 if price_min is None else int(price_min) // self.BUCKET_SIZE
+        hi_b = None if price_max is None else int(price_max) // self.BUCKET_SIZE
+        start = bisect.bisect_left(self._bucket_ids, lo_b)
+        end = len(self._bucket_ids) if hi_b is None else bisect.bisect_right(self._bucket_ids, hi_b)
+        hits: Set[str] = set()
+        for b in self._bucket_ids[start:end]:
+            bucket = self._buckets[b]
+            if b == lo_b or b == hi_b:
+                for name in bucket:
+                    price = self._entries[name][2]
+                    if (price_min is None or price >= price_min) and (price_max is None or price <= price_max):
+                        hits.add(name)
+            else:
+                hits |= bucket
+        return hits
+
+    def _sorted(self, sort: str) -> List[str]:
+        """返回按指定方式排序的全量名称列表（按需构建并缓存）"""
+        cached = self._sorted_cache.get(sort)
+        if cached is None:
+            cached = sorted(self._entries, key=self._sort_key(sort))
+            self._sorted_cache[sort] = cached
+        return cached
+
+    def _sort_key(self, sort: str):
+        seq = self._seq
+        entries = self._entries
+        if sort == "price_asc":
+            return lambda n: (entries[n][2], seq.get(n, 0))
+        if sort == "price_desc":
+            return lambda n: (-entries[n][2], seq.get(n, 0))
+        if sort == "name":
+            return lambda n: entries[n][1][1] if len(entries[n][1]) > 1 else entries[n][1][0]
+        return lambda n: seq.get(n, 0)
+
+    def search(
+        self,
+        query: str = "",
+        price_min: Optional[int] = None,
+        price_max: Optional[int] = None,
+        unlock_type: Optional[str] = None,
+        sort: str = "default",
+    ) -> List[str]:
+        """按关键词、价格区间与解锁方式过滤，返回排序后的名称列表"""
+        if sort not in self.SORT_KEYS:
+            sort = "default"
+        sets: List[Set[str]] = []
+        for term in (query or "").lower().split():
+            sets.append(self._match_term(term))
+        if price_min is not None or price_max is not None:
+            sets.append(self._match_price(price_min, price_max))
+        if unlock_type:
+            sets.append(self._by_unlock.get(unlock_type, set()))
+        if not sets:
+            return list(self._sorted(sort))
+        sets.sort(key=len)
+        hits = sets[0].intersection(*sets[1:]) if len(sets) > 1 else set(sets[0])
+        # 命中较少时直接排序命中集合，否则沿用缓存的全量排序做过滤
+        if len(hits) * 4 < len(self._entries):
+            return sorted(hits, key=self._sort_key(sort))
+        return [name for name in self._sorted(sort) if name in hits]
@@ -0,0 +1,83 @@
+import heapq
+import itertools
+import time
+import tkinter as tk
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class TkClock:
+    """基于 Tk after 的调度器：after / after_cancel 直接转发给控件，time() 为墙上时间"""
+
+    def __init__(self, widget: tk.Misc) -> None:
+        self.widget = widget
+
+    def after(self, ms: int, cb: Callable[[], None]) -> str:
+        return self.widget.after(int(ms), cb)
+
+    def after_cancel(self, job: str) -> None:
+        self.widget.after_cancel(job)
+
+    def time(self) -> float:
+        return time.time()
+
+
+class VirtualClock:
+    """确定性虚拟时钟：接口与 TkClock 相同，但时间只在 advance() 时推进
+    使用：
+        clock = VirtualClock()
+        clock.after(120, tick)
+        clock.advance(8 * 3600 * 1000)   # 按到期顺序同步执行期间的全部回调
+    说明：
+        - 同一时刻到期的回调按登记顺序执行；回调内登记的新任务同样参与本次推进
+        - on_callback(cb, elapsed_s) 可用于统计每次回调的真实耗时
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now_ms = 0
+        self._start = float(start)
+        self._seq = itertools.count()
+        self._heap: List[Tuple[int, int, str]] = []
+        self._jobs: Dict[str, Callable[[], None]] = {}
+        self.on_callback: Optional[Callable[[Callable[[], None], float], None]] = None
+
+    def after(self, ms: int, cb: Callable[[], None]) -> str:
+        seq = next(self._seq)
+        job = f"vafter#{seq}"
+        self._jobs[job] = cb
+        heapq.heappush(self._heap, (self._now_ms + max(0, int(ms)), seq, job))
+        return job
+
+    def after_cancel(self, job: str) -> None:
+        # 惰性删除：堆中残留的条目在弹出时跳过
+        self._jobs.pop(job, None)
+
+    def time(self) -> float:
+        return self._start + self._now_ms / 1000.0
+
+    @property
+    def now_ms(self) -> int:
+        return self._now_ms
+
+    def pending(self) -> int:
+        """尚未执行的任务数"""
+        return len(self._jobs)
+
+    def advance(self, ms: int) -> int:
+        """推进 ms 毫秒并执行期间到期的回调，返回执行的回调数"""
+        target = self._now_ms + max(0, int(ms))
+        ran = 0
+        while self._heap and self._heap[0][0] <= target:
+            due, _, job = heapq.heappop(self._heap)
+            cb = self._jobs.pop(job, None)
+            if cb is None:
+                continue
+            self._now_ms = due
+            if self.on_callback is None:
+                cb()
+            else:
+                t0 = time.perf_counter()
+                cb()
+                self.on_callback(cb, time.perf_counter() - t0)
+            ran += 1
+        self._now_ms = target
+        return ran
@@ -1,8 +1,39 @@
+import hashlib
+import heapq
 import json
 import os
 import threading
 import time
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .auto_backup import load_latest_good
+from .catalog_index import CatalogIndex
+from .ledger import Ledger
+from .migrations import run_pending, save_schema
+from .license_manager import LicenseManager
+
+
+class TxnOp(NamedTuple):
+    """事务中的一步操作
+    kind: "deduct" 扣减 amount 秒 / "credit" 增加 amount 秒 / "unlock" 解锁宠物 name / "grant" 粮仓增加 name × amount
+    """
+    kind: str
+    name: str = ""
+    amount: int = 0
+
+
+class TxnResult(NamedTuple):
+    """事务结果：ok 为 False 时未做任何修改，reason 说明原因，name 为导致失败的商品（如有）
+    reason: "ok" / "no_user"（用户不存在）/ "insufficient"（余额不足）/ "already_unlocked"（宠物已解锁）/ "invalid"（操作或商品无效）
+    """
+    ok: bool
+    reason: str
+    name: str = ""
+    balance: int = 0
+    spent: int = 0
+    unlocked: Tuple[str, ...] = ()
+    granted: Tuple[Tuple[str, int], ...] = ()
 
 
 class DataManager:
@@ -10,39 +41,90 @@ class DataManager:
     属性：
         data_dir: 数据目录路径
         users_path: 用户数据文件路径
+        backup_dir: 自动备份目录（users.json 损坏时从中恢复）
+        schema_path: 数据版本文件 schema.json（记录已完成的迁移版本与进行中迁移的游标）
+        migration_stats: 本次启动执行迁移的统计（见 migrations.run_pending）
+        recovered_from: 启动时从备份恢复所用的备份文件路径（未恢复为空串）
+        ledger: 货币账本（data/ledger），记录每一笔 total_run_time 变化
         pets_path: 宠物配置文件路径
         users_cache: 内存中的用户数据缓存（dict）
         pets_cache: 内存中的宠物配置缓存（dict）
         _lock: 全局锁，保护缓存并发访问
         _stop: 写线程停止标志
-        _writer_thread: 写入守护线程，每秒合并并落盘
+        _writer_thread: 写入守护线程，合并并落盘（未提供 scheduler 时每秒一次，否则等待落盘信号）
+        _flush_timer: 提供 scheduler 时的周期定时器，只负责通知写线程（不在 Tk 线程写盘）
+        _flush_signal: 通知写线程立即落盘的事件
+        _write_lock: 串行化 users.json 的写入，保证较新的快照不会被较旧的覆盖（先于 _lock 获取）
         _pending_user_updates: 待写入的用户字段更新（按用户名聚合）
     方法：
         ensure_ready(): 确保目录与文件存在并加载缓存
         get_user(username): 获取用户数据（不存在返回 None）
+        snapshot_users(): 获取用户数据的时间点视图与版本号（供后台备份在锁外序列化）
         upsert_user(username, user_obj): 插入或更新完整用户对象并立即落盘
         enqueue_user_update(username, patch): 入队字段更新，异步合并写入
-        deduct_total_run_time(username, seconds): 扣减总运行时间（防负），异步写入
+        deduct_total_run_time(username, seconds, kind, memo): 扣减总运行时间（防负），异步写入并记账
+        credit_total_run_time(username, seconds, kind, memo): 增加总运行时间，异步写入并记账
+        accrue_run_time(username, pet_name, seconds): 累计运行时间（计时器调用，账本按批合并）
+        record_event(username, kind, memo): 记录不改变余额的账本事件（如卡密解锁）
+        transact(username, ops, kind, memo): 在一次加锁内校验并执行扣减 / 解锁 / 发放，合并为一次入队更新
+        checkout(username, cart): 按目录价格结算购物车（宠物与粮食），基于 transact
         get_pets(): 获取宠物配置字典
+        get_pets_view()/get_foods_view(): 获取目录的只读视图（不复制）
+        search_catalog(kind, query, ...): 基于目录索引的搜索/过滤/排序
+        reload_catalogs(): 重新读取 pets/foods 配置并增量更新索引
+        subscribe(fn)/unsubscribe(fn): 订阅数据变化通知 fn(username, fields)
+        transfer_key_status(username, key, ts): 转账卡密防重放检查（已用 / 过期），O(1)
+        redeem_transfer_key(username, key, ts, seconds): 原子地检查、入账并登记转账卡密
         flush_now(): 立即将待更新内容落盘到 users.json
-        stop(): 停止写线程（程序退出时调用）
+        stop(): 停止写线程 / 落盘定时器并最后落盘（程序退出时调用）
     异常：
         文件读写异常将在内部捕获并重试，必要时回退为空结构。
     """
 
-    def __init__(self, data_dir: str = "data") -> None:
+    FLUSH_INTERVAL_MS = 1000
+    FLUSH_SLACK_MS = 500
+    # 转账卡密有效期：生成时间（载荷中的 ts）超过该时长的卡密直接拒绝，已用记录也只需保留这么久
+    TRANSFER_KEY_TTL_S = 30 * 24 * 3600
+    # 允许卡密生成时间比本机时钟超前的幅度（两台电脑时钟不一致）
+    TRANSFER_KEY_SKEW_S = 24 * 3600
+
+    def __init__(self, data_dir: str = "data", scheduler=None) -> None:
+        """scheduler：可选的 TimerWheel；提供时由时间轮定时通知写线程落盘（计时统一，写盘仍在写线程）"""
         self.data_dir = data_dir
         self.users_path = os.path.join(self.data_dir, "users.json")
         self.pets_path = os.path.join(self.data_dir, "pets.json")
         self.foods_path = os.path.join(self.data_dir, "foods.json")
+        self.backup_dir = os.path.join(self.data_dir, "backups")
+        self.schema_path = os.path.join(self.data_dir, "schema.json")
+        self.migration_stats: Dict[str, Any] = {}
+        self.recovered_from = ""
+        self.ledger = Ledger(os.path.join(self.data_dir, "ledger"))
         self.users_cache: Dict[str, Dict[str, Any]] = {}
         self.pets_cache: Dict[str, Dict[str, Any]] = {}
         self.foods_cache: Dict[str, Dict[str, Any]] = {}
+        # 目录索引：加载时构建，目录重载时增量更新
+        self.pets_index = CatalogIndex()
+        self.foods_index = CatalogIndex()
         self._lock = threading.RLock()
         self._stop = threading.Event()
+        self._flush_signal = threading.Event()
+        self._write_lock = threading.Lock()
         self._pending_user_updates: Dict[str, Dict[str, Any]] = {}
-        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        # 用户数据版本号：每次写入或入队更新加一，备份据此跳过未变化的数据
+        self._users_version = 0
+        # 快照代数：每次取锁外序列化用的视图（落盘 / 备份）加一，用于已用卡密索引的写时复制
+        self._snapshot_gen = 0
+        # 已用转账卡密的内存状态：用户名 -> [索引字典, (生成时间, 摘要) 最小堆, 可原地修改的快照代数]
+        self._used_states: Dict[str, List[Any]] = {}
+        self._listeners: List[Callable[[Optional[str], FrozenSet[str]], None]] = []
+        self._writer_thread: Optional[threading.Thread] = None
+        self._flush_timer = None
         self.ensure_ready()
+        self._scheduled = scheduler is not None
+        if scheduler is not None:
+            # 落盘不要求准时，允许提前与其他定时器合并唤醒；回调只置位事件，序列化与写盘在写线程
+            self._flush_timer = scheduler.call_every(self.FLUSH_INTERVAL_MS, self._flush_signal.set, slack_ms=self.FLUSH_SLACK_MS)
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
         self._writer_thread.start()
 
     def ensure_ready(self) -> None:
@@ -70,11 +152,39 @@ class DataManager:
                     "frames": "assets/pets/pixel_food_carrot.json"
                 }
             })
-        self.users_cache = self._safe_read_json(self.users_path, {})
+        self.users_cache = self._load_users()
         self.pets_cache = self._safe_read_json(self.pets_path, {})
         self.foods_cache = self._safe_read_json(self.foods_path, {})
-        # 规范化历史数据中的 pet_run_time 键名
-        self._normalize_pet_run_time_keys()
+        self.pets_index.update(self.pets_cache)
+        self.foods_index.update(self.foods_cache)
+        # 执行尚未完成的一次性数据迁移（已是最新版本时不遍历用户）
+        if self.recovered_from:
+            # 从备份恢复的数据可能来自旧版本：重新执行全部迁移（迁移是幂等的）
+            save_schema(self.schema_path, {"version": 0})
+        try:
+            self.migration_stats = run_pending(self, self.schema_path)
+        except Exception as e:
+            # 迁移整体失败（如目录配置损坏）不阻止启动；版本号未推进，下次启动重试
+            print(f"数据迁移失败，已跳过: {e}")
+
+    def _load_users(self) -> Dict[str, Dict[str, Any]]:
+        """读取 users.json；解析失败时保留损坏文件，并从最近一份完好的自动备份恢复"""
+        users = self._safe_read_json(self.users_path, None)
+        if isinstance(users, dict):
+            return users
+        if not os.path.exists(self.users_path):
+            return {}
+        # 文件存在但无法解析：不能静默回退为空（下一次落盘会覆盖所有账户）
+        try:
+            os.replace(self.users_path, f"{self.users_path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}")
+        except OSError:
+            pass
+        found = load_latest_good(self.backup_dir)
+        if found is None:
+            return {}
+        self.recovered_from, users = found
+        self._safe_write_json(self.users_path, users)
+        return users
 
     def _safe_read_json(self, path: str, default: Any) -> Any:
         """安全读取 JSON 文件并返回，失败时返回 default"""
@@ -100,6 +210,18 @@ class DataManager:
         with self._lock:
             return self.users_cache.get(username)
 
+    def snapshot_users(self) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """返回 (版本号, 用户数据时间点视图)，视图已合并尚未落盘的入队更新
+        持锁期间只复制到用户对象一层（字段中的字典 / 列表按约定整体替换而非原地修改），
+        序列化可在锁外进行而不受后续写入影响
+        """
+        with self._lock:
+            view = {username: dict(user) for username, user in self.users_cache.items()}
+            for username, patch in self._pending_user_updates.items():
+                view.setdefault(username, {}).update(patch)
+            self._snapshot_gen += 1
+            return self._users_version, view
+
     def get_pets(self) -> Dict[str, Dict[str, Any]]:
         """获取宠物配置字典（只读副本）"""
         with self._lock:
@@ -110,57 +232,90 @@ class DataManager:
         with self._lock:
             return dict(self.foods_cache)
 
-    def _normalize_pet_run_time_keys(self) -> None:
-        """规范化用户 pet_run_time 的键名，避免出现文件路径作为键"""
-        try:
-            import os
-            # 构建路径到宠物名的映射（含无扩展名对照）
-            path_to_name: Dict[str, str] = {}
-            base_to_name: Dict[str, str] = {}
-            for name, cfg in self.pets_cache.items():
-                p = os.path.normpath(str(cfg.get("frames", ""))).lower()
-                if p:
-                    path_to_name[p] = name
-                    base = os.path.basename(p)
-                    base_no_ext = base.split(".")[0]
-                    base_to_name[base_no_ext] = name
-
-            # 遍历用户，修正 pet_run_time 的键
-            for uname, user in list(self.users_cache.items()):
-                prt = dict(user.get("pet_run_time", {}))
-                changed = False
-                new_prt: Dict[str, int] = {}
-                for k, v in prt.items():
-                    kk = str(k)
-                    norm_k = os.path.normpath(kk).lower()
-                    target_name = None
-                    if norm_k in path_to_name:
-                        target_name = path_to_name[norm_k]
-                    else:
-                        # 尝试补扩展名或用 basename 映射
-                        if not kk.endswith(".json") and (norm_k + ".json") in path_to_name:
-                            target_name = path_to_name[norm_k + ".json"]
-                        else:
-                            base_no_ext = os.path.basename(norm_k).split(".")[0]
-                            target_name = base_to_name.get(base_no_ext)
-
-                    if target_name:
-                        new_prt[target_name] = int(new_prt.get(target_name, 0)) + int(v)
-                        if target_name != kk:
-                            changed = True
-                    else:
-                        new_prt[kk] = int(v)
-                if changed:
-                    user["pet_run_time"] = new_prt
-        except Exception:
-            # 忽略规范化异常，避免影响主流程
-            pass
+    def get_pets_view(self) -> Mapping[str, Dict[str, Any]]:
+        """获取宠物配置的只读视图（不复制，适合高频读取的界面渲染）
+        目录热加载时原地更新同一个字典，已持有的视图随之反映新目录
+        """
+        with self._lock:
+            return MappingProxyType(self.pets_cache)
 
-    def upsert_user(self, username: str, user_obj: Dict[str, Any]) -> bool:
-        """插入或更新完整用户对象，并立即落盘到 users.json"""
+    def get_foods_view(self) -> Mapping[str, Dict[str, Any]]:
+        """获取粮食配置的只读视图（不复制，适合高频读取的界面渲染；热加载后同样反映新目录）"""
+        with self._lock:
+            return MappingProxyType(self.foods_cache)
+
+    def search_catalog(
+        self,
+        kind: str,
+        query: str = "",
+        price_min: Optional[int] = None,
+        price_max: Optional[int] = None,
+        unlock_type: Optional[str] = None,
+        sort: str = "default",
+    ) -> List[str]:
+        """在宠物（kind="pet"）或粮食（kind="food"）目录索引中搜索，返回排序后的名称列表"""
+        with self._lock:
+            index = self.pets_index if kind == "pet" else self.foods_index
+            return index.search(query, price_min=price_min, price_max=price_max, unlock_type=unlock_type, sort=sort)
+
+    def reload_catalogs(self) -> bool:
+        """重新读取 pets.json 与 foods.json，增量更新索引；目录有变化时返回 True
+        缓存字典原地更新（而非重新绑定），get_pets_view / get_foods_view 返回的视图不会停留在旧目录
+        """
+        pets = self._safe_read_json(self.pets_path, None)
+        foods = self._safe_read_json(self.foods_path, None)
+        changed = False
+        with self._lock:
+            if isinstance(pets, dict) and pets != self.pets_cache:
+                self.pets_cache.clear()
+                self.pets_cache.update(pets)
+                self.pets_index.update(pets)
+                changed = True
+            if isinstance(foods, dict) and foods != self.foods_cache:
+                self.foods_cache.clear()
+                self.foods_cache.update(foods)
+                self.foods_index.update(foods)
+                changed = True
+        if changed:
+            self._notify(None, ("catalog",))
+        return changed
+
+    def subscribe(self, fn: Callable[[Optional[str], FrozenSet[str]], None]) -> None:
+        """订阅数据变化：用户字段更新时 fn(用户名, 字段集合)，目录重载时 fn(None, {"catalog"})
+        注：回调可能在写入方线程中、持锁时调用，只应记录变化（如标记脏数据），不要直接操作 Tk 控件
+        """
+        with self._lock:
+            if fn not in self._listeners:
+                self._listeners.append(fn)
+
+    def unsubscribe(self, fn: Callable[[Optional[str], FrozenSet[str]], None]) -> None:
         with self._lock:
+            try:
+                self._listeners.remove(fn)
+            except ValueError:
+                pass
+
+    def _notify(self, username: Optional[str], fields: Iterable[str]) -> None:
+        fields = frozenset(fields)
+        for fn in list(self._listeners):
+            try:
+                fn(username, fields)
+            except Exception:
+                # 订阅者异常不影响数据写入
+                pass
+
+    def upsert_user(self, username: str, user_obj: Dict[str, Any]) -> bool:
+        """插入或更新完整用户对象，并立即落盘到 users.json；余额与账本不一致时（如导入备份）记一笔差额"""
+        with self._write_lock, self._lock:
+            recorded = self.ledger.balance(username)
+            total = int(user_obj.get("total_run_time", 0) or 0)
+            if recorded is not None and recorded != total:
+                self.ledger.record(username, "adjust", total - recorded, total, memo="upsert")
             self.users_cache[username] = user_obj
-            return self._safe_write_json(self.users_path, self.users_cache)
+            self._users_version += 1
+            ok = self._safe_write_json(self.users_path, self.users_cache)
+        self._notify(username, user_obj.keys())
+        return ok
 
     def enqueue_user_update(self, username: str, patch: Dict[str, Any]) -> None:
         """将用户字段更新入队（异步写入），同一用户多次更新自动合并"""
@@ -168,9 +323,11 @@ class DataManager:
             cached = self._pending_user_updates.get(username, {})
             cached.update(patch)
             self._pending_user_updates[username] = cached
+            self._users_version += 1
+            self._notify(username, patch.keys())
 
-    def deduct_total_run_time(self, username: str, seconds: int) -> bool:
-        """扣减总运行时间（防止小于 0），入队并立即返回是否成功"""
+    def deduct_total_run_time(self, username: str, seconds: int, kind: str = "purchase", memo: str = "") -> bool:
+        """扣减总运行时间（防止小于 0），入队并立即返回是否成功；kind / memo 为账本记录类型与备注"""
         with self._lock:
             user = self.users_cache.get(username)
             if not user:
@@ -182,10 +339,11 @@ class DataManager:
             user["total_run_time"] = new_val
             # 入队持久化
             self.enqueue_user_update(username, {"total_run_time": new_val})
+            self.ledger.record(username, kind, -int(seconds), new_val, memo)
             return True
 
-    def credit_total_run_time(self, username: str, seconds: int) -> bool:
-        """增加总运行时间（秒），入队并立即返回是否成功"""
+    def credit_total_run_time(self, username: str, seconds: int, kind: str = "transfer_in", memo: str = "") -> bool:
+        """增加总运行时间（秒），入队并立即返回是否成功；kind / memo 为账本记录类型与备注"""
         with self._lock:
             if seconds <= 0:
                 return False
@@ -196,19 +354,51 @@ class DataManager:
             new_val = current + int(seconds)
             user["total_run_time"] = new_val
             self.enqueue_user_update(username, {"total_run_time": new_val})
+            self.ledger.record(username, kind, int(seconds), new_val, memo)
             return True
 
-    def flush_now(self) -> None:
-        """立即合并待更新并落盘到 users.json（用于关键路径如注册）"""
+    def accrue_run_time(self, username: str, pet_name: str, seconds: int = 1) -> Optional[Tuple[int, int]]:
+        """累计运行时间（总时间与当前宠物时间），返回 (总时间, 宠物时间)；用户不存在返回 None
+        账本中连续的累计按批合并为一条记录，避免每秒一条
+        """
         with self._lock:
-            if not self._pending_user_updates:
-                return
-            for username, patch in self._pending_user_updates.items():
-                base = self.users_cache.get(username, {})
-                base.update(patch)
-                self.users_cache[username] = base
-            self._pending_user_updates.clear()
-            self._safe_write_json(self.users_path, self.users_cache)
+            user = self.users_cache.get(username)
+            if not user:
+                return None
+            total = int(user.get("total_run_time", 0)) + int(seconds)
+            pet_times = dict(user.get("pet_run_time", {}))
+            pet_times[pet_name] = int(pet_times.get(pet_name, 0)) + int(seconds)
+            user["total_run_time"] = total
+            user["pet_run_time"] = pet_times
+            self.enqueue_user_update(username, {"total_run_time": total, "pet_run_time": pet_times})
+            self.ledger.accrue(username, int(seconds), total)
+            return total, pet_times[pet_name]
+
+    def record_event(self, username: str, kind: str, memo: str = "") -> None:
+        """记录不改变余额的账本事件（如 unlock 卡密解锁）"""
+        with self._lock:
+            user = self.users_cache.get(username)
+            if user is not None:
+                self.ledger.record(username, kind, 0, int(user.get("total_run_time", 0)), memo)
+
+    def flush_now(self) -> None:
+        """立即合并待更新并落盘到 users.json（用于关键路径如注册），同时写出账本缓冲
+        持锁期间只合并更新并复制到用户对象一层（同 snapshot_users），序列化与写盘在锁外进行，
+        写盘期间计时器等对 _lock 的访问不被阻塞
+        """
+        self.ledger.flush()
+        with self._write_lock:
+            with self._lock:
+                if not self._pending_user_updates:
+                    return
+                for username, patch in self._pending_user_updates.items():
+                    base = self.users_cache.get(username, {})
+                    base.update(patch)
+                    self.users_cache[username] = base
+                self._pending_user_updates.clear()
+                view = {username: dict(user) for username, user in self.users_cache.items()}
+                self._snapshot_gen += 1
+            self._safe_write_json(self.users_path, view)
 
     def add_inventory_item(self, username: str, item_name: str, qty: int) -> None:
         """增加用户粮仓中某项的数量"""
@@ -241,39 +431,228 @@ class DataManager:
             self.enqueue_user_update(username, {"inventory": inv})
             return True
 
+    def transact(self, username: str, ops: Sequence[TxnOp], kind: str = "purchase", memo: str = "") -> TxnResult:
+        """原子地执行一组操作：全部校验通过才修改，否则不做任何改动
+        在一次加锁内基于缓存中的最新数据构建新的余额 / 已解锁列表 / 运行时间 / 粮仓，
+        只入队一次合并后的字段更新（不会覆盖计时器同时写入的运行时间），账本记一笔净额（kind / memo）
+        """
+        with self._lock:
+            user = self.users_cache.get(username)
+            if not user:
+                return TxnResult(False, "no_user")
+            balance = int(user.get("total_run_time", 0))
+            delta = 0
+            unlocked: List[str] = list(user.get("unlocked_pets", []))
+            new_pets: List[str] = []
+            granted: Dict[str, int] = {}
+            for op in ops:
+                amount = int(op.amount)
+                if op.kind in ("deduct", "credit"):
+                    if amount < 0:
+                        return TxnResult(False, "invalid", op.name, balance)
+                    delta += amount if op.kind == "credit" else -amount
+                elif op.kind == "unlock":
+                    if op.name not in self.pets_cache:
+                        return TxnResult(False, "invalid", op.name, balance)
+                    if op.name in unlocked or op.name in new_pets:
+                        return TxnResult(False, "already_unlocked", op.name, balance)
+                    new_pets.append(op.name)
+                elif op.kind == "grant":
+                    if amount <= 0 or not op.name:
+                        return TxnResult(False, "invalid", op.name, balance)
+                    granted[op.name] = granted.get(op.name, 0) + amount
+                else:
+                    return TxnResult(False, "invalid", op.name, balance)
+            if balance + delta < 0:
+                return TxnResult(False, "insufficient", "", balance, -delta)
+
+            # 校验通过：整体替换字段（不原地修改），合并为一次入队
+            patch: Dict[str, Any] = {}
+            new_balance = balance + delta
+            if delta:
+                patch["total_run_time"] = new_balance
+            if new_pets:
+                patch["unlocked_pets"] = unlocked + new_pets
+                pet_times = dict(user.get("pet_run_time", {}))
+                for name in new_pets:
+                    pet_times.setdefault(name, 0)
+                patch["pet_run_time"] = pet_times
+            if granted:
+                inv = dict(user.get("inventory", {}))
+                for name, qty in granted.items():
+                    inv[name] = int(inv.get(name, 0)) + qty
+                patch["inventory"] = inv
+            if patch:
+                user.update(patch)
+                self.enqueue_user_update(username, patch)
+            if delta:
+                self.ledger.record(username, kind, delta, new_balance, memo)
+            for name in new_pets:
+                self.ledger.record(username, "unlock", 0, new_balance, name)
+            return TxnResult(True, "ok", "", new_balance, -delta, tuple(new_pets), tuple(granted.items()))
+
+    def checkout(self, username: str, cart: Iterable[Tuple[str, str, int]]) -> TxnResult:
+        """结算购物车：cart 为 (类别 "pet"/"food", 名称, 数量) 列表，价格在锁内按当前目录计算
+        卡密宠物不可购买；任一商品无效、已解锁或余额不足时整单不生效
+        """
+        with self._lock:
+            ops: List[TxnOp] = []
+            price = 0
+            labels: List[str] = []
+            for item_kind, name, qty in cart:
+                qty = int(qty)
+                if item_kind == "pet":
+                    cfg = self.pets_cache.get(name)
+                    if cfg is None or cfg.get("unlock_type") == "key":
+                        return TxnResult(False, "invalid", name)
+                    price += int(cfg.get("price", 0))
+                    ops.append(TxnOp("unlock", name))
+                    labels.append(name)
+                elif item_kind == "food":
+                    cfg = self.foods_cache.get(name)
+                    if cfg is None or qty <= 0:
+                        return TxnResult(False, "invalid", name)
+                    price += int(cfg.get("price", 0)) * qty
+                    ops.append(TxnOp("grant", name, qty))
+                    labels.append(f"{name}x{qty}")
+                else:
+                    return TxnResult(False, "invalid", name)
+            if not ops:
+                return TxnResult(False, "invalid")
+            ops.insert(0, TxnOp("deduct", amount=price))
+            return self.transact(username, ops, "purchase", ", ".join(labels))
+
     def stop(self) -> None:
-        """停止写线程并进行最后一次落盘"""
+        """停止写线程 / 落盘定时器并进行最后一次落盘"""
         self._stop.set()
+        self._flush_signal.set()
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
         try:
-            self._writer_thread.join(timeout=2.0)
+            if self._writer_thread is not None:
+                self._writer_thread.join(timeout=2.0)
         except RuntimeError:
             pass
         self.flush_now()
+        self.ledger.flush(force=True)
+
+    @staticmethod
+    def transfer_key_digest(key: str) -> str:
+        """已用转账卡密的登记摘要（sha256 前 16 位十六进制），比保存完整卡密紧凑"""
+        return hashlib.sha256(key.strip().encode("utf-8")).hexdigest()[:16]
+
+    def _used_transfer_index(self, username: str) -> Dict[str, int]:
+        """用户已用转账卡密索引 {摘要: 卡密生成时间}（调用方需持锁）
+        旧数据为完整卡密列表时（如导入旧版本备份，迁移 2 之外的路径）只在内存中转换一次：
+        从载荷读取生成时间并丢弃已过期的记录；查询路径不入队写入，下次登记卡密时随之持久化
+        """
+        user = self.users_cache.get(username) or {}
+        used = user.get("used_transfer_keys")
+        if isinstance(used, dict):
+            return used
+        index = self.transfer_index_from_keys(used or [])
+        if used and username in self.users_cache:
+            user["used_transfer_keys"] = index
+        return index
+
+    def _used_state(self, username: str) -> List[Any]:
+        """已用卡密的内存状态 [索引字典, 按生成时间的最小堆, 可原地修改的快照代数]（调用方需持锁）
+        索引字典被整体替换（导入、迁移等）时按新字典重建；堆只在内存中，启动后首次登记时构建一次
+        """
+        index = self._used_transfer_index(username)
+        state = self._used_states.get(username)
+        if state is None or state[0] is not index:
+            heap = [(t, d) for d, t in index.items()]
+            heapq.heapify(heap)
+            # 代数 -1：字典可能已被入队更新或快照引用，首次修改前需复制
+            state = self._used_states[username] = [index, heap, -1]
+        return state
+
+    @classmethod
+    def transfer_index_from_keys(cls, keys: Iterable[str]) -> Dict[str, int]:
+        """由旧版完整卡密列表生成 {摘要: 生成时间} 索引，丢弃已过有效期的记录"""
+        cutoff = int(time.time()) - cls.TRANSFER_KEY_TTL_S
+        stamped = [(LicenseManager.transfer_key_ts(str(key)), str(key)) for key in keys]
+        # 按生成时间升序登记（与迁移 3 的存储顺序一致）
+        return {
+            cls.transfer_key_digest(key): ts
+            for ts, key in sorted((ts, key) for ts, key in stamped if ts is not None and ts >= cutoff)
+        }
+
+    def transfer_key_status(self, username: str, key: str, ts: int, now: Optional[float] = None) -> str:
+        """转账卡密防重放检查：返回 "ok" / "used"（已使用）/ "expired"（超出有效期或生成时间异常）"""
+        now = int(time.time() if now is None else now)
+        if ts < now - self.TRANSFER_KEY_TTL_S or ts > now + self.TRANSFER_KEY_SKEW_S:
+            return "expired"
+        with self._lock:
+            if self.transfer_key_digest(key) in self._used_transfer_index(username):
+                return "used"
+        return "ok"
 
     def is_transfer_key_used(self, username: str, key: str) -> bool:
         """检查指定用户是否已使用某充值/转账卡密"""
         with self._lock:
-            user = self.users_cache.get(username) or {}
-            used = set(user.get("used_transfer_keys", []))
-            return key in used
+            return self.transfer_key_digest(key) in self._used_transfer_index(username)
 
-    def mark_transfer_key_used(self, username: str, key: str) -> None:
-        """标记指定用户已使用某充值/转账卡密"""
+    def mark_transfer_key_used(self, username: str, key: str, ts: Optional[int] = None) -> None:
+        """登记指定用户已使用某充值/转账卡密；ts 为卡密生成时间（缺省从载荷读取）
+        过期清理：内存中按生成时间维护最小堆，每次登记时弹出已过有效期的记录，
+        已用记录严格受有效期约束，且与登记顺序无关；单次登记为 O(log n)（均摊）。
+        写时复制：索引字典自上次复制以来被落盘 / 备份快照引用过时才复制一次，否则原地修改
+        """
+        if ts is None:
+            ts = LicenseManager.transfer_key_ts(key)
+        if ts is None:
+            ts = int(time.time())
         with self._lock:
-            user = self.users_cache.get(username)
-            if not user:
+            if username not in self.users_cache:
                 return
-            used = set(user.get("used_transfer_keys", []))
-            used.add(key)
-            user["used_transfer_keys"] = list(used)
-            self.enqueue_user_update(username, {"used_transfer_keys": list(used)})
+            cutoff = int(time.time()) - self.TRANSFER_KEY_TTL_S
+            state = self._used_state(username)
+            used, heap = state[0], state[1]
+            if state[2] != self._snapshot_gen:
+                # 已被快照（锁外序列化）引用：复制一次，此后直到下一次快照前原地修改
+                used = state[0] = dict(used)
+                state[2] = self._snapshot_gen
+            while heap and heap[0][0] < cutoff:
+                t, d = heapq.heappop(heap)
+                # 同一卡密重复登记时堆中可能有旧条目，只删除生成时间一致的记录
+                if used.get(d) == t:
+                    del used[d]
+            digest = self.transfer_key_digest(key)
+            used[digest] = int(ts)
+            heapq.heappush(heap, (int(ts), digest))
+            self.users_cache[username]["used_transfer_keys"] = used
+            self.enqueue_user_update(username, {"used_transfer_keys": used})
+
+    def redeem_transfer_key(self, username: str, key: str, ts: int, seconds: int, memo: str = "") -> str:
+        """原子地兑换转账卡密：检查防重放、入账并登记
+        返回 "ok" / "used" / "expired" / "invalid"（用户无效或秒数非法）
+        """
+        with self._lock:
+            status = self.transfer_key_status(username, key, ts)
+            if status != "ok":
+                return status
+            if not self.credit_total_run_time(username, seconds, "transfer_in", memo):
+                return "invalid"
+            self.mark_transfer_key_used(username, key, ts)
+            return "ok"
 
     def _writer_loop(self) -> None:
-        """守护线程：每秒合并入队更新并原子写入 users.json"""
+        """守护线程：合并入队更新并原子写入 users.json
+        提供 scheduler 时等待时间轮的落盘信号，否则每秒一次
+        """
         while not self._stop.is_set():
-            time.sleep(1.0)
-            try:
-                self.flush_now()
-            except Exception:
-                # 忽略异常，下一轮继续尝试
-                pass
+            self._flush_signal.wait(None if self._scheduled else self.FLUSH_INTERVAL_MS / 1000.0)
+            self._flush_signal.clear()
+            if self._stop.is_set():
+                break
+            self._flush_quietly()
+
+    def _flush_quietly(self) -> None:
+        """周期落盘：忽略异常，下一轮继续尝试"""
+        try:
+            self.flush_now()
+        except Exception:
+            pass
@@ -1,203 +1,307 @@
 import sys
-import time
 import random
 import tkinter as tk
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Set
 import pygame  # Added pygame import
 
-try:
-    import win32con
-    import win32gui
-except Exception:
-    win32con = None
-    win32gui = None
-
+from .clock import TkClock
 from .pet import PetAnimator
+from .renderers import PetRenderer, create_renderer
 from .runtime_tracker import RuntimeTracker
 from .data_manager import DataManager  # Added import
-from .fatigue_detector import FatigueDetector
+
+try:
+    from .fatigue_detector import FatigueDetector
+except Exception:
+    # 疲劳检测依赖摄像头与视觉库，缺失时悬浮窗照常运行（不显示状态轮廓）
+    FatigueDetector = None
+
+
+class StaticFatigueSource:
+    """固定状态的疲劳状态源：未安装疲劳检测或无界面运行时使用，可通过 status 属性改变状态"""
+
+    STATUS_NORMAL = "normal"
+    STATUS_FATIGUE = "fatigue"
+    STATUS_NO_FACE = "no_face"
+
+    def __init__(self, status: Optional[str] = None) -> None:
+        self.status = status
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def get_status(self) -> Optional[str]:
+        return self.status
+
+
+class _MenuRow:
+    """菜单中的一行：持有 Label 与当前菜单项，update 时只在显示内容变化时重新配置控件"""
+
+    def __init__(self, menu: "PixelContextMenu", parent: tk.Misc, item: dict, in_submenu: bool) -> None:
+        self.menu = menu
+        self.in_submenu = in_submenu
+        self.item: dict = {}
+        self.text = ""
+        self.label = tk.Label(
+            parent,
+            fg=menu.FG_COLOR,
+            bg=menu.BG_COLOR,
+            font=menu.FONT,
+            anchor="w",
+            padx=12,
+            pady=8
+        )
+        self.label.bind("<Enter>", self._on_enter)
+        self.label.bind("<Leave>", self._on_leave)
+        self.label.bind("<Button-1>", self._on_click)
+        self.update(item)
+
+    def _text_for(self, item: dict) -> str:
+        text = f" {item['label']} "
+        if self.in_submenu:
+            # 支持选中状态标记（未选中时占位对齐）
+            text = (" ✓" if item.get("checked") else "   ") + text
+        elif item.get("submenu") is not None:
+            text += " ▶"  # 添加子菜单指示箭头
+        return text
+
+    def update(self, item: dict) -> bool:
+        """更新菜单项，返回显示内容是否变化（命令变化无需重新配置控件）"""
+        self.item = item
+        text = self._text_for(item)
+        if text == self.text:
+            return False
+        self.text = text
+        self.label.configure(text=text)
+        return True
+
+    def _on_enter(self, e) -> None:
+        self.label.configure(bg=self.menu.HOVER_BG, fg=self.menu.HOVER_FG)
+        if not self.in_submenu:
+            self.menu._on_row_enter(self)
+
+    def _on_leave(self, e) -> None:
+        self.label.configure(bg=self.menu.BG_COLOR, fg=self.menu.FG_COLOR)
+        # 注意：这里不能立即隐藏子菜单，否则鼠标移动到子菜单时会消失
+
+    def _on_click(self, e) -> None:
+        if not self.in_submenu and self.item.get("submenu") is not None:
+            return
+        self.menu.hide()  # 关闭所有菜单
+        cmd = self.item.get("command")
+        if cmd:
+            cmd()
+
+    def destroy(self) -> None:
+        try:
+            self.label.destroy()
+        except Exception:
+            pass
+
+
+class _MenuPanel:
+    """一组菜单行（主菜单或子菜单）：按 key 复用行控件，只创建/销毁/更新变化的行"""
+
+    def __init__(self, menu: "PixelContextMenu", window: tk.Toplevel, in_submenu: bool) -> None:
+        self.menu = menu
+        self.window = window
+        self.in_submenu = in_submenu
+        border = tk.Frame(window, bg=menu.BORDER_COLOR, padx=2, pady=2)
+        border.pack(fill="both", expand=True)
+        self.content = tk.Frame(border, bg=menu.BG_COLOR)
+        self.content.pack(fill="both", expand=True)
+        self.rows: Dict[str, object] = {}
+        self.order: List[str] = []
+
+    @staticmethod
+    def item_key(item: dict, i: int) -> str:
+        if item.get("separator"):
+            return f"__separator_{i}"
+        return str(item.get("key", item["label"]))
+
+    def set_items(self, items: list) -> int:
+        """同步菜单项，返回实际改动的行数"""
+        keys = [self.item_key(it, i) for i, it in enumerate(items)]
+        changed = 0
+        rows: Dict[str, object] = {}
+        for key, item in zip(keys, items):
+            row = self.rows.pop(key, None)
+            if row is None:
+                if item.get("separator"):
+                    row = tk.Frame(self.content, bg="#555", height=1)
+                else:
+                    row = _MenuRow(self.menu, self.content, item, self.in_submenu)
+                changed += 1
+            elif isinstance(row, _MenuRow) and row.update(item):
+                changed += 1
+            rows[key] = row
+        for row in self.rows.values():
+            row.destroy()
+            changed += 1
+        if keys != self.order:
+            # 顺序或成员变化时才重新排列
+            for row in rows.values():
+                self._widget(row).pack_forget()
+            for key in keys:
+                row = rows[key]
+                if isinstance(row, _MenuRow):
+                    row.label.pack(fill="x")
+                else:
+                    row.pack(fill="x", padx=4, pady=4)
+        self.rows = rows
+        self.order = keys
+        return changed
+
+    @staticmethod
+    def _widget(row) -> tk.Widget:
+        return row.label if isinstance(row, _MenuRow) else row
 
 
 class PixelContextMenu:
-    """自定义像素风格右键菜单"""
+    """自定义像素风格右键菜单：预先构建并隐藏（withdraw）复用
+    使用：
+        menu = PixelContextMenu(master, items)     # 构建一次，之后保持隐藏
+        menu.set_submenu("feed", new_items)        # 只更新变化的行（数量、勾选状态等）
+        menu.show(x, y) / menu.hide()              # 打开只需定位与显示，耗时与菜单项数量无关
+    说明：
+        - 菜单项为 dict：label / command / submenu / checked / separator；可选 key 作为行标识（默认 label）
+        - 带 submenu 的项各自对应一个预先构建的隐藏子菜单窗口，悬停时定位显示
+    """
+
+    # 样式常量
+    BORDER_COLOR = "#FFD700"  # 金色边框
+    BG_COLOR = "#222222"      # 深色背景
+    FG_COLOR = "#FFFFFF"      # 白色文字
+    HOVER_BG = "#FFD700"      # 悬停背景
+    HOVER_FG = "#000000"      # 悬停文字
+    FONT = ("微软雅黑", 10)
+
     def __init__(self, master: tk.Misc, items: list) -> None:
         self.master = master
-        self.items = items
-        self.window: Optional[tk.Toplevel] = None
-        self.submenu_window: Optional[tk.Toplevel] = None
+        self.window = self._make_window(master)
+        self._panel = _MenuPanel(self, self.window, in_submenu=False)
+        self._submenus: Dict[str, _MenuPanel] = {}
+        self._active_submenu: Optional[_MenuPanel] = None
+        self._visible = False
+        # 点击外部关闭逻辑
+        self.window.bind("<Button-1>", self._check_close)
+        self.set_items(items)
+
+    @staticmethod
+    def _make_window(master: tk.Misc) -> tk.Toplevel:
+        win = tk.Toplevel(master)
+        win.withdraw()
+        win.overrideredirect(True)
+        win.attributes("-topmost", True)
+        return win
+
+    @property
+    def items(self) -> list:
+        return [row.item for row in self._panel.rows.values() if isinstance(row, _MenuRow)]
+
+    def set_items(self, items: list) -> int:
+        """同步主菜单项及其子菜单，返回改动的行数"""
+        changed = self._panel.set_items(items)
+        for i, item in enumerate(items):
+            sub = item.get("submenu")
+            if sub is not None:
+                changed += self.set_submenu(_MenuPanel.item_key(item, i), sub)
+        return changed
+
+    def set_submenu(self, key: str, items: list) -> int:
+        """同步指定主菜单项（按 key）的子菜单，返回改动的行数"""
+        panel = self._submenus.get(key)
+        if panel is None:
+            panel = _MenuPanel(self, self._make_window(self.window), in_submenu=True)
+            self._submenus[key] = panel
+        return panel.set_items(items)
 
     def show(self, x: int, y: int) -> None:
         self.hide()
-        
-        self.window = tk.Toplevel(self.master)
-        self.window.overrideredirect(True)
-        self.window.attributes("-topmost", True)
         self.window.geometry(f"+{x}+{y}")
-        
-        # 样式常量
-        BORDER_COLOR = "#FFD700"  # 金色边框
-        BG_COLOR = "#222222"      # 深色背景
-        FG_COLOR = "#FFFFFF"      # 白色文字
-        HOVER_BG = "#FFD700"      # 悬停背景
-        HOVER_FG = "#000000"      # 悬停文字
-        
-        # 边框容器
-        border = tk.Frame(self.window, bg=BORDER_COLOR, padx=2, pady=2)
-        border.pack(fill="both", expand=True)
-        
-        # 内容容器
-        content = tk.Frame(border, bg=BG_COLOR)
-        content.pack(fill="both", expand=True)
-        
-        for item in self.items:
-            if item.get("separator"):
-                tk.Frame(content, bg="#555", height=1).pack(fill="x", padx=4, pady=4)
-                continue
-                
-            cmd = item.get("command")
-            sub_items = item.get("submenu")
-            label_text = f" {item['label']} "
-            if sub_items:
-                label_text += " ▶" # 添加子菜单指示箭头
-            
-            lbl = tk.Label(
-                content, 
-                text=label_text, 
-                fg=FG_COLOR, 
-                bg=BG_COLOR,
-                font=("微软雅黑", 10),
-                anchor="w",
-                padx=12,
-                pady=8
-            )
-            lbl.pack(fill="x")
-            
-            # 交互事件
-            def on_enter(e, l=lbl, s=sub_items):
-                l.configure(bg=HOVER_BG, fg=HOVER_FG)
-                if s:
-                    # 显示子菜单
-                    self._show_submenu(l, s)
-                else:
-                    # 隐藏已有子菜单（如果有）
-                    self._hide_submenu()
-            
-            def on_leave(e, l=lbl):
-                l.configure(bg=BG_COLOR, fg=FG_COLOR)
-                # 注意：这里不能立即隐藏子菜单，否则鼠标移动到子菜单时会消失
-                # 依靠 _check_close 或其他逻辑处理
-                
-            def on_click(e, c=cmd):
-                if not sub_items:
-                    self.hide()
-                    if c: c()
-            
-            lbl.bind("<Enter>", on_enter)
-            lbl.bind("<Leave>", on_leave)
-            lbl.bind("<Button-1>", on_click)
+        self.window.deiconify()
+        self.window.lift()
+        self._visible = True
+        try:
+            self.window.grab_set()
+            self.window.focus_set()
+        except tk.TclError:
+            pass
 
-        # 点击外部关闭逻辑
-        self.window.grab_set()
-        self.window.focus_set()
-        self.window.bind("<Button-1>", self._check_close)
-        
-    def _show_submenu(self, parent_widget: tk.Widget, items: list) -> None:
+    def _on_row_enter(self, row: _MenuRow) -> None:
+        key = next((k for k, r in self._panel.rows.items() if r is row), None)
+        panel = self._submenus.get(key) if row.item.get("submenu") is not None else None
+        if panel is None:
+            # 隐藏已有子菜单（如果有）
+            self._hide_submenu()
+            return
+        if panel is self._active_submenu:
+            return
         self._hide_submenu()
-        
-        x = parent_widget.winfo_rootx() + parent_widget.winfo_width()
-        y = parent_widget.winfo_rooty()
-        
-        self.submenu_window = tk.Toplevel(self.window)
-        self.submenu_window.overrideredirect(True)
-        self.submenu_window.attributes("-topmost", True)
-        self.submenu_window.geometry(f"+{x}+{y}")
-        
-        # 样式常量 (复用)
-        BORDER_COLOR = "#FFD700"
-        BG_COLOR = "#222222"
-        FG_COLOR = "#FFFFFF"
-        HOVER_BG = "#FFD700"
-        HOVER_FG = "#000000"
-        
-        border = tk.Frame(self.submenu_window, bg=BORDER_COLOR, padx=2, pady=2)
-        border.pack(fill="both", expand=True)
-        content = tk.Frame(border, bg=BG_COLOR)
-        content.pack(fill="both", expand=True)
-        
-        for item in items:
-            cmd = item.get("command")
-            label_text = f" {item['label']} "
-            
-            # 支持选中状态标记
-            if item.get("checked"):
-                label_text = " ✓" + label_text
-            else:
-                label_text = "   " + label_text # 占位
-                
-            lbl = tk.Label(
-                content, 
-                text=label_text, 
-                fg=FG_COLOR, 
-                bg=BG_COLOR,
-                font=("微软雅黑", 10),
-                anchor="w",
-                padx=12,
-                pady=8
-            )
-            lbl.pack(fill="x")
-            
-            def on_sub_enter(e, l=lbl):
-                l.configure(bg=HOVER_BG, fg=HOVER_FG)
-            
-            def on_sub_leave(e, l=lbl):
-                l.configure(bg=BG_COLOR, fg=FG_COLOR)
-                
-            def on_sub_click(e, c=cmd):
-                self.hide() # 关闭所有菜单
-                if c: c()
-            
-            lbl.bind("<Enter>", on_sub_enter)
-            lbl.bind("<Leave>", on_sub_leave)
-            lbl.bind("<Button-1>", on_sub_click)
-            
+        x = row.label.winfo_rootx() + row.label.winfo_width()
+        y = row.label.winfo_rooty()
+        panel.window.geometry(f"+{x}+{y}")
+        panel.window.deiconify()
+        panel.window.lift()
+        self._active_submenu = panel
+
     def _hide_submenu(self) -> None:
-        if self.submenu_window:
+        if self._active_submenu is not None:
             try:
-                self.submenu_window.destroy()
+                self._active_submenu.window.withdraw()
             except Exception:
                 pass
-            self.submenu_window = None
+            self._active_submenu = None
 
     def _check_close(self, event: tk.Event) -> None:
         # 检查点击是否在主菜单或子菜单范围内
         x, y = event.x_root, event.y_root
-        
+
         def is_in_window(win):
-            if not win: return False
+            if not win or not win.winfo_viewable(): return False
             wx, wy = win.winfo_rootx(), win.winfo_rooty()
             ww, wh = win.winfo_width(), win.winfo_height()
             return wx <= x <= wx + ww and wy <= y <= wy + wh
 
-        if not is_in_window(self.window) and not is_in_window(self.submenu_window):
+        sub = self._active_submenu.window if self._active_submenu else None
+        if not is_in_window(self.window) and not is_in_window(sub):
             self.hide()
 
     def hide(self) -> None:
         self._hide_submenu()
-        if self.window:
+        if self._visible:
             try:
                 self.window.grab_release()
-                self.window.destroy()
+                self.window.withdraw()
             except Exception:
                 pass
-            self.window = None
+            self._visible = False
+
+    def destroy(self) -> None:
+        """销毁菜单窗口（悬浮窗关闭时调用）"""
+        self.hide()
+        try:
+            self.window.destroy()
+        except Exception:
+            pass
+        self._submenus.clear()
 
 
 class FloatWindow:
     """桌宠悬浮窗：置顶、透明、可拖拽，支持右键菜单与点击互动
     依赖：
-        - 优先使用 pywin32 设置层叠透明；缺失时降级为 Tkinter attributes
+        - 绘制与指针事件由渲染后端（core.renderers）提供：默认 Tk Toplevel，可选 pygame 无边框窗口
+        - 菜单与问候气泡依附于 renderer.tk_parent；定时器经 clock 调度（默认 TkClock，应用内传入共享的 TimerWheel）
+        - 无界面运行：backend="null" + core.clock.VirtualClock + 注入疲劳状态源、关闭音频
     """
 
+    DEFAULT_ZOOM = 5.0
+    # 用户字段 / 目录变化 -> 需要刷新的菜单分区
+    MENU_SECTIONS = {"unlocked_pets": "pets", "catalog": "pets", "inventory": "feed"}
+
     def __init__(
         self,
         root: tk.Tk,
@@ -208,6 +312,10 @@ class FloatWindow:
         on_back_home: Optional[Callable[[], None]] = None,
         on_change_pet: Optional[Callable[[], None]] = None,
         on_switched_pet: Optional[Callable[[str], None]] = None,
+        backend: str = "tk",
+        clock=None,
+        fatigue=None,
+        audio: bool = True,
     ) -> None:
         self.root = root
         self.username = username
@@ -218,49 +326,45 @@ class FloatWindow:
         self.on_change_pet = on_change_pet
         self.on_switched_pet = on_switched_pet
 
-        # 疲劳监测
-        self.fatigue_detector = FatigueDetector()
+        # 疲劳监测（可注入任意提供 start / stop / get_status 的状态源）
+        if fatigue is None:
+            fatigue = FatigueDetector() if FatigueDetector is not None else StaticFatigueSource()
+        self.fatigue_detector = fatigue
         self.fatigue_detector.start()
 
         # 音频播放初始化
-        self.audio_enabled = True
+        self.audio_enabled = bool(audio)
         self.is_playing_alert = False
         self.audio_path = r"c:\Users\lion\Desktop\Desktop-Pixel-Pet-main\manbo.mp3"
         self.no_face_audio_path = r"c:\Users\lion\Desktop\Desktop-Pixel-Pet-main\where.mp3"
         self.is_playing_no_face_alert = False
         self.current_audio_state = None
-        try:
-            pygame.mixer.init()
-        except Exception as e:
-            print(f"音频初始化失败: {e}")
-            self.audio_enabled = False
+        if self.audio_enabled:
+            try:
+                pygame.mixer.init()
+            except Exception as e:
+                print(f"音频初始化失败: {e}")
+                self.audio_enabled = False
 
         # 问候模式状态
         self.warm_greetings_enabled = False
         self._greeting_timer: Optional[str] = None
         self._greeting_win: Optional[tk.Toplevel] = None
+        self.last_greeting: Optional[str] = None
+        # 定时任务句柄：关闭时统一取消，避免长时间运行后残留回调
+        self._tick_job: Optional[str] = None
+        self._heart_jobs: Dict[object, str] = {}
+        self.menu: Optional[PixelContextMenu] = None
+        self._menu_dirty: Set[str] = set()
 
-        self.top = tk.Toplevel(self.root)
-        self.top.overrideredirect(True)
-        self.top.attributes("-topmost", True)
-        # 降级透明背景（Windows 上可用）
-        try:
-            self.top.wm_attributes("-transparentcolor", "#00FEFE")
-            bg = "#00FEFE"
-        except Exception:
-            self.top.attributes("-alpha", 0.98)
-            bg = "#000000"
-        self.top.configure(bg=bg)
-
-        self.animator = PetAnimator(pet_frames_path, scale=5)
-        
-        self.canvas = tk.Canvas(self.top, width=self.animator.w, height=self.animator.h, highlightthickness=0, bg=bg)
-        self.canvas.pack()
+        self.zoom = self.DEFAULT_ZOOM
+        self.animator = PetAnimator(pet_frames_path, scale=self.zoom)
 
         # 设置初始位置为屏幕右下角
+        init_x, init_y = 0, 0
         try:
-            screen_w = self.top.winfo_screenwidth()
-            screen_h = self.top.winfo_screenheight()
+            screen_w = self.root.winfo_screenwidth()
+            screen_h = self.root.winfo_screenheight()
             # 留出一定边距，避免紧贴任务栏
             margin_right = 50
             margin_bottom = 80
@@ -271,25 +375,38 @@ class FloatWindow:
             # 确保坐标不小于0
             init_x = max(0, init_x)
             init_y = max(0, init_y)
-            
-            self.top.geometry(f"+{init_x}+{init_y}")
         except Exception:
             pass
 
-        self._photo = None
+        self.renderer: PetRenderer = create_renderer(backend, self.root, self.animator.w, self.animator.h, init_x, init_y)
+        self.clock = clock if clock is not None else TkClock(self.renderer.tk_parent)
         self._drag_start_x = 0
         self._drag_start_y = 0
         self._win_start_x = 0
         self._win_start_y = 0
         self._is_dragging = False
         self._bind_events()
-        self._setup_win32_layer()
+        # 预先构建右键菜单，之后由数据变化通知增量更新
+        self._update_menu()
+        if self.dm:
+            self.dm.subscribe(self._on_data_changed)
 
         # 开始计时
         self.tracker.start(username, self._pet_name_from_path(pet_frames_path))
         # 驱动动画与刷新
         self._tick()
 
+    @property
+    def top(self) -> tk.Misc:
+        """菜单、气泡与定时器依附的 Tk 控件（Tk 后端即悬浮窗本身）"""
+        return self.renderer.tk_parent
+
+    def is_alive(self) -> bool:
+        return self.renderer.is_alive()
+
+    def lift(self) -> None:
+        self.renderer.lift()
+
     def _pet_name_from_path(self, frames_path: str) -> str:
         """根据帧路径推断宠物名称（优先通过配置映射，其次用文件名）"""
         try:
@@ -321,14 +438,13 @@ class FloatWindow:
 
     def _bind_events(self) -> None:
         """绑定鼠标事件与右键菜单"""
-        self.canvas.bind("<ButtonPress-1>", self._on_press)
-        self.canvas.bind("<B1-Motion>", self._on_drag)
-        self.canvas.bind("<ButtonRelease-1>", self._on_release)
-        # self.canvas.bind("<Button-1>", lambda e: self.animator.interact_random())
-        self.canvas.bind("<Button-3>", self._show_menu)
+        self.renderer.bind("press", self._on_press)
+        self.renderer.bind("drag", self._on_drag)
+        self.renderer.bind("release", self._on_release)
+        self.renderer.bind("menu", self._show_menu)
 
-    def _update_menu(self) -> None:
-        """动态更新菜单项，生成更换桌宠的子菜单"""
+    def _build_pet_submenu(self) -> list:
+        """构建更换桌宠子菜单（已解锁宠物，当前宠物打钩）"""
         # 获取已解锁宠物列表
         submenu_items = []
         if self.dm:
@@ -356,6 +472,7 @@ class FloatWindow:
                     is_current = (frames_path == self.frames_path)
                     
                     submenu_items.append({
+                        "key": name,
                         "label": name,
                         "command": lambda n=name, p=frames_path: self._switch_pet(n, p),
                         "checked": is_current
@@ -368,13 +485,38 @@ class FloatWindow:
              # 仅作为 fallback，实际应都有
              submenu_items.append({"label": "无可用宠物", "command": None})
 
-        self.menu = PixelContextMenu(self.top, [
-            {"label": "返回主页面", "command": self._back_home},
-            {"label": "更换桌宠", "submenu": submenu_items},
-            {"label": "投喂", "submenu": self._build_feed_submenu()},
-            {"separator": True},
-            {"label": "关闭悬浮窗", "command": self.close},
-        ])
+        return submenu_items
+
+    def _on_data_changed(self, username: Optional[str], fields) -> None:
+        """DataManager 变化通知（可能来自其他线程）：只标记需要刷新的菜单分区"""
+        if username is not None and username != self.username:
+            return
+        for field in fields:
+            section = self.MENU_SECTIONS.get(field)
+            if section:
+                self._menu_dirty.add(section)
+
+    def _update_menu(self) -> None:
+        """将有变化的菜单分区同步到预先构建的菜单（只更新变化的行）；首次调用时构建菜单"""
+        dirty = set()
+        while self._menu_dirty:
+            dirty.add(self._menu_dirty.pop())
+        if self.menu is None:
+            if self.top is None:
+                # 无界面后端不构建菜单窗口
+                return
+            self.menu = PixelContextMenu(self.top, [
+                {"label": "返回主页面", "command": self._back_home},
+                {"key": "pets", "label": "更换桌宠", "submenu": self._build_pet_submenu()},
+                {"key": "feed", "label": "投喂", "submenu": self._build_feed_submenu()},
+                {"separator": True},
+                {"label": "关闭悬浮窗", "command": self.close},
+            ])
+            return
+        if "pets" in dirty:
+            self.menu.set_submenu("pets", self._build_pet_submenu())
+        if "feed" in dirty:
+            self.menu.set_submenu("feed", self._build_feed_submenu())
 
     def _switch_pet(self, name: str, frames_path: str) -> None:
         """原地切换桌宠"""
@@ -389,12 +531,13 @@ class FloatWindow:
         self.frames_path = frames_path
         
         # 3. 重置动画器
-        self.animator = PetAnimator(frames_path, scale=5)
+        self.animator = PetAnimator(frames_path, scale=self.zoom)
+        self._menu_dirty.add("pets")  # 更新勾选状态
         
         # 4. 调整画布与窗口尺寸
         # 注意：如果尺寸变化很大，可能需要重新计算位置居中？
-        # 这里简单起见，保持左上角位置不变，或者调整 geometry
-        self.canvas.configure(width=self.animator.w, height=self.animator.h)
+        # 这里简单起见，保持左上角位置不变
+        self.renderer.resize(self.animator.w, self.animator.h)
         
         # 5. 重启计时（切换归属）
         self.tracker.start(self.username, self._pet_name_from_path(frames_path))
@@ -406,6 +549,14 @@ class FloatWindow:
         if self.on_switched_pet:
             self.on_switched_pet(name)
 
+    def reload_frames(self) -> bool:
+        """资源文件被修改后热加载当前桌宠帧（下一次刷新时显示，不重建窗口）"""
+        try:
+            return self.animator.reload()
+        except Exception as e:
+            print(f"热加载桌宠资源失败: {e}")
+            return False
+
     def _build_feed_submenu(self) -> list:
         """构建投喂子菜单"""
         items = []
@@ -416,6 +567,7 @@ class FloatWindow:
                 for n, q in inv.items():
                     if int(q) > 0:
                         items.append({
+                            "key": n,
                             "label": f"{n} x{int(q)}",
                             "command": (lambda name=n: self._feed_item(name))
                         })
@@ -450,82 +602,45 @@ class FloatWindow:
         for _ in range(max(1, int(count))):
             x = random.randint(w // 4, (w * 3) // 4)
             y = random.randint(h // 3, (h * 2) // 3)
-            ids = self._create_pixel_heart(x, y, scale=2)
-            self._animate_hearts(ids, steps=24)
-
-    def _create_pixel_heart(self, x: int, y: int, scale: int = 2) -> list:
-        """在给定位置创建像素爱心并返回 Canvas 元素 ID 列表"""
-        pixels = [
-            (1,0),(2,0),(3,0),(4,0),(5,0),
-            (0,1),(1,1),(2,1),(3,1),(4,1),(5,1),(6,1),
-            (0,2),(1,2),(2,2),(3,2),(4,2),(5,2),(6,2),
-            (1,3),(2,3),(3,3),(4,3),(5,3),
-            (2,4),(3,4),(4,4),
-            (3,5)
-        ]
-        ids = []
-        for px, py in pixels:
-            rx0 = x + px * scale
-            ry0 = y + py * scale
-            rx1 = rx0 + scale
-            ry1 = ry0 + scale
-            ids.append(self.canvas.create_rectangle(rx0, ry0, rx1, ry1, fill="#FF4D6D", outline=""))
-        return ids
-
-    def _animate_hearts(self, ids: list, steps: int = 20) -> None:
-        """以向上漂浮的方式动画显示像素爱心"""
-        if not ids:
+            heart = self.renderer.add_heart(x, y, scale=2)
+            self._animate_hearts(heart, steps=24)
+
+    def _animate_hearts(self, heart: object, steps: int = 20) -> None:
+        """以向上漂浮的方式动画显示像素爱心（heart 为渲染后端返回的句柄）"""
+        if heart is None:
             return
         def step(i: int) -> None:
             if i >= steps:
-                for cid in ids:
-                    try:
-                        self.canvas.delete(cid)
-                    except Exception:
-                        pass
-                return
-            dy = -2
-            dx = random.choice([-1,0,1])
-            for cid in ids:
+                self._heart_jobs.pop(heart, None)
                 try:
-                    self.canvas.move(cid, dx, dy)
+                    self.renderer.remove_heart(heart)
                 except Exception:
                     pass
-            self.top.after(50, lambda: step(i+1))
+                return
+            dy = -2
+            dx = random.choice([-1,0,1])
+            try:
+                self.renderer.move_heart(heart, dx, dy)
+            except Exception:
+                pass
+            self._heart_jobs[heart] = self.clock.after(50, lambda: step(i+1))
         step(0)
 
     def _tick_manual(self) -> None:
         """手动刷新一帧（非递归，用于切换时立即更新）"""
         self.animator.next_frame()
-        self._photo = self.animator.get_tk_image()
-        self.canvas.configure(width=self.animator.w, height=self.animator.h)
-        self.canvas.create_image(0, 0, image=self._photo, anchor="nw")
+        self._present()
 
-    def _setup_win32_layer(self) -> None:
-        """通过 pywin32 设置层叠与置顶（若可用）"""
-        if win32gui is None or win32con is None:
-            return
-        try:
-            hwnd = self.top.winfo_id()
-            ex_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
-            ex_style |= win32con.WS_EX_LAYERED | win32con.WS_EX_TOPMOST
-            win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, ex_style)
-            # 使用近全透明的关键色（与 bg 一致），实现不规则窗口
-            # 颜色格式：RGB，Alpha 忽略；此处选择青色 0x00FEFE
-            # SetLayeredWindowAttributes 需要 COLORREF (0x00BBGGRR)
-            # 对应 #00FEFE (R=0, G=254, B=254) -> 0xFEFE00
-            win32gui.SetLayeredWindowAttributes(hwnd, 0xFEFE00, 255, win32con.LWA_COLORKEY)
-        except Exception:
-            # 失败则保持 Tkinter 属性，不影响功能
-            pass
+    def _present(self, outline_color: Optional[tuple] = None) -> None:
+        """交由渲染后端显示当前帧"""
+        self.renderer.present(self.animator, outline_color)
 
     def _on_press(self, event: tk.Event) -> None:
         """记录拖拽起点：保存初始屏幕坐标与窗口位置"""
         self._is_dragging = False
         self._drag_start_x = event.x_root
         self._drag_start_y = event.y_root
-        self._win_start_x = self.top.winfo_x()
-        self._win_start_y = self.top.winfo_y()
+        self._win_start_x, self._win_start_y = self.renderer.position()
 
     def _on_drag(self, event: tk.Event) -> None:
         """跟随鼠标移动窗口位置
@@ -546,15 +661,14 @@ class FloatWindow:
             # 应用位移到初始窗口位置
             new_x = self._win_start_x + dx
             new_y = self._win_start_y + dy
-            self.top.geometry(f"+{new_x}+{new_y}")
+            self.renderer.move(new_x, new_y)
 
             # 同步移动问候气泡
             if self._greeting_win:
                 try:
                     bw = self._greeting_win.winfo_width()
                     bh = self._greeting_win.winfo_height()
-                    ww = self.top.winfo_width()
-                    wh = self.top.winfo_height()
+                    ww, wh = self.renderer.size()
                     
                     bx = new_x + (ww - bw) // 2
                     by = new_y - bh - 10
@@ -573,9 +687,10 @@ class FloatWindow:
         self._is_dragging = False
 
     def _show_menu(self, event: tk.Event) -> None:
-        """显示右键菜单"""
-        self._update_menu()  # 每次显示前重新构建菜单，确保选中状态正确
-        self.menu.show(event.x_root, event.y_root)
+        """显示右键菜单（菜单已预先构建，通常只需定位显示）"""
+        self._update_menu()
+        if self.menu is not None:
+            self.menu.show(event.x_root, event.y_root)
 
     def _back_home(self) -> None:
         """返回主页面：仅调用回调，不关闭悬浮窗"""
@@ -593,12 +708,13 @@ class FloatWindow:
         self.animator.next_frame()
         
         # 获取疲劳状态并决定轮廓颜色
-        status = self.fatigue_detector.get_status()
+        src = self.fatigue_detector
+        status = src.get_status()
         outline_color = None
         
         # 音频控制逻辑
         if self.audio_enabled:
-            if status == FatigueDetector.STATUS_FATIGUE:
+            if status == src.STATUS_FATIGUE:
                 if self.current_audio_state != "fatigue" and not self.is_playing_alert:
                     if self.is_playing_no_face_alert:
                         try:
@@ -616,7 +732,7 @@ class FloatWindow:
                     except Exception as e:
                         print(f"播放音频失败: {e}")
                         self.audio_enabled = False
-            elif status == FatigueDetector.STATUS_NO_FACE:
+            elif status == src.STATUS_NO_FACE:
                 if self.current_audio_state != "no_face" and not self.is_playing_no_face_alert:
                     if self.is_playing_alert:
                         try:
@@ -645,26 +761,42 @@ class FloatWindow:
                     self.is_playing_no_face_alert = False
                     self.current_audio_state = None
 
-        if status == FatigueDetector.STATUS_FATIGUE:
+        if status == src.STATUS_FATIGUE:
             # 红色闪烁：每 0.5 秒切换一次
-            if int(time.time() * 2) % 2 == 0:
+            if int(self.clock.time() * 2) % 2 == 0:
                 outline_color = (255, 0, 0)
             # else: None (不显示轮廓，实现闪烁)
-        elif status == FatigueDetector.STATUS_NORMAL:
+        elif status == src.STATUS_NORMAL:
             # 绿色常亮
             outline_color = (0, 255, 0)
-        elif status == FatigueDetector.STATUS_NO_FACE:
-            if int(time.time() * 2) % 2 == 0:
+        elif status == src.STATUS_NO_FACE:
+            if int(self.clock.time() * 2) % 2 == 0:
                 outline_color = (255, 255, 0)
 
-        self._photo = self.animator.get_tk_image(outline_color=outline_color)
-        self.canvas.configure(width=self.animator.w, height=self.animator.h)
-        self.canvas.create_image(0, 0, image=self._photo, anchor="nw")
-        self.top.after(120, self._tick)
+        self._tick_job = None
+        if not self.renderer.is_alive():
+            return
+        if self._menu_dirty:
+            self._update_menu()
+        self._present(outline_color)
+        self._tick_job = self.clock.after(120, self._tick)
 
     def close(self) -> None:
         """关闭悬浮窗并停止计时"""
         self._cancel_greeting()
+        for job in [self._tick_job, *self._heart_jobs.values()]:
+            if job:
+                try:
+                    self.clock.after_cancel(job)
+                except Exception:
+                    pass
+        self._tick_job = None
+        self._heart_jobs.clear()
+        if self.dm:
+            self.dm.unsubscribe(self._on_data_changed)
+        if self.menu is not None:
+            self.menu.destroy()
+            self.menu = None
         self.tracker.stop()
         if hasattr(self, 'fatigue_detector'):
             self.fatigue_detector.stop()
@@ -677,13 +809,30 @@ class FloatWindow:
         except Exception:
             pass
 
+        self.renderer.close()
+
+    def resolve_zoom(self, value) -> float:
+        """解析缩放设置："auto" 按屏幕 DPI 换算默认缩放（HiDPI 下为小数倍），其余按数值解析"""
+        if value == "auto":
+            try:
+                dpi = float(self.top.winfo_fpixels("1i"))
+            except Exception:
+                dpi = 96.0
+            return round(self.DEFAULT_ZOOM * dpi / 96.0 * 4) / 4
         try:
-            self.top.destroy()
-        except Exception:
-            pass
+            return float(value)
+        except (TypeError, ValueError):
+            return self.DEFAULT_ZOOM
+
+    def set_zoom(self, zoom: float) -> None:
+        """运行时缩放：下一帧即按新尺寸绘制，已缓存的缩放无需重新生成"""
+        if self.animator.set_scale(zoom):
+            self.zoom = self.animator.scale
+            self.renderer.resize(self.animator.w, self.animator.h)
 
     def update_settings(self, settings: dict) -> None:
         """更新配置"""
+        self.set_zoom(self.resolve_zoom(settings.get("pet_zoom", self.DEFAULT_ZOOM)))
         self.warm_greetings_enabled = settings.get("warm_greetings", False)
         if self.warm_greetings_enabled:
             # 如果没有正在运行的计时器，则启动
@@ -696,7 +845,7 @@ class FloatWindow:
         """安排下一次问候"""
         if self._greeting_timer:
             try:
-                self.top.after_cancel(self._greeting_timer)
+                self.clock.after_cancel(self._greeting_timer)
             except Exception:
                 pass
             self._greeting_timer = None
@@ -706,13 +855,13 @@ class FloatWindow:
             
         # 随机间隔 30~60秒 (演示用，实际可调长)
         delay = random.randint(30000, 60000)
-        self._greeting_timer = self.top.after(delay, self._show_greeting)
+        self._greeting_timer = self.clock.after(delay, self._show_greeting)
 
     def _cancel_greeting(self) -> None:
         """取消问候计划与当前窗口"""
         if self._greeting_timer:
             try:
-                self.top.after_cancel(self._greeting_timer)
+                self.clock.after_cancel(self._greeting_timer)
             except Exception:
                 pass
             self._greeting_timer = None
@@ -745,6 +894,13 @@ class FloatWindow:
             "工作/学习辛苦啦，加油！"
         ]
         msg = random.choice(msgs)
+        self._greeting_timer = None
+
+        # 无界面后端：只记录问候内容并安排下一次
+        if self.top is None:
+            self.last_greeting = msg
+            self._schedule_next_greeting()
+            return
 
         # 创建气泡窗口
         try:
@@ -777,9 +933,8 @@ class FloatWindow:
             bw = win.winfo_reqwidth()
             bh = win.winfo_reqheight()
             
-            wx = self.top.winfo_x()
-            wy = self.top.winfo_y()
-            ww = self.top.winfo_width()
+            wx, wy = self.renderer.position()
+            ww, wh = self.renderer.size()
             
             bx = wx + (ww - bw) // 2
             by = wy - bh - 10
@@ -788,7 +943,7 @@ class FloatWindow:
             screen_w = self.top.winfo_screenwidth()
             screen_h = self.top.winfo_screenheight()
             if bx < 0: bx = 0
-            if by < 0: by = wy + self.top.winfo_height() + 10 # 如果上方不够，放下方
+            if by < 0: by = wy + wh + 10 # 如果上方不够，放下方
             
             win.geometry(f"{bw}x{bh}+{bx}+{by}")
             self._greeting_win = win
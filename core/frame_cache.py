@@ -0,0 +1,98 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+from PIL import Image
+
+
+class FrameCache:
+    """按缩放倍数缓存帧图像（PIL RGBA），供悬浮窗动画与预览共用
+    使用：
+        img = shared_frame_cache.get(frame_key, 4.5, lambda: base_image)
+    说明：
+        - 键为 (帧内容键, 缩放)；帧内容键由调用方保证与像素内容一一对应（如内容哈希）
+        - 首次请求某缩放时才生成（惰性）；整数倍最近邻放大，保持像素清晰
+        - 小数倍（HiDPI）由向上取整的整数倍图像再按区域平均缩小，整数倍图像在各视图间共享
+        - 按 LRU 淘汰，总占用不超过内存预算（按 RGBA 4 字节/像素估算）
+    """
+
+    DEFAULT_BUDGET = 32 * 1024 * 1024
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET) -> None:
+        self._budget = max(0, int(budget_bytes))
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Tuple[Hashable, float], Image.Image]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def scaled_size(w: int, h: int, scale: float) -> Tuple[int, int]:
+        """缩放后的尺寸（四舍五入，至少 1 像素）"""
+        return max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+
+    def set_budget(self, budget_bytes: int) -> None:
+        """调整内存预算，超出部分立即淘汰"""
+        with self._lock:
+            self._budget = max(0, int(budget_bytes))
+            self._evict()
+
+    def get(self, key: Hashable, scale: float, base: Callable[[], Image.Image]) -> Image.Image:
+        """返回指定缩放的帧图像；base 仅在 1 倍图像未缓存时调用。返回的图像为共享对象，请勿修改"""
+        scale = float(scale)
+        ck = (key, scale)
+        with self._lock:
+            img = self._entries.get(ck)
+            if img is not None:
+                self._entries.move_to_end(ck)
+                self.hits += 1
+                return img
+            self.misses += 1
+        if scale == 1.0:
+            img = base().convert("RGBA")
+        else:
+            src = self.get(key, 1.0, base)
+            size = self.scaled_size(src.width, src.height, scale)
+            if scale.is_integer() or scale < 1.0:
+                img = src.resize(size, Image.NEAREST)
+            else:
+                upper = self.get(key, float(math.ceil(scale)), base)
+                img = upper.resize(size, Image.BOX)
+        self._put(ck, img)
+        return img
+
+    def _put(self, ck: Tuple[Hashable, float], img: Image.Image) -> None:
+        cost = img.width * img.height * 4
+        with self._lock:
+            old = self._entries.pop(ck, None)
+            if old is not None:
+                self._bytes -= old.width * old.height * 4
+            self._entries[ck] = img
+            self._bytes += cost
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self._budget and self._entries:
+            _, img = self._entries.popitem(last=False)
+            self._bytes -= img.width * img.height * 4
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """缓存统计：条目数、占用字节、预算、命中与未命中次数"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "budget": self._budget,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# 进程内共享实例：悬浮窗与各预览视图使用同一份缓存
+shared_frame_cache = FrameCache()
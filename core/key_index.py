@@ -0,0 +1,77 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional
+
+from .license_manager import LicenseManager
+
+
+def normalize_key(key_input: str) -> str:
+    """与 LicenseManager.verify_key 相同的归一化：去空白、转大写、去横杠"""
+    return (key_input or "").strip().upper().replace("-", "")
+
+
+class KeyIndex:
+    """卡密反查索引：按用户预先计算所有卡密宠物的期望密钥，兑换时只凭用户名与密钥找到宠物
+    属性：
+        dm: DataManager 实例（提供目录索引与变化通知）
+        max_users: 缓存的用户索引数量上限（LRU）
+    方法：
+        find_pet(username, key): 返回密钥对应的宠物名，无匹配返回 None（O(1) 查询）
+        invalidate(): 清空缓存（目录重载时自动调用）
+    说明：
+        每个用户的索引为 {归一化密钥: 宠物名}，首次查询时用 LicenseManager.generate_keys 批量构建，
+        之后与卡密宠物数量无关；目录变化（dm 通知 "catalog"）时整体失效。
+    """
+
+    MAX_USERS = 64
+
+    def __init__(self, dm, max_users: int = MAX_USERS) -> None:
+        self.dm = dm
+        self.max_users = max(1, int(max_users))
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._generation = 0
+        self.builds = 0
+        dm.subscribe(self._on_data_changed)
+
+    def _on_data_changed(self, username: Optional[str], fields: FrozenSet[str]) -> None:
+        if username is None and "catalog" in fields:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._generation += 1
+
+    def _index_for(self, username: str) -> Dict[str, str]:
+        with self._lock:
+            index = self._cache.get(username)
+            if index is not None:
+                self._cache.move_to_end(username)
+                return index
+            generation = self._generation
+        # 构建在锁外进行；期间目录若发生变化，结果只用于本次查询而不缓存
+        pets = self.dm.search_catalog("pet", unlock_type="key")
+        keys = LicenseManager.generate_keys((username, pet) for pet in pets)
+        index = {}
+        for pet, key in zip(pets, keys):
+            index.setdefault(key.replace("-", ""), pet)
+        with self._lock:
+            self.builds += 1
+            if generation == self._generation:
+                self._cache[username] = index
+                while len(self._cache) > self.max_users:
+                    self._cache.popitem(last=False)
+        return index
+
+    def find_pet(self, username: str, key: str) -> Optional[str]:
+        """由用户名与密钥找到可激活的卡密宠物；密钥无效或与用户不匹配时返回 None"""
+        username = (username or "").strip()
+        normalized = normalize_key(key)
+        if not username or len(normalized) != 12:
+            return None
+        pet = self._index_for(username).get(normalized)
+        # 命中后再做一次常量时间校验，与逐宠物验证的结果保持一致
+        if pet is not None and LicenseManager.verify_key(username, pet, key):
+            return pet
+        return None
@@ -0,0 +1,312 @@
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class _UserLedger:
+    """单个用户的账本状态：文件路径、最近余额、检查点索引与待写入内容"""
+
+    __slots__ = ("path", "idx_path", "balance", "since_checkpoint", "pending", "accrual", "checkpoints", "torn")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.idx_path = path[:-len(".jsonl")] + ".idx"
+        self.balance: Optional[int] = None
+        self.since_checkpoint = 0
+        self.pending: List[str] = []
+        # 合并中的运行时间累计：[开始时间, 最近时间, 秒数, 累计后余额]
+        self.accrual: Optional[List[int]] = None
+        # 检查点索引：(时间, 文件偏移, 余额)，按时间递增
+        self.checkpoints: List[Tuple[int, int, int]] = []
+        # 上次写入中断且未能截断，文件末尾留有半行：下次写入先补换行
+        self.torn = False
+
+
+class Ledger:
+    """货币账本：只追加记录每一笔 total_run_time 变化，定期写入余额检查点
+    文件布局（data/ledger/）：
+        <用户名摘要>.jsonl  每行一条记录 {"t": 时间, "k": 类型, "d": 变化量, "b": 变化后余额, "m": 备注}
+        <用户名摘要>.idx    检查点索引，每行 "时间 偏移 余额"
+    记录类型：
+        accrual（运行时间累计，按批合并）、purchase（商城购买）、transfer_out / transfer_in（提现 / 充值）、
+        unlock（卡密解锁，变化量为 0）、adjust（导入等整体覆盖造成的差额）、checkpoint（余额检查点）
+    方法：
+        record(username, kind, delta, balance, memo): 追加一条记录（balance 为变化后余额）
+        accrue(username, seconds, balance): 累计运行时间，同一用户连续累计合并为一条记录
+        balance(username): 当前余额（O(1)）
+        balance_at(username, ts): 历史时刻的余额，只需扫描最近检查点之后的记录
+        history(username, since, until): 按时间遍历记录（审计用）
+        flush(force): 写出缓冲的记录；force=False 时未满一批的累计暂不写出
+    """
+
+    CHECKPOINT_EVERY = 256
+    ACCRUAL_BATCH_S = 60
+
+    def __init__(self, ledger_dir: str) -> None:
+        self.ledger_dir = ledger_dir
+        self._lock = threading.RLock()
+        self._users: Dict[str, _UserLedger] = {}
+
+    def _state(self, username: str) -> _UserLedger:
+        """获取用户账本状态；首次访问时读取检查点索引与其后的记录恢复最近余额
+        索引只是可重建的辅助文件：缺失或少于账本中的检查点（写索引失败）时由扫描补齐并重写
+        """
+        st = self._users.get(username)
+        if st is not None:
+            return st
+        name = hashlib.sha1(username.encode("utf-8")).hexdigest()[:16]
+        st = _UserLedger(os.path.join(self.ledger_dir, f"{name}.jsonl"))
+        try:
+            with open(st.idx_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 3:
+                        st.checkpoints.append((int(parts[0]), int(parts[1]), int(parts[2])))
+        except OSError:
+            pass
+        if os.path.exists(st.path):
+            offset = st.checkpoints[-1][1] if st.checkpoints else 0
+            if st.checkpoints:
+                st.balance = st.checkpoints[-1][2]
+            missing: List[Tuple[int, int, int]] = []
+            for pos, entry in self._scan_from(st.path, offset):
+                st.balance = int(entry.get("b", st.balance or 0))
+                if entry.get("k") != "checkpoint":
+                    st.since_checkpoint += 1
+                    continue
+                st.since_checkpoint = 0
+                if not st.checkpoints or pos > st.checkpoints[-1][1]:
+                    missing.append((int(entry.get("t", 0)), pos, st.balance))
+            if missing:
+                st.checkpoints.extend(missing)
+                self._rewrite_index(st)
+        else:
+            st.checkpoints = []
+        self._users[username] = st
+        return st
+
+    @classmethod
+    def _read_from(cls, path: str, offset: int) -> Iterator[Dict[str, Any]]:
+        """从文件偏移处开始逐行读取记录，跳过损坏行（如写入中断留下的半行）"""
+        for _, entry in cls._scan_from(path, offset):
+            yield entry
+
+    @staticmethod
+    def _scan_from(path: str, offset: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """同 _read_from，并给出每条记录的文件偏移"""
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                pos = offset
+                for raw in f:
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        entry = None
+                    if isinstance(entry, dict):
+                        yield pos, entry
+                    pos += len(raw)
+        except OSError:
+            return
+
+    @staticmethod
+    def _rewrite_index(st: _UserLedger) -> None:
+        """按内存中的检查点整体重写索引（先写临时文件再替换）；失败时下次加载再重建"""
+        try:
+            tmp = st.idx_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("".join(f"{t} {o} {b}\n" for t, o, b in st.checkpoints))
+            os.replace(tmp, st.idx_path)
+        except OSError:
+            pass
+
+    def _append(self, username: str, st: _UserLedger, entry: Dict[str, Any]) -> None:
+        """加入待写缓冲；每 CHECKPOINT_EVERY 条记录追加一个检查点（调用方需持锁）"""
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        st.pending.append(line)
+        st.balance = int(entry["b"])
+        if entry["k"] == "checkpoint":
+            st.since_checkpoint = 0
+            return
+        st.since_checkpoint += 1
+        if st.since_checkpoint >= self.CHECKPOINT_EVERY:
+            self._append(username, st, {"t": entry["t"], "k": "checkpoint", "d": 0, "b": st.balance})
+
+    def _open(self, username: str, st: _UserLedger, balance: int, ts: int) -> None:
+        """用户首次记账：以当前余额写入开账检查点"""
+        if st.balance is None:
+            self._append(username, st, {"t": ts, "k": "checkpoint", "d": 0, "b": int(balance), "m": f"open:{username}"})
+
+    def _close_accrual(self, username: str, st: _UserLedger) -> None:
+        """把合并中的运行时间累计写成一条记录"""
+        acc = st.accrual
+        if acc is None:
+            return
+        st.accrual = None
+        self._append(username, st, {"t": acc[1], "k": "accrual", "d": acc[2], "b": acc[3], "s": acc[0]})
+
+    def record(self, username: str, kind: str, delta: int, balance: int, memo: str = "", ts: Optional[int] = None) -> None:
+        """追加一条记录；balance 为变化后余额（由调用方给出，与 users.json 保持一致）"""
+        ts = int(time.time() if ts is None else ts)
+        with self._lock:
+            st = self._state(username)
+            self._open(username, st, int(balance) - int(delta), ts)
+            # 先写出合并中的累计，保证记录按时间顺序
+            self._close_accrual(username, st)
+            entry: Dict[str, Any] = {"t": ts, "k": kind, "d": int(delta), "b": int(balance)}
+            if memo:
+                entry["m"] = memo
+            self._append(username, st, entry)
+
+    def accrue(self, username: str, seconds: int, balance: int, ts: Optional[int] = None) -> None:
+        """累计运行时间：连续的累计在内存中合并，满 ACCRUAL_BATCH_S 秒或有其他记录时才写成一条"""
+        ts = int(time.time() if ts is None else ts)
+        with self._lock:
+            st = self._state(username)
+            self._open(username, st, int(balance) - int(seconds), ts)
+            acc = st.accrual
+            if acc is None:
+                st.accrual = [ts, ts, int(seconds), int(balance)]
+            else:
+                acc[1] = ts
+                acc[2] += int(seconds)
+                acc[3] = int(balance)
+            if st.accrual[1] - st.accrual[0] >= self.ACCRUAL_BATCH_S:
+                self._close_accrual(username, st)
+
+    def balance(self, username: str) -> Optional[int]:
+        """当前余额（含合并中的累计）；从未记账返回 None"""
+        with self._lock:
+            st = self._state(username)
+            if st.accrual is not None:
+                return st.accrual[3]
+            return st.balance
+
+    def flush(self, force: bool = False) -> None:
+        """写出缓冲记录；force=True 时同时写出未满一批的累计（退出或查询历史前调用）"""
+        with self._lock:
+            now = int(time.time())
+            for username, st in self._users.items():
+                if st.accrual is not None and (force or now - st.accrual[0] >= self.ACCRUAL_BATCH_S):
+                    self._close_accrual(username, st)
+                if st.pending:
+                    self._write(st)
+
+    def _write(self, st: _UserLedger) -> None:
+        """追加写入记录与检查点索引
+        账本文件写入成功即清空缓冲；写入失败时把文件截回写入前的长度再保留缓冲重试，
+        截断也失败时只保留尚未完整写入的记录，已落到账本中的行绝不重复追加。
+        索引写入失败不影响记录，下次加载时由账本重建。
+        """
+        try:
+            os.makedirs(self.ledger_dir, exist_ok=True)
+        except OSError:
+            return
+        raws = [line.encode("utf-8") for line in st.pending]
+        if st.torn:
+            raws[0] = b"\n" + raws[0]
+        start = None
+        try:
+            with open(st.path, "ab") as f:
+                start = f.seek(0, os.SEEK_END)
+                f.write(b"".join(raws))
+        except OSError:
+            self._recover_partial(st, raws, start)
+            return
+        st.torn = False
+        st.pending = []
+        new_checkpoints = self._checkpoints_in(raws, start)
+        if new_checkpoints:
+            st.checkpoints.extend(new_checkpoints)
+            try:
+                with open(st.idx_path, "a", encoding="utf-8") as f:
+                    f.write("".join(f"{t} {o} {b}\n" for t, o, b in new_checkpoints))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _checkpoints_in(raws: List[bytes], start: int) -> List[Tuple[int, int, int]]:
+        """从一批已写入的记录中找出检查点及其文件偏移"""
+        found: List[Tuple[int, int, int]] = []
+        pos = start
+        for raw in raws:
+            if b'"k":"checkpoint"' in raw:
+                # 偏移指向记录本身（跳过补写的换行）
+                stripped = raw.lstrip(b"\n")
+                entry = json.loads(stripped)
+                found.append((int(entry["t"]), pos + len(raw) - len(stripped), int(entry["b"])))
+            pos += len(raw)
+        return found
+
+    def _recover_partial(self, st: _UserLedger, raws: List[bytes], start: Optional[int]) -> None:
+        """写入中断：优先截回写入前的长度；无法截断时丢弃已完整写入的记录，保留其余重试"""
+        if start is None:
+            # 未能打开文件，没有任何内容写入
+            return
+        try:
+            os.truncate(st.path, start)
+            return
+        except OSError:
+            pass
+        try:
+            written = os.path.getsize(st.path) - start
+        except OSError:
+            return
+        done = 0
+        pos = 0
+        for raw in raws:
+            if pos + len(raw) > written:
+                break
+            pos += len(raw)
+            done += 1
+        st.checkpoints.extend(self._checkpoints_in(raws[:done], start))
+        st.pending = st.pending[done:]
+        # 还有半行留在文件末尾：下次写入先补换行，半行在读取时作为损坏行跳过
+        st.torn = written > pos or (st.torn and done == 0)
+
+    def balance_at(self, username: str, ts: float) -> Optional[int]:
+        """ts 时刻的余额：二分找到之前最近的检查点，再扫描其后的记录；早于开账时间返回 None
+        合并的累计记录带有起止时间（s / t），批次内部的时刻按均匀累计插值
+        """
+        with self._lock:
+            self.flush(force=True)
+            st = self._state(username)
+            if not st.checkpoints or ts < st.checkpoints[0][0]:
+                return None
+            i = bisect.bisect_right(st.checkpoints, (int(ts), float("inf"), 0)) - 1
+            _, offset, balance = st.checkpoints[i]
+            path = st.path
+        for entry in self._read_from(path, offset):
+            t = entry.get("t", 0)
+            start = entry.get("s", t)
+            if start > ts:
+                break
+            if t > ts:
+                # 落在一批累计之内：按均匀累计插值（每秒一次的累计时结果精确）
+                delta = int(entry.get("d", 0))
+                return int(entry["b"]) - delta + delta * int(ts - start + 1) // (t - start + 1)
+            balance = int(entry.get("b", balance))
+        return balance
+
+    def history(self, username: str, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """按时间遍历记录（不含检查点）；提供 since 时从其前最近的检查点开始读取"""
+        with self._lock:
+            self.flush(force=True)
+            st = self._state(username)
+            offset = 0
+            if since is not None and st.checkpoints:
+                i = bisect.bisect_right(st.checkpoints, (int(since), float("inf"), 0)) - 1
+                if i >= 0:
+                    offset = st.checkpoints[i][1]
+            path = st.path
+        for entry in self._read_from(path, offset):
+            t = entry.get("t", 0)
+            if until is not None and t > until:
+                break
+            if entry.get("k") == "checkpoint" or (since is not None and t < since):
+                continue
+            yield entry
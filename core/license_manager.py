@@ -1,5 +1,6 @@
 import hashlib
 import hmac
+from typing import Iterable, List, Optional, Tuple
 
 class LicenseManager:
     """许可证管理器：处理卡密生成与验证"""
@@ -27,6 +28,20 @@ class LicenseManager:
         # 格式化为 4-4-4
         return f"{raw_key[:4]}-{raw_key[4:8]}-{raw_key[8:]}"
 
+    @staticmethod
+    def generate_keys(pairs: Iterable[Tuple[str, str]]) -> List[str]:
+        """批量生成解锁密钥，结果与逐个调用 generate_key 一致
+        预先计算加盐后的 HMAC 状态并逐个复制，省去每个密钥重复处理盐值
+        """
+        base = hmac.new(LicenseManager._SALT, digestmod=hashlib.sha256)
+        keys: List[str] = []
+        for username, pet_id in pairs:
+            h = base.copy()
+            h.update(f"{username.strip()}|{pet_id.strip()}".encode("utf-8"))
+            raw_key = h.hexdigest()[:12].upper()
+            keys.append(f"{raw_key[:4]}-{raw_key[4:8]}-{raw_key[8:]}")
+        return keys
+
     @staticmethod
     def verify_key(username: str, pet_id: str, key_input: str) -> bool:
         """验证用户输入的密钥是否正确"""
@@ -52,6 +67,18 @@ class LicenseManager:
         sig = hmac.new(LicenseManager._SALT, p_b64.encode("utf-8"), hashlib.sha256).hexdigest().upper()
         return f"TR-{p_b64}-{sig[:12]}"
 
+    @staticmethod
+    def transfer_key_ts(key_input: str) -> Optional[int]:
+        """读取转账卡密载荷中的生成时间戳（不校验签名）；格式不符时返回 None"""
+        import base64
+        try:
+            _, p_b64, _ = key_input.strip().split("-", 2)
+            payload = base64.urlsafe_b64decode((p_b64 + "=" * ((-len(p_b64)) % 4)).encode("ascii")).decode("utf-8")
+            parts = payload.split("|")
+            return int(parts[4]) if len(parts) == 5 and parts[0] == "v1" else None
+        except Exception:
+            return None
+
     @staticmethod
     def verify_transfer_key(expect_to_user: str, from_user: str, key_input: str):
         """验证转账卡密并解析载荷，返回 dict 或 None
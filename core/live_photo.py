@@ -0,0 +1,96 @@
+import base64
+import io
+import tkinter as tk
+from typing import Optional, Tuple
+
+from PIL import Image, ImageChops, ImageTk
+
+Box = Tuple[int, int, int, int]
+
+
+def diff_bbox(a: Image.Image, b: Image.Image) -> Optional[Box]:
+    """两张同尺寸 RGBA 图像的变化区域（各通道变化区域的并集）；无变化时为 None
+    注：RGBA 图像的 getbbox 只看 alpha 通道，颜色变化需要逐通道比较
+    """
+    boxes = [band.getbbox() for band in ImageChops.difference(a, b).split()]
+    boxes = [bx for bx in boxes if bx]
+    if not boxes:
+        return None
+    return (
+        min(bx[0] for bx in boxes),
+        min(bx[1] for bx in boxes),
+        max(bx[2] for bx in boxes),
+        max(bx[3] for bx in boxes),
+    )
+
+
+class LivePhoto:
+    """持久 PhotoImage：同一张 Tk 图片在帧间原地更新，只推送变化的矩形区域
+    使用：
+        live = LivePhoto(canvas)
+        photo = live.show(img, dirty=(x0, y0, x1, y1))   # dirty 为 None 时自动比较
+        pushed = live.last_push_bytes
+    说明：
+        - 首帧或尺寸变化时新建 PhotoImage（调用方需重新绑定到控件）
+        - 脏矩形面积超过 FULL_UPDATE_RATIO 时整图 paste（PIL 内存块拷贝）
+        - 否则将脏矩形编码为 PNG，经 Tk "put -to" 写入（保留 alpha，直接覆盖像素）
+        - dry_run=True 时不创建 Tk 对象，只统计推送量（无显示环境下的基准测试）
+    """
+
+    FULL_UPDATE_RATIO = 0.35
+
+    def __init__(self, master: Optional[tk.Misc], dry_run: bool = False) -> None:
+        self.master = master
+        self.dry_run = dry_run
+        self.photo: Optional[ImageTk.PhotoImage] = None
+        self._shown: Optional[Image.Image] = None
+        self.last_push_bytes = 0
+        self.last_mode = ""
+
+    @property
+    def size(self) -> Optional[Tuple[int, int]]:
+        return self._shown.size if self._shown is not None else None
+
+    @staticmethod
+    def encode_region(img: Image.Image, box: Box) -> str:
+        """将图像的矩形区域编码为 base64 PNG（Tk photo put 的数据格式）"""
+        buf = io.BytesIO()
+        img.crop(box).save(buf, format="PNG", compress_level=1)
+        return base64.b64encode(buf.getvalue()).decode("ascii")
+
+    def plan(self, img: Image.Image, dirty: Optional[Box] = None) -> Tuple[str, Optional[Box]]:
+        """决定更新方式："new"（新建）、"full"（整图）、"partial"（局部）或 "none"（无变化）"""
+        if self._shown is None or self._shown.size != img.size or (self.photo is None and not self.dry_run):
+            return "new", None
+        if dirty is None:
+            dirty = diff_bbox(self._shown, img)
+        if not dirty:
+            return "none", None
+        w, h = img.size
+        x0, y0, x1, y1 = max(0, dirty[0]), max(0, dirty[1]), min(w, dirty[2]), min(h, dirty[3])
+        if x1 <= x0 or y1 <= y0:
+            return "none", None
+        if (x1 - x0) * (y1 - y0) > self.FULL_UPDATE_RATIO * w * h:
+            return "full", None
+        return "partial", (x0, y0, x1, y1)
+
+    def show(self, img: Image.Image, dirty: Optional[Box] = None) -> Optional[ImageTk.PhotoImage]:
+        """显示新帧并返回当前 PhotoImage（仅 "new" 时对象会变化；dry_run 时为 None）"""
+        mode, box = self.plan(img, dirty)
+        w, h = img.size
+        pushed = 0
+        if mode in ("new", "full"):
+            if mode == "new" and not self.dry_run:
+                self.photo = ImageTk.PhotoImage(img, master=self.master)
+            elif not self.dry_run:
+                self.photo.paste(img)
+            pushed = w * h * 4
+        elif mode == "partial":
+            data = self.encode_region(img, box)
+            if not self.dry_run:
+                self.master.tk.call(str(self.photo), "put", data, "-format", "png", "-to", box[0], box[1])
+            pushed = len(data)
+        self._shown = img
+        self.last_mode = mode
+        self.last_push_bytes = pushed
+        return self.photo
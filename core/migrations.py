@@ -0,0 +1,212 @@
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class Migration(NamedTuple):
+    """一次性数据迁移：prepare(dm) 构建上下文（如映射表），apply(用户名, 用户对象, 上下文) 就地修改并返回是否有改动"""
+    version: int
+    name: str
+    prepare: Callable[[Any], Any]
+    apply: Callable[[str, Dict[str, Any], Any], bool]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def register(version: int, name: str, prepare: Optional[Callable[[Any], Any]] = None):
+    """注册迁移（版本号递增，每个版本号只能注册一次）"""
+    def deco(fn: Callable[[str, Dict[str, Any], Any], bool]):
+        if any(m.version == version for m in MIGRATIONS):
+            raise ValueError(f"迁移版本 {version} 重复注册")
+        MIGRATIONS.append(Migration(version, name, prepare or (lambda dm: None), fn))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return fn
+    return deco
+
+
+# ===== 迁移 1：pet_run_time 键名由资源路径规范化为宠物名 =====
+
+def _pet_name_maps(dm) -> Dict[str, Dict[str, str]]:
+    """构建资源路径到宠物名的映射（含无扩展名对照）"""
+    path_to_name: Dict[str, str] = {}
+    base_to_name: Dict[str, str] = {}
+    for name, cfg in dm.pets_cache.items():
+        p = os.path.normpath(str(cfg.get("frames", ""))).lower()
+        if p:
+            path_to_name[p] = name
+            base = os.path.basename(p)
+            base_no_ext = base.split(".")[0]
+            base_to_name[base_no_ext] = name
+    return {"path": path_to_name, "base": base_to_name}
+
+
+def _as_int(value: Any) -> Optional[int]:
+    """解析运行时间数值；无法解析时返回 None"""
+    try:
+        return int(value)
+    except Exception:
+        return None
+
+
+@register(1, "pet_run_time_names", prepare=_pet_name_maps)
+def _normalize_pet_run_time_keys(username: str, user: Dict[str, Any], maps: Dict[str, Dict[str, str]]) -> bool:
+    """规范化用户 pet_run_time 的键名，避免出现文件路径作为键
+    非字典的 pet_run_time 不做处理；无法解析的数值保持原键原值，不参与合并
+    """
+    path_to_name, base_to_name = maps["path"], maps["base"]
+    prt = user.get("pet_run_time", {})
+    if not isinstance(prt, dict):
+        return False
+    changed = False
+    # 先放入无法解析的原值，后续合并遇到同名键时保留原键而不覆盖
+    new_prt: Dict[str, Any] = {str(k): v for k, v in prt.items() if _as_int(v) is None}
+    for k, v in prt.items():
+        kk = str(k)
+        n = _as_int(v)
+        if n is None:
+            continue
+        norm_k = os.path.normpath(kk).lower()
+        target_name = None
+        if norm_k in path_to_name:
+            target_name = path_to_name[norm_k]
+        else:
+            # 尝试补扩展名或用 basename 映射
+            if not kk.endswith(".json") and (norm_k + ".json") in path_to_name:
+                target_name = path_to_name[norm_k + ".json"]
+            else:
+                base_no_ext = os.path.basename(norm_k).split(".")[0]
+                target_name = base_to_name.get(base_no_ext)
+
+        key = target_name or kk
+        prev = _as_int(new_prt.get(key, 0))
+        if prev is None:
+            # 目标键上已有无法解析的原值：保留原值，本键不合并
+            new_prt[kk] = v
+            continue
+        if target_name and target_name != kk:
+            changed = True
+        # 与已映射到同名的路径键合并，而不是覆盖
+        new_prt[key] = prev + n
+    if changed:
+        user["pet_run_time"] = new_prt
+    return changed
+
+
+# ===== 迁移 2：已用转账卡密列表转为 {摘要: 生成时间} 索引 =====
+
+@register(2, "used_transfer_keys_index")
+def _index_used_transfer_keys(username: str, user: Dict[str, Any], ctx: Any) -> bool:
+    used = user.get("used_transfer_keys")
+    if used is None or isinstance(used, dict):
+        return False
+    from .data_manager import DataManager
+    user["used_transfer_keys"] = DataManager.transfer_index_from_keys(used)
+    return True
+
+
+# ===== 迁移 3：已用转账卡密索引按生成时间排序（旧版本按兑换顺序保存；过期清理由内存中的最小堆完成，不依赖存储顺序，排序只使存储格式统一） =====
+
+@register(3, "used_transfer_keys_sorted")
+def _sort_used_transfer_keys(username: str, user: Dict[str, Any], ctx: Any) -> bool:
+    used = user.get("used_transfer_keys")
+    if not isinstance(used, dict) or not used:
+        return False
+    stamps = list(used.values())
+    if all(a <= b for a, b in zip(stamps, stamps[1:])):
+        return False
+    user["used_transfer_keys"] = dict(sorted(used.items(), key=lambda item: item[1]))
+    return True
+
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def load_schema(path: str) -> Dict[str, Any]:
+    """读取 schema.json：{"version": 已完成的版本, "pending": {"version", "cursor"}}；缺失时视为版本 0"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if isinstance(state, dict):
+            return state
+    except Exception:
+        pass
+    return {"version": 0}
+
+
+def save_schema(path: str, state: Dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def migrate_user(dm, username: str, user: Dict[str, Any], from_version: int = 0) -> bool:
+    """对单个用户对象执行 from_version 之后的全部迁移（如导入旧版本备份时）
+    某个迁移处理失败时跳过该迁移并继续，不影响导入
+    """
+    changed = False
+    for m in MIGRATIONS:
+        if m.version > from_version:
+            try:
+                changed = m.apply(username, user, m.prepare(dm)) or changed
+            except Exception as e:
+                print(f"迁移 {m.version}（{m.name}）处理用户 {username} 失败，已跳过: {e}")
+    return changed
+
+
+def run_pending(dm, schema_path: str, checkpoint_s: float = 2.0) -> Dict[str, Any]:
+    """执行尚未完成的迁移，每个迁移只执行一次
+    按用户名顺序分批处理，约每 checkpoint_s 秒落盘一次 users.json 并在 schema.json 记录进度游标，
+    中途退出后下次启动从游标处继续；数据已是最新版本时只读取 schema.json，不做任何遍历。
+    单个用户记录异常（格式损坏）时记录并跳过该用户，不阻止启动。
+    返回统计：{"from", "to", "users", "changed", "skipped", "seconds"}
+    """
+    t0 = time.perf_counter()
+    state = load_schema(schema_path)
+    start_version = int(state.get("version", 0))
+    stats = {"from": start_version, "to": start_version, "users": 0, "changed": 0, "skipped": 0, "seconds": 0.0}
+    if start_version >= SCHEMA_VERSION:
+        return stats
+    if not dm.users_cache:
+        # 空数据（新安装）：无需迁移，直接标记为最新版本
+        save_schema(schema_path, {"version": SCHEMA_VERSION})
+        stats["to"] = SCHEMA_VERSION
+        return stats
+    for m in MIGRATIONS:
+        if m.version <= int(state.get("version", 0)):
+            continue
+        pending = state.get("pending") or {}
+        cursor = pending.get("cursor") if pending.get("version") == m.version else None
+        ctx = m.prepare(dm)
+        usernames = sorted(dm.users_cache)
+        if cursor is not None:
+            usernames = [u for u in usernames if u > cursor]
+        last_save = time.perf_counter()
+        dirty = False
+        for i, username in enumerate(usernames):
+            user = dm.users_cache.get(username)
+            try:
+                if isinstance(user, dict) and m.apply(username, user, ctx):
+                    stats["changed"] += 1
+                    dirty = True
+            except Exception as e:
+                stats["skipped"] += 1
+                print(f"迁移 {m.version}（{m.name}）处理用户 {username} 失败，已跳过: {e}")
+            stats["users"] += 1
+            if time.perf_counter() - last_save >= checkpoint_s and i + 1 < len(usernames):
+                # 检查点：先写数据再记游标，中断后重做的部分迁移是幂等的
+                if dirty:
+                    dm._safe_write_json(dm.users_path, dm.users_cache)
+                    dirty = False
+                state["pending"] = {"version": m.version, "cursor": username}
+                save_schema(schema_path, state)
+                last_save = time.perf_counter()
+        if dirty:
+            dm._safe_write_json(dm.users_path, dm.users_cache)
+        state = {"version": m.version}
+        save_schema(schema_path, state)
+        stats["to"] = m.version
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
@@ -1,5 +1,8 @@
+import hashlib
+import math
 import random
-from typing import List, Tuple
+import tkinter as tk
+from typing import Dict, List, Optional, Tuple
 
 from PIL import Image, ImageTk
 
@@ -9,6 +12,8 @@ except Exception as e:  # pragma: no cover
     pygame = None
 
 from .assets_loader import AssetsLoader
+from .frame_cache import FrameCache, shared_frame_cache
+from .live_photo import LivePhoto, diff_bbox
 
 
 class PetAnimator:
@@ -18,28 +23,96 @@ class PetAnimator:
         img = pa.get_tk_image()  # 当前帧转 Tk Image
         pa.next_frame()          # 切换到下一帧
         pa.interact_random()     # 触发随机互动动作
+        pa.set_scale(4.5)        # 运行时缩放，下一帧生效（支持小数倍）
+        photo = pa.update_photo(canvas)  # 持久 PhotoImage，按帧间变化区域原地更新
+    说明：
+        缩放后的帧图像由 FrameCache 按 (帧内容哈希, 轮廓色, 缩放) 缓存，切换缩放无需重新读取资源。
+        帧间变化区域在 1 倍图像上计算并按帧对记忆，眨眼、摇尾等小变化只推送变化的矩形。
     """
 
-    def __init__(self, frames_path: str, scale: int = 4) -> None:
+    MAX_DIRTY_MEMO = 1024
+
+    MIN_SCALE = 1.0
+    MAX_SCALE = 16.0
+
+    def __init__(self, frames_path: str, scale: float = 4, cache: Optional[FrameCache] = None) -> None:
         if pygame is None:
             raise RuntimeError("未检测到 pygame，请先安装：pip install pygame")
-        pygame.init()
-        self.scale = scale
+        # 切换桌宠会反复创建动画器，已初始化时不再重复 init
+        if not pygame.get_init():
+            pygame.init()
+        self.scale = self._clamp_scale(scale)
+        self.cache = cache if cache is not None else shared_frame_cache
         self.loader = AssetsLoader()
+        self.frames_path = frames_path
         self.raw_w, self.raw_h, frames_rgba = self.loader.load_frames(frames_path)
         self.frames: List["pygame.Surface"] = self.loader.to_surfaces(frames_rgba)
+        # 每帧原始 RGBA 字节，热加载时用于识别未变化的帧
+        self._frame_bytes: List[bytes] = [AssetsLoader.to_rgba_bytes(fr) for fr in frames_rgba]
+        # 每帧当前像素内容的哈希（互动叠加修改帧后置空，按需重新计算）
+        self._frame_keys: List[Optional[str]] = [hashlib.sha1(b).hexdigest() for b in self._frame_bytes]
         self._idx = 0
         self._state = "idle"
         # 互动叠加效果：短时改变某些像素颜色（如摇尾/吐舌）
         self._interact_ticks = 0
+        # 持久 PhotoImage 与帧间脏矩形记忆：(上一帧键, 当前帧键) -> 1 倍坐标下的变化区域
+        self._live: Optional[LivePhoto] = None
+        self._shown_key: Optional[Tuple] = None
+        self._shown_base: Optional[Image.Image] = None
+        self._dirty_memo: Dict[Tuple, Optional[Tuple[int, int, int, int]]] = {}
+        self.last_push_bytes = 0
 
     @property
     def w(self) -> int:
-        return self.raw_w * self.scale
+        return FrameCache.scaled_size(self.raw_w, self.raw_h, self.scale)[0]
 
     @property
     def h(self) -> int:
-        return self.raw_h * self.scale
+        return FrameCache.scaled_size(self.raw_w, self.raw_h, self.scale)[1]
+
+    @classmethod
+    def _clamp_scale(cls, scale: float) -> float:
+        return min(cls.MAX_SCALE, max(cls.MIN_SCALE, float(scale)))
+
+    def set_scale(self, scale: float) -> bool:
+        """设置缩放倍数（下一次 get_tk_image 生效），返回是否变化"""
+        scale = self._clamp_scale(scale)
+        if scale == self.scale:
+            return False
+        self.scale = scale
+        return True
+
+    def _frame_key(self, idx: int) -> str:
+        """帧内容哈希；帧被互动叠加修改后按当前像素重新计算"""
+        key = self._frame_keys[idx]
+        if key is None:
+            key = hashlib.sha1(pygame.image.tostring(self.frames[idx], "RGBA", False)).hexdigest()
+            self._frame_keys[idx] = key
+        return key
+
+    def reload(self, frames_path: str = "") -> bool:
+        """热加载：重新解码资源并原地替换帧，内容未变化的帧沿用原 Surface；返回是否有变化"""
+        path = frames_path or self.frames_path
+        w, h, frames_rgba = self.loader.load_frames(path)
+        new_bytes = [AssetsLoader.to_rgba_bytes(fr) for fr in frames_rgba]
+        if path == self.frames_path and (w, h) == (self.raw_w, self.raw_h) and new_bytes == self._frame_bytes:
+            return False
+        reuse: Dict[bytes, "pygame.Surface"] = {}
+        if (w, h) == (self.raw_w, self.raw_h):
+            reuse = dict(zip(self._frame_bytes, self.frames))
+        frames: List["pygame.Surface"] = []
+        for raw, fr in zip(new_bytes, frames_rgba):
+            surf = reuse.get(raw)
+            frames.append(surf if surf is not None else self.loader.to_surfaces([fr])[0])
+        # 一次性替换，下一次刷新即显示新帧，不经过空白帧
+        self.frames_path = path
+        self.raw_w, self.raw_h = w, h
+        self.frames = frames
+        self._frame_bytes = new_bytes
+        # 沿用的 Surface 可能带有互动叠加，统一按当前像素重新计算
+        self._frame_keys = [None] * len(frames)
+        self._idx = self._idx % len(frames) if frames else 0
+        return True
 
     def next_frame(self) -> None:
         """前进到下一帧，循环播放，支持轻微随机停顿模拟呼吸"""
@@ -48,6 +121,7 @@ class PetAnimator:
         self._idx = (self._idx + 1) % len(self.frames)
         if self._interact_ticks > 0:
             self._apply_interact_overlay(self.frames[self._idx])
+            self._frame_keys[self._idx] = None
             self._interact_ticks -= 1
 
     def interact_random(self) -> None:
@@ -55,45 +129,121 @@ class PetAnimator:
         self._state = random.choice(["wag", "jump", "blink"])
         self._interact_ticks = random.randint(5, 12)
 
-    def get_tk_image(self, outline_color: Tuple[int, int, int] = None) -> "ImageTk.PhotoImage":
-        """将当前 Pygame Surface 转为 Tkinter 可用的 PhotoImage
-        
+    def frame_cache_key(self, outline_color: Optional[Tuple[int, int, int]] = None) -> Tuple:
+        """当前帧的缓存键：(帧内容哈希, 轮廓色)，渲染后端据此缓存缩放结果"""
+        if not self.frames:
+            return ("", None)
+        return (self._frame_key(self._idx), tuple(outline_color) if outline_color else None)
+
+    def get_surface(self, outline_color: Optional[Tuple[int, int, int]] = None) -> "pygame.Surface":
+        """当前帧的 1 倍 Surface（可选像素轮廓），供 pygame 渲染后端直接使用"""
+        if not self.frames:
+            return pygame.Surface((self.raw_w, self.raw_h), pygame.SRCALPHA, 32)
+        return self._compose_surface(self.frames[self._idx], outline_color)
+
+    def get_image(self, outline_color: Optional[Tuple[int, int, int]] = None) -> Image.Image:
+        """返回当前帧按当前缩放的 PIL 图像（来自共享缓存，请勿修改）
+
         Args:
             outline_color: 可选 (R, G, B)，若提供则绘制像素轮廓
         """
         if not self.frames:
-            img = Image.new("RGBA", (self.w, self.h), (0, 0, 0, 0))
-            return ImageTk.PhotoImage(img)
-        surf = self.frames[self._idx]
+            return Image.new("RGBA", (self.w, self.h), (0, 0, 0, 0))
+        idx = self._idx
+        key = self.frame_cache_key(outline_color)
+        return self.cache.get(key, self.scale, lambda: self._render_base(self.frames[idx], outline_color))
 
+    def update_photo(
+        self, master: Optional[tk.Misc], outline_color: Optional[Tuple[int, int, int]] = None, dry_run: bool = False
+    ) -> Optional["ImageTk.PhotoImage"]:
+        """将当前帧写入持久 PhotoImage 并返回；仅首帧或尺寸变化时返回新对象（需重新绑定到控件）
+
+        Args:
+            master: PhotoImage 所属控件
+            outline_color: 可选 (R, G, B)，若提供则绘制像素轮廓
+            dry_run: 仅统计推送量（last_push_bytes），不创建 Tk 对象
+        """
+        if self._live is None or self._live.master is not master or self._live.dry_run != dry_run:
+            self._live = LivePhoto(master, dry_run=dry_run)
+            self._shown_key = None
+        if not self.frames:
+            return self._live.show(Image.new("RGBA", (self.w, self.h), (0, 0, 0, 0)))
+        idx = self._idx
+        key = self.frame_cache_key(outline_color)
+        base = self.cache.get(key, 1.0, lambda: self._render_base(self.frames[idx], outline_color))
+        img = self.get_image(outline_color)
+        dirty = None
+        if self._shown_key is not None and self._shown_base is not None and self._shown_base.size == base.size:
+            dirty = self._scaled_dirty(self._dirty_between(self._shown_key, key, self._shown_base, base))
+        photo = self._live.show(img, dirty)
+        self.last_push_bytes = self._live.last_push_bytes
+        self._shown_key = key
+        self._shown_base = base
+        return photo
+
+    def _dirty_between(
+        self, prev_key: Tuple, key: Tuple, prev_base: Image.Image, base: Image.Image
+    ) -> Tuple[int, int, int, int]:
+        """两帧在 1 倍图像上的变化区域（按帧对记忆）；无变化时为空元组"""
+        memo_key = (prev_key, key)
+        if memo_key not in self._dirty_memo:
+            if len(self._dirty_memo) >= self.MAX_DIRTY_MEMO:
+                self._dirty_memo.clear()
+            self._dirty_memo[memo_key] = diff_bbox(prev_base, base) or ()
+        return self._dirty_memo[memo_key]
+
+    def _scaled_dirty(self, box: Tuple) -> Tuple:
+        """将 1 倍坐标的变化区域换算到当前缩放；小数倍缩放时外扩 1 像素覆盖插值边缘"""
+        if not box:
+            return ()
+        pad = 0 if float(self.scale).is_integer() else 1
+        x0, y0, x1, y1 = box
+        s = self.scale
+        return (
+            max(0, int(math.floor(x0 * s)) - pad),
+            max(0, int(math.floor(y0 * s)) - pad),
+            min(self.w, int(math.ceil(x1 * s)) + pad),
+            min(self.h, int(math.ceil(y1 * s)) + pad),
+        )
+
+    def get_tk_image(self, outline_color: Tuple[int, int, int] = None) -> "ImageTk.PhotoImage":
+        """将当前帧转为 Tkinter 可用的 PhotoImage
+
+        Args:
+            outline_color: 可选 (R, G, B)，若提供则绘制像素轮廓
+        """
+        return ImageTk.PhotoImage(self.get_image(outline_color))
+
+    def _render_base(self, surf: "pygame.Surface", outline_color: Optional[Tuple[int, int, int]]) -> Image.Image:
+        """生成 1 倍大小的帧图像（可选像素轮廓）"""
+        surf = self._compose_surface(surf, outline_color)
+        raw_str = pygame.image.tostring(surf, "RGBA", False)
+        return Image.frombytes("RGBA", (self.raw_w, self.raw_h), raw_str)
+
+    @staticmethod
+    def _compose_surface(surf: "pygame.Surface", outline_color: Optional[Tuple[int, int, int]]) -> "pygame.Surface":
+        """为帧叠加像素轮廓（无轮廓时原样返回）"""
         # 如果需要绘制轮廓
         if outline_color:
             # 创建 mask 并生成纯色图
             mask = pygame.mask.from_surface(surf)
             # 注意：setcolor 需要 (R, G, B, A)
             solid_surf = mask.to_surface(setcolor=(*outline_color, 255), unsetcolor=(0, 0, 0, 0))
-            
+
             # 创建合成用的临时 Surface
             w, h = surf.get_size()
             temp_surf = pygame.Surface((w, h), pygame.SRCALPHA)
-            
+
             # 上下左右偏移绘制纯色底（模拟膨胀效果）
             temp_surf.blit(solid_surf, (-1, 0))
             temp_surf.blit(solid_surf, (1, 0))
             temp_surf.blit(solid_surf, (0, -1))
             temp_surf.blit(solid_surf, (0, 1))
-            
+
             # 叠加原图
             temp_surf.blit(surf, (0, 0))
             surf = temp_surf
-
-        raw_str = pygame.image.tostring(surf, "RGBA", False)
-        img = Image.frombytes("RGBA", (self.raw_w, self.raw_h), raw_str)
-        
-        if self.scale != 1:
-            img = img.resize((self.w, self.h), Image.NEAREST)
-            
-        return ImageTk.PhotoImage(img)
+        return surf
 
     def _apply_interact_overlay(self, surf: "pygame.Surface") -> None:
         """在当前帧上应用互动叠加（示例：随机若干像素加亮）"""
@@ -0,0 +1,499 @@
+import abc
+import os
+import sys
+import tkinter as tk
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import pygame
+except Exception:  # pragma: no cover
+    pygame = None
+
+try:
+    import win32con
+    import win32gui
+except Exception:
+    win32con = None
+    win32gui = None
+
+from .pet import PetAnimator
+
+# 不规则窗口的透明关键色 #00FEFE（win32 COLORREF 为 0x00BBGGRR）
+COLOR_KEY_HEX = "#00FEFE"
+COLOR_KEY_RGB = (0, 254, 254)
+COLOR_KEY_REF = 0xFEFE00
+HEART_COLOR = "#FF4D6D"
+HEART_PIXELS = [
+    (1, 0), (2, 0), (3, 0), (4, 0), (5, 0),
+    (0, 1), (1, 1), (2, 1), (3, 1), (4, 1), (5, 1), (6, 1),
+    (0, 2), (1, 2), (2, 2), (3, 2), (4, 2), (5, 2), (6, 2),
+    (1, 3), (2, 3), (3, 3), (4, 3), (5, 3),
+    (2, 4), (3, 4), (4, 4),
+    (3, 5),
+]
+
+
+def _apply_win32_layer(hwnd: int) -> bool:
+    """通过 pywin32 设置层叠、置顶与关键色透明（若可用），返回是否成功"""
+    if win32gui is None or win32con is None:
+        return False
+    try:
+        ex_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+        ex_style |= win32con.WS_EX_LAYERED | win32con.WS_EX_TOPMOST
+        win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, ex_style)
+        # 使用近全透明的关键色（与背景一致），实现不规则窗口
+        win32gui.SetLayeredWindowAttributes(hwnd, COLOR_KEY_REF, 255, win32con.LWA_COLORKEY)
+        return True
+    except Exception:
+        # 失败则保持默认窗口属性，不影响功能
+        return False
+
+
+class PointerEvent:
+    """与 tk.Event 兼容的指针事件（x/y 为窗口内坐标，x_root/y_root 为屏幕坐标）"""
+
+    __slots__ = ("x", "y", "x_root", "y_root")
+
+    def __init__(self, x: int, y: int, x_root: int, y_root: int) -> None:
+        self.x = x
+        self.y = y
+        self.x_root = x_root
+        self.y_root = y_root
+
+
+class PetRenderer(abc.ABC):
+    """桌宠渲染后端接口：FloatWindow 的菜单、拖拽、投喂与问候逻辑只依赖该接口
+    说明：
+        - tk_parent：菜单、问候气泡与定时器所依附的 Tk 控件
+        - bind(kind, cb)：kind 为 press / drag / release / menu，回调参数带 x_root / y_root
+        - 爱心等装饰以句柄管理：add_heart 返回句柄，move_heart / remove_heart 操作之
+        - 抽象方法由各后端实现，缺少实现时在构造时即报错
+    """
+
+    name = "base"
+
+    def __init__(self, tk_parent: Optional[tk.Misc]) -> None:
+        self.tk_parent = tk_parent
+        self._handlers: Dict[str, Callable] = {}
+
+    def bind(self, kind: str, cb: Callable) -> None:
+        self._handlers[kind] = cb
+
+    def _emit(self, kind: str, event) -> None:
+        cb = self._handlers.get(kind)
+        if cb is not None:
+            cb(event)
+
+    def screen_size(self) -> Tuple[int, int]:
+        return self.tk_parent.winfo_screenwidth(), self.tk_parent.winfo_screenheight()
+
+    @abc.abstractmethod
+    def is_alive(self) -> bool:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def present(self, animator: PetAnimator, outline_color: Optional[Tuple[int, int, int]] = None) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def resize(self, w: int, h: int) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def move(self, x: int, y: int) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def position(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def size(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    def lift(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def add_heart(self, x: int, y: int, scale: int = 2) -> object:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def move_heart(self, handle: object, dx: int, dy: int) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def remove_heart(self, handle: object) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class TkRenderer(PetRenderer):
+    """Tk 后端：置顶无边框 Toplevel + Canvas，帧经持久 PhotoImage 按变化区域更新"""
+
+    name = "tk"
+
+    def __init__(self, root: tk.Misc, w: int, h: int) -> None:
+        self.top = tk.Toplevel(root)
+        super().__init__(self.top)
+        self.top.overrideredirect(True)
+        self.top.attributes("-topmost", True)
+        # 降级透明背景（Windows 上可用）
+        try:
+            self.top.wm_attributes("-transparentcolor", COLOR_KEY_HEX)
+            bg = COLOR_KEY_HEX
+        except Exception:
+            self.top.attributes("-alpha", 0.98)
+            bg = "#000000"
+        self.top.configure(bg=bg)
+        self.canvas = tk.Canvas(self.top, width=w, height=h, highlightthickness=0, bg=bg)
+        self.canvas.pack()
+        self._photo = None
+        self._image_item: Optional[int] = None
+        self.canvas.bind("<ButtonPress-1>", lambda e: self._emit("press", e))
+        self.canvas.bind("<B1-Motion>", lambda e: self._emit("drag", e))
+        self.canvas.bind("<ButtonRelease-1>", lambda e: self._emit("release", e))
+        self.canvas.bind("<Button-3>", lambda e: self._emit("menu", e))
+        try:
+            _apply_win32_layer(self.top.winfo_id())
+        except Exception:
+            pass
+
+    def is_alive(self) -> bool:
+        try:
+            return bool(self.top.winfo_exists())
+        except Exception:
+            return False
+
+    def present(self, animator: PetAnimator, outline_color: Optional[Tuple[int, int, int]] = None) -> None:
+        """将当前帧写入持久 PhotoImage（仅变化区域）；图片对象变化时才重新绑定画布"""
+        photo = animator.update_photo(self.canvas, outline_color=outline_color)
+        if photo is self._photo:
+            return
+        self._photo = photo
+        self.resize(animator.w, animator.h)
+        if self._image_item is None:
+            self._image_item = self.canvas.create_image(0, 0, image=photo, anchor="nw")
+        else:
+            self.canvas.itemconfigure(self._image_item, image=photo)
+
+    def resize(self, w: int, h: int) -> None:
+        self.canvas.configure(width=w, height=h)
+
+    def move(self, x: int, y: int) -> None:
+        self.top.geometry(f"+{x}+{y}")
+
+    def position(self) -> Tuple[int, int]:
+        return self.top.winfo_x(), self.top.winfo_y()
+
+    def size(self) -> Tuple[int, int]:
+        return self.top.winfo_width(), self.top.winfo_height()
+
+    def lift(self) -> None:
+        self.top.lift()
+
+    def add_heart(self, x: int, y: int, scale: int = 2) -> object:
+        return [
+            self.canvas.create_rectangle(
+                x + px * scale, y + py * scale, x + px * scale + scale, y + py * scale + scale,
+                fill=HEART_COLOR, outline="",
+            )
+            for px, py in HEART_PIXELS
+        ]
+
+    def move_heart(self, handle: object, dx: int, dy: int) -> None:
+        for cid in handle:
+            self.canvas.move(cid, dx, dy)
+
+    def remove_heart(self, handle: object) -> None:
+        for cid in handle:
+            self.canvas.delete(cid)
+
+    def close(self) -> None:
+        try:
+            self.top.destroy()
+        except Exception:
+            pass
+
+
+class PygameRenderer(PetRenderer):
+    """pygame 后端：无边框 SDL 窗口，直接 blit 缓存的缩放 Surface，不经 PIL / Tk 图像转换
+    说明：
+        - Tk 仍负责主界面、菜单与问候气泡；本窗口的事件由 Tk after 循环定期泵取
+        - 缩放 Surface 按 (帧内容键, 轮廓色, 缩放) 缓存，只在首次出现时缩放并合成到关键色背景一次
+        - Windows 上通过 pywin32 关键色实现透明；其他平台为纯色背景
+        - tk_parent 为 None 时不启动事件泵（基准测试 / 无界面环境直接调用 present）
+    """
+
+    name = "pygame"
+    PUMP_INTERVAL_MS = 16
+    MAX_CACHED_SURFACES = 64
+
+    def __init__(self, tk_parent: Optional[tk.Misc], w: int, h: int, x: int = 0, y: int = 0) -> None:
+        if pygame is None:
+            raise RuntimeError("未检测到 pygame，请先安装：pip install pygame")
+        super().__init__(tk_parent)
+        os.environ["SDL_VIDEO_WINDOW_POS"] = f"{x},{y}"
+        pygame.display.init()
+        self.screen = pygame.display.set_mode((w, h), pygame.NOFRAME)
+        pygame.display.set_caption("Desktop Pixel Pet")
+        self._pos = (x, y)
+        self._window = None
+        try:
+            from pygame._sdl2.video import Window
+
+            self._window = Window.from_display_module()
+        except Exception:
+            self._window = None
+        self._surfaces: "OrderedDict[Tuple, pygame.Surface]" = OrderedDict()
+        self._hearts: Dict[int, List[int]] = {}  # 句柄 -> [x, y, scale]
+        self._next_heart = 0
+        self._last_frame: Optional["pygame.Surface"] = None
+        self._needs_redraw = False
+        self._alive = True
+        self._pump_job: Optional[str] = None
+        self._button1 = False
+        if sys.platform.startswith("win"):
+            try:
+                _apply_win32_layer(pygame.display.get_wm_info()["window"])
+            except Exception:
+                pass
+        if tk_parent is not None:
+            self._pump_job = tk_parent.after(self.PUMP_INTERVAL_MS, self._pump_loop)
+
+    def is_alive(self) -> bool:
+        return self._alive
+
+    def _scaled_surface(self, animator: PetAnimator, outline_color: Optional[Tuple[int, int, int]]) -> "pygame.Surface":
+        key = animator.frame_cache_key(outline_color) + (animator.scale,)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            return surf
+        base = animator.get_surface(outline_color)
+        if (animator.w, animator.h) != base.get_size():
+            base = pygame.transform.scale(base, (animator.w, animator.h))
+        # 预先合成到关键色背景并转换为显示格式：之后每帧只是一次不透明拷贝，无 alpha 混合与格式转换
+        surf = pygame.Surface((animator.w, animator.h))
+        surf.fill(COLOR_KEY_RGB)
+        surf.blit(base, (0, 0))
+        try:
+            surf = surf.convert()
+        except Exception:
+            pass
+        self._surfaces[key] = surf
+        while len(self._surfaces) > self.MAX_CACHED_SURFACES:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def present(self, animator: PetAnimator, outline_color: Optional[Tuple[int, int, int]] = None) -> None:
+        if not self._alive:
+            return
+        if self.screen.get_size() != (animator.w, animator.h):
+            self.resize(animator.w, animator.h)
+        frame = self._scaled_surface(animator, outline_color)
+        # 帧未变化且无装饰更新时跳过重绘
+        if frame is self._last_frame and not self._needs_redraw:
+            return
+        self._last_frame = frame
+        self._redraw()
+
+    def _redraw(self) -> None:
+        self._needs_redraw = False
+        if self._last_frame is not None:
+            self.screen.blit(self._last_frame, (0, 0))
+        else:
+            self.screen.fill(COLOR_KEY_RGB)
+        for x, y, scale in self._hearts.values():
+            for px, py in HEART_PIXELS:
+                self.screen.fill((255, 77, 109), (x + px * scale, y + py * scale, scale, scale))
+        pygame.display.flip()
+
+    def pump(self) -> None:
+        """处理 SDL 事件并转发为指针事件（由 Tk after 循环驱动）"""
+        if not self._alive:
+            return
+        for ev in pygame.event.get():
+            if ev.type == pygame.QUIT:
+                continue
+            if ev.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION):
+                x, y = ev.pos
+                px, py = self.position()
+                pe = PointerEvent(x, y, px + x, py + y)
+                if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
+                    self._button1 = True
+                    self._emit("press", pe)
+                elif ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 3:
+                    self._emit("menu", pe)
+                elif ev.type == pygame.MOUSEBUTTONUP and ev.button == 1:
+                    self._button1 = False
+                    self._emit("release", pe)
+                elif ev.type == pygame.MOUSEMOTION and self._button1:
+                    self._emit("drag", pe)
+        # 爱心等装饰的变化合并到一次重绘
+        if self._needs_redraw:
+            self._redraw()
+
+    def _pump_loop(self) -> None:
+        self._pump_job = None
+        if not self._alive:
+            return
+        try:
+            self.pump()
+        except Exception as e:
+            print(f"pygame 事件处理失败: {e}")
+        if self._alive and self.tk_parent is not None:
+            self._pump_job = self.tk_parent.after(self.PUMP_INTERVAL_MS, self._pump_loop)
+
+    def resize(self, w: int, h: int) -> None:
+        self.screen = pygame.display.set_mode((w, h), pygame.NOFRAME)
+        self._needs_redraw = True
+
+    def move(self, x: int, y: int) -> None:
+        self._pos = (int(x), int(y))
+        if self._window is not None:
+            try:
+                self._window.position = self._pos
+            except Exception:
+                pass
+
+    def position(self) -> Tuple[int, int]:
+        if self._window is not None:
+            try:
+                return tuple(self._window.position)
+            except Exception:
+                pass
+        return self._pos
+
+    def size(self) -> Tuple[int, int]:
+        return self.screen.get_size()
+
+    def lift(self) -> None:
+        if self._window is not None:
+            try:
+                self._window.focus()
+            except Exception:
+                pass
+
+    def add_heart(self, x: int, y: int, scale: int = 2) -> object:
+        self._next_heart += 1
+        self._hearts[self._next_heart] = [x, y, scale]
+        self._needs_redraw = True
+        return self._next_heart
+
+    def move_heart(self, handle: object, dx: int, dy: int) -> None:
+        heart = self._hearts.get(handle)
+        if heart is not None:
+            heart[0] += dx
+            heart[1] += dy
+            self._needs_redraw = True
+
+    def remove_heart(self, handle: object) -> None:
+        if self._hearts.pop(handle, None) is not None:
+            self._needs_redraw = True
+
+    def close(self) -> None:
+        self._alive = False
+        if self._pump_job and self.tk_parent is not None:
+            try:
+                self.tk_parent.after_cancel(self._pump_job)
+            except Exception:
+                pass
+        self._pump_job = None
+        self._surfaces.clear()
+        try:
+            pygame.display.quit()
+        except Exception:
+            pass
+
+
+class NullRenderer(PetRenderer):
+    """无界面后端：不创建任何窗口，帧经与 Tk 后端相同的缓存 / 脏矩形流程计算但不推送到 Tk
+    说明：
+        - 用于无显示环境下运行完整的逐帧流程（配合 core.clock.VirtualClock 加速推进）与基准测试
+        - frames 为已显示帧数，last_outline 为最近一帧的轮廓色，hearts 为当前存在的爱心
+    """
+
+    name = "null"
+
+    def __init__(self, tk_parent: Optional[tk.Misc] = None, w: int = 0, h: int = 0, x: int = 0, y: int = 0) -> None:
+        super().__init__(tk_parent)
+        self._size = (w, h)
+        self._pos = (x, y)
+        self._screen = (1920, 1080)
+        self._hearts: Dict[int, List[int]] = {}
+        self._next_heart = 0
+        self._alive = True
+        self.frames = 0
+        self.pushed_bytes = 0
+        self.last_outline: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def hearts(self) -> Dict[int, List[int]]:
+        return self._hearts
+
+    def screen_size(self) -> Tuple[int, int]:
+        return self._screen
+
+    def is_alive(self) -> bool:
+        return self._alive
+
+    def present(self, animator: PetAnimator, outline_color: Optional[Tuple[int, int, int]] = None) -> None:
+        if not self._alive:
+            return
+        animator.update_photo(None, outline_color=outline_color, dry_run=True)
+        self._size = (animator.w, animator.h)
+        self.frames += 1
+        self.pushed_bytes += animator.last_push_bytes
+        self.last_outline = outline_color
+
+    def resize(self, w: int, h: int) -> None:
+        self._size = (w, h)
+
+    def move(self, x: int, y: int) -> None:
+        self._pos = (int(x), int(y))
+
+    def position(self) -> Tuple[int, int]:
+        return self._pos
+
+    def size(self) -> Tuple[int, int]:
+        return self._size
+
+    def add_heart(self, x: int, y: int, scale: int = 2) -> object:
+        self._next_heart += 1
+        self._hearts[self._next_heart] = [x, y, scale]
+        return self._next_heart
+
+    def move_heart(self, handle: object, dx: int, dy: int) -> None:
+        heart = self._hearts.get(handle)
+        if heart is not None:
+            heart[0] += dx
+            heart[1] += dy
+
+    def remove_heart(self, handle: object) -> None:
+        self._hearts.pop(handle, None)
+
+    def close(self) -> None:
+        self._alive = False
+        self._hearts.clear()
+
+
+RENDERERS = {"tk": TkRenderer, "pygame": PygameRenderer, "null": NullRenderer}
+
+
+def create_renderer(backend: str, root: tk.Misc, w: int, h: int, x: int = 0, y: int = 0) -> PetRenderer:
+    """按名称创建渲染后端；pygame 后端创建失败时回退到 Tk"""
+    if backend == "null":
+        return NullRenderer(root, w, h, x, y)
+    if backend == "pygame":
+        try:
+            return PygameRenderer(root, w, h, x, y)
+        except Exception as e:
+            print(f"pygame 渲染后端不可用，回退到 Tk: {e}")
+    renderer = TkRenderer(root, w, h)
+    renderer.move(x, y)
+    return renderer
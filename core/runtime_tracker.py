@@ -12,10 +12,20 @@ class RuntimeTracker:
         rt.start(username, pet_name)
         rt.stop()
         rt.subscribe(callback)  # 每次 tick 回调更新 UI
+        rt.unsubscribe(callback)  # 页面隐藏时取消，避免订阅者随页面切换累积
+    说明：
+        - 提供 scheduler（TimerWheel）时由时间轮每秒 tick，回调在 Tk 线程执行，不再起守护线程
+        - 提供 usage（UsageStats）时每秒同时计入按天统计（内存累计，按批写盘）
     """
 
-    def __init__(self, data_manager: DataManager) -> None:
+    TICK_MS = 1000
+    TICK_SLACK_MS = 120
+
+    def __init__(self, data_manager: DataManager, scheduler=None, usage=None) -> None:
         self.dm = data_manager
+        self.scheduler = scheduler
+        self.usage = usage
+        self._timer = None
         self._username: Optional[str] = None
         self._pet_name: Optional[str] = None
         self._stop = threading.Event()
@@ -24,21 +34,40 @@ class RuntimeTracker:
 
     def subscribe(self, fn: Callable[[int, int], None]) -> None:
         """订阅 tick 事件，参数为（总时间秒，宠物时间秒）"""
-        self._callbacks.append(fn)
+        if fn not in self._callbacks:
+            self._callbacks.append(fn)
+
+    def unsubscribe(self, fn: Callable[[int, int], None]) -> None:
+        """取消订阅 tick 事件"""
+        try:
+            self._callbacks.remove(fn)
+        except ValueError:
+            pass
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._callbacks)
 
     def start(self, username: str, pet_name: str) -> None:
-        """开始计时：设置当前用户与宠物，并启动守护线程"""
+        """开始计时：设置当前用户与宠物，并启动守护线程（或注册时间轮定时器）"""
         self._username = username
         self._pet_name = pet_name
         self._stop.clear()
+        if self.scheduler is not None:
+            if self._timer is None:
+                self._timer = self.scheduler.call_every(self.TICK_MS, self._tick_once, slack_ms=self.TICK_SLACK_MS)
+            return
         if self._thread and self._thread.is_alive():
             return
         self._thread = threading.Thread(target=self._loop, daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
-        """停止计时线程"""
+        """停止计时线程 / 定时器"""
         self._stop.set()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
         try:
             if self._thread:
                 self._thread.join(timeout=2.0)
@@ -49,27 +78,28 @@ class RuntimeTracker:
         """每秒递增总时间与当前宠物时间，并通知 UI"""
         while not self._stop.is_set():
             time.sleep(1.0)
-            if not (self._username and self._pet_name):
-                continue
-            user = self.dm.get_user(self._username)
-            if not user:
-                continue
-            total = int(user.get("total_run_time", 0)) + 1
-            pet_times = dict(user.get("pet_run_time", {}))
-            pet_times[self._pet_name] = int(pet_times.get(self._pet_name, 0)) + 1
-            # 更新内存并异步持久化
-            user["total_run_time"] = total
-            user["pet_run_time"] = pet_times
-            self.dm.enqueue_user_update(self._username, {
-                "total_run_time": total,
-                "pet_run_time": pet_times
-            })
-            for cb in self._callbacks:
-                try:
-                    cb(total, pet_times.get(self._pet_name, 0))
-                except Exception:
-                    # 忽略回调异常，保证主流程
-                    pass
+            self._tick_once()
+
+    def _tick_once(self) -> None:
+        """累计一秒并通知订阅者"""
+        if not (self._username and self._pet_name):
+            return
+        # 更新内存并异步持久化（账本中按批合并为一条累计记录）
+        result = self.dm.accrue_run_time(self._username, self._pet_name, 1)
+        if result is None:
+            return
+        total, pet_total = result
+        if self.usage is not None:
+            try:
+                self.usage.add(self._username, self._pet_name, 1)
+            except Exception:
+                pass
+        for cb in list(self._callbacks):
+            try:
+                cb(total, pet_total)
+            except Exception:
+                # 忽略回调异常，保证主流程
+                pass
 
     @staticmethod
     def format_hms(seconds: int) -> str:
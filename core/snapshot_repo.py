@@ -0,0 +1,322 @@
+import fnmatch
+import hashlib
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# 内容定义分块参数：以行为候选边界（DataManager 以 indent=2 写 JSON），行内容哈希低位为 0 时切分
+MIN_CHUNK = 2 * 1024
+MAX_CHUNK = 64 * 1024
+BOUNDARY_MASK = 0x1FF
+
+DEFAULT_EXCLUDES = ("thumbs", "backups", "__pycache__", "*.tmp")
+
+
+def split_chunks(data: bytes) -> List[bytes]:
+    """内容定义分块：边界只取决于该行内容，文件中间插入 / 删除后其余块仍能对齐复用
+    - 每块至少 MIN_CHUNK（末块除外），最多 MAX_CHUNK；超长行（紧凑 JSON / 二进制）按定长切分
+    """
+    out: List[bytes] = []
+    crc32 = zlib.crc32
+    start = pos = 0
+    for line in data.split(b"\n"):
+        pos += len(line) + 1
+        while pos - start > MAX_CHUNK:
+            out.append(data[start:start + MAX_CHUNK])
+            start += MAX_CHUNK
+        if pos - start >= MIN_CHUNK and crc32(line) & BOUNDARY_MASK == 0:
+            out.append(data[start:pos])
+            start = pos
+    if start < len(data):
+        out.append(data[start:])
+    return out
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class SnapshotRepo:
+    """增量快照仓库：整个数据目录（可选资源目录）按内容寻址分块存储，相同内容只存一份
+    结构（<root>/）：
+        objects/ab/<sha256>         # zlib 压缩的对象：文件内容块，或文件的块列表（每行一个块哈希）
+        snapshots/<快照 ID>.json    # 清单：{"files": {相对路径: {"size", "mtime_ns", "list": 块列表对象哈希}}, ...}
+    使用：
+        repo = SnapshotRepo("snapshots")
+        info = repo.create(["data"])              # 相对 base_dir 的目录或文件
+        repo.restore(info["id"], target_dir=".")
+        repo.prune(keep_last=3, keep_daily=7, keep_weekly=4, keep_monthly=6)
+    说明：
+        - 大小与 mtime 均与上一个快照相同的文件直接复用块列表，不读取内容；未变化的一天只新增一个清单文件
+        - 块列表本身也按内容寻址存储，清单大小只与文件数有关，与数据量无关
+        - 变化的文件按内容定义分块，只写入仓库中尚不存在的块
+        - 恢复时逐块校验哈希，文件经临时文件原子替换，并还原 mtime；快照中没有的文件不会被删除
+        - 仓库按单写者设计：不要同时运行两个 create / prune
+    """
+
+    VERSION = 1
+    OBJECTS_DIR = "objects"
+    SNAPSHOTS_DIR = "snapshots"
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self.objects_dir = os.path.join(root, self.OBJECTS_DIR)
+        self.snapshots_dir = os.path.join(root, self.SNAPSHOTS_DIR)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+    # ===== 对象 =====
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _put_object(self, data: bytes) -> Tuple[str, int]:
+        """写入块（已存在则跳过），返回 (哈希, 新写入的字节数)"""
+        digest = _digest(data)
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return digest, 0
+        packed = zlib.compress(data, 6)
+        _write_atomic(path, packed)
+        return digest, len(packed)
+
+    def _get_object(self, digest: str) -> bytes:
+        """读取块并校验哈希，损坏时抛出 ValueError"""
+        with open(self._object_path(digest), "rb") as f:
+            data = zlib.decompress(f.read())
+        if _digest(data) != digest:
+            raise ValueError(f"块校验失败: {digest}")
+        return data
+
+    def _put_list(self, chunks: List[str]) -> Tuple[str, int]:
+        return self._put_object("\n".join(chunks).encode("ascii"))
+
+    def _get_list(self, digest: str) -> List[str]:
+        data = self._get_object(digest)
+        return data.decode("ascii").split("\n") if data else []
+
+    # ===== 快照 =====
+
+    def _manifest_path(self, snap_id: str) -> str:
+        return os.path.join(self.snapshots_dir, f"{snap_id}.json")
+
+    def load(self, snap_id: str) -> Dict[str, Any]:
+        """读取快照清单，不存在时抛出 KeyError"""
+        path = self._manifest_path(snap_id)
+        if not os.path.exists(path):
+            raise KeyError(f"快照不存在: {snap_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """按创建时间升序列出快照摘要（不含文件清单）"""
+        out: List[Dict[str, Any]] = []
+        for fn in os.listdir(self.snapshots_dir):
+            if not fn.endswith(".json"):
+                continue
+            try:
+                manifest = self.load(fn[:-5])
+            except Exception:
+                continue
+            manifest.pop("files", None)
+            out.append(manifest)
+        out.sort(key=lambda m: (m.get("created", 0), m.get("id", "")))
+        return out
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """最近一个快照的完整清单"""
+        snaps = self.list_snapshots()
+        return self.load(snaps[-1]["id"]) if snaps else None
+
+    @staticmethod
+    def _walk(sources: Iterable[str], base_dir: str, excludes: Iterable[str]) -> Iterable[Tuple[str, str]]:
+        """遍历来源，产出 (相对 base_dir 的路径（/ 分隔）, 绝对路径)"""
+        patterns = tuple(excludes)
+
+        def excluded(name: str) -> bool:
+            return any(fnmatch.fnmatch(name, p) for p in patterns)
+
+        for src in sources:
+            top = os.path.join(base_dir, src)
+            if os.path.isfile(top):
+                yield os.path.relpath(top, base_dir).replace(os.sep, "/"), top
+                continue
+            for dirpath, dirnames, filenames in os.walk(top):
+                dirnames[:] = sorted(d for d in dirnames if not excluded(d))
+                for fn in sorted(filenames):
+                    if excluded(fn):
+                        continue
+                    path = os.path.join(dirpath, fn)
+                    yield os.path.relpath(path, base_dir).replace(os.sep, "/"), path
+
+    def create(self, sources: List[str], base_dir: str = ".", label: str = "", excludes: Iterable[str] = DEFAULT_EXCLUDES) -> Dict[str, Any]:
+        """创建快照，返回清单摘要（含新增字节与耗时统计）"""
+        t0 = time.perf_counter()
+        base_dir = os.path.abspath(base_dir)
+        repo_abs = os.path.abspath(self.root)
+        prev = self.latest()
+        prev_files: Dict[str, Dict[str, Any]] = prev.get("files", {}) if prev else {}
+        files: Dict[str, Dict[str, Any]] = {}
+        # chunks / new_chunks 只统计本次读取的（变化的）文件
+        stats = {"files": 0, "bytes": 0, "reused_files": 0, "chunks": 0, "new_chunks": 0, "new_bytes": 0}
+        for rel, path in self._walk(sources, base_dir, excludes):
+            if os.path.abspath(path).startswith(repo_abs + os.sep):
+                continue  # 仓库位于来源目录内时跳过自身
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+            old = prev_files.get(rel)
+            if old and old.get("size") == st.st_size and old.get("mtime_ns") == st.st_mtime_ns:
+                entry["list"] = old["list"]
+                stats["reused_files"] += 1
+            else:
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                except OSError:
+                    continue
+                chunks = []
+                for piece in split_chunks(data):
+                    digest, written = self._put_object(piece)
+                    chunks.append(digest)
+                    if written:
+                        stats["new_chunks"] += 1
+                        stats["new_bytes"] += written
+                entry["size"] = len(data)
+                entry["list"], written = self._put_list(chunks)
+                stats["new_bytes"] += written
+                stats["chunks"] += len(chunks)
+            files[rel] = entry
+            stats["files"] += 1
+            stats["bytes"] += entry["size"]
+        created = time.time()
+        snap_id = time.strftime("%Y%m%d-%H%M%S", time.localtime(created)) + f"-{int(created * 1000) % 1000:03d}"
+        manifest = {
+            "version": self.VERSION,
+            "id": snap_id,
+            "created": created,
+            "label": label,
+            "sources": list(sources),
+            "files": files,
+            "stats": stats,
+        }
+        stats["seconds"] = round(time.perf_counter() - t0, 4)
+        payload = json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        _write_atomic(self._manifest_path(snap_id), payload)
+        summary = dict(manifest)
+        summary.pop("files")
+        summary["stats"] = dict(stats, manifest_bytes=len(payload))
+        return summary
+
+    def restore(self, snap_id: str, target_dir: str = ".", paths: Optional[List[str]] = None) -> Dict[str, int]:
+        """将快照恢复到 target_dir；paths 为相对路径前缀过滤（如 ["data/users.json"]）
+        内容与 mtime 已一致的文件跳过；返回 {"restored", "skipped"}
+        """
+        manifest = self.load(snap_id)
+        prefixes = [p.replace(os.sep, "/").rstrip("/") for p in (paths or [])]
+        restored = skipped = 0
+        for rel, entry in manifest.get("files", {}).items():
+            if prefixes and not any(rel == p or rel.startswith(p + "/") for p in prefixes):
+                continue
+            dest = os.path.join(target_dir, *rel.split("/"))
+            try:
+                st = os.stat(dest)
+                if st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+                    skipped += 1
+                    continue
+            except OSError:
+                pass
+            data = b"".join(self._get_object(d) for d in self._get_list(entry["list"]))
+            if len(data) != entry["size"]:
+                raise ValueError(f"文件大小不符: {rel}")
+            _write_atomic(dest, data)
+            os.utime(dest, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+            restored += 1
+        return {"restored": restored, "skipped": skipped}
+
+    def verify(self, snap_id: Optional[str] = None) -> List[str]:
+        """校验快照引用的块是否存在且内容完整，返回问题列表（为空表示正常）"""
+        ids = [snap_id] if snap_id else [m["id"] for m in self.list_snapshots()]
+        problems: List[str] = []
+        checked: Set[str] = set()
+        for sid in ids:
+            for rel, entry in self.load(sid).get("files", {}).items():
+                if entry["list"] in checked:
+                    continue
+                checked.add(entry["list"])
+                try:
+                    for digest in self._get_list(entry["list"]):
+                        if digest not in checked:
+                            checked.add(digest)
+                            self._get_object(digest)
+                except Exception as e:
+                    problems.append(f"{sid}: {rel}: {e}")
+        return problems
+
+    # ===== 保留策略 =====
+
+    @staticmethod
+    def select_keep(snapshots: List[Dict[str, Any]], keep_last: int = 0, keep_daily: int = 0, keep_weekly: int = 0, keep_monthly: int = 0) -> Set[str]:
+        """按“最近 N 个 + 每日 / 每周 / 每月最新一个”选出要保留的快照 ID"""
+        ordered = sorted(snapshots, key=lambda m: m.get("created", 0), reverse=True)
+        keep: Set[str] = {m["id"] for m in ordered[:max(0, keep_last)]}
+        for count, fmt in ((keep_daily, "%Y-%m-%d"), (keep_weekly, "%G-W%V"), (keep_monthly, "%Y-%m")):
+            buckets: Set[str] = set()
+            for m in ordered:
+                if len(buckets) >= count:
+                    break
+                bucket = time.strftime(fmt, time.localtime(m.get("created", 0)))
+                if bucket not in buckets:
+                    buckets.add(bucket)
+                    keep.add(m["id"])
+        return keep
+
+    def prune(self, keep_last: int = 3, keep_daily: int = 7, keep_weekly: int = 4, keep_monthly: int = 6) -> Dict[str, int]:
+        """删除保留策略之外的快照并回收不再被引用的块，返回统计"""
+        snaps = self.list_snapshots()
+        keep = self.select_keep(snaps, keep_last, keep_daily, keep_weekly, keep_monthly)
+        removed = 0
+        for m in snaps:
+            if m["id"] not in keep:
+                os.remove(self._manifest_path(m["id"]))
+                removed += 1
+        referenced: Set[str] = set()
+        for sid in keep:
+            for entry in self.load(sid).get("files", {}).values():
+                if entry["list"] not in referenced:
+                    referenced.add(entry["list"])
+                    referenced.update(self._get_list(entry["list"]))
+        objects = freed = 0
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for fn in filenames:
+                if fn in referenced:
+                    continue
+                path = os.path.join(dirpath, fn)
+                try:
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+                    objects += 1
+                except OSError:
+                    pass
+        return {"kept": len(keep), "removed_snapshots": removed, "removed_objects": objects, "freed_bytes": freed}
+
+    def stats(self) -> Dict[str, int]:
+        """仓库统计：快照数、块数与块占用字节"""
+        count = size = 0
+        for dirpath, _, filenames in os.walk(self.objects_dir):
+            for fn in filenames:
+                count += 1
+                size += os.path.getsize(os.path.join(dirpath, fn))
+        return {"snapshots": len(self.list_snapshots()), "objects": count, "object_bytes": size}
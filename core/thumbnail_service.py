@@ -0,0 +1,221 @@
+import hashlib
+import os
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageTk
+
+from .asset_watcher import norm_asset_path
+from .assets_loader import AssetsLoader
+from .frame_cache import shared_frame_cache
+
+
+class ThumbnailService:
+    """缩略图服务：在后台线程池解码并缩放预览图，按“资源内容哈希 + 缩放”缓存为磁盘 PNG
+    使用：
+        ts = ThumbnailService()
+        ts.bind_tk(root)                           # 在 Tk 线程上派发完成的缩略图
+        photo = ts.get_photo(frames_path, 3)       # 立即返回占位图，真实图片就绪后原地替换
+    说明：
+        - Tk 对象只在 Tk 线程创建；工作线程只产出 PIL Image
+        - 冷启动：后台解码像素 JSON 并写入 cache_dir/<hash>_<scale>.png
+        - 热启动：直接读取缓存 PNG，不再解码像素矩阵
+        - 占位图尺寸与真实图一致时通过 paste 原地替换，所有使用它的 Label 自动刷新；
+          尺寸不同时新建 PhotoImage 并通过 on_replaced 回调通知调用方
+    """
+
+    PLACEHOLDER_SIZE = (32, 32)  # 占位图的原始像素尺寸（与资源约定一致）
+    PUMP_INTERVAL_MS = 30
+    MAX_DISPATCH_PER_PUMP = 8  # 每次派发的上限，避免一次性阻塞 Tk 线程
+
+    def __init__(self, cache_dir: str = os.path.join("data", "thumbs"), max_workers: int = 2) -> None:
+        self.cache_dir = cache_dir
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumb")
+        self._results: "queue.Queue[Tuple[Tuple[str, float], Optional[Image.Image]]]" = queue.Queue()
+        self._digest_lock = threading.Lock()
+        # (路径, mtime_ns, 大小) -> 内容哈希，避免重复读取未变化的资源
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        # 以下字段仅在 Tk 线程访问
+        self._photos: Dict[Tuple[str, float], ImageTk.PhotoImage] = {}
+        self._waiters: Dict[Tuple[str, float], List[Callable[[ImageTk.PhotoImage], None]]] = {}
+        self._pending = 0
+        self._tk_widget: Optional[tk.Misc] = None
+        self._pump_job: Optional[str] = None
+
+    def bind_tk(self, widget: tk.Misc) -> None:
+        """绑定用于调度派发循环的 Tk 控件（通常为 root）或 TimerWheel"""
+        self._tk_widget = widget
+
+    def get_photo(
+        self,
+        frames_path: str,
+        scale: float,
+        on_replaced: Optional[Callable[[ImageTk.PhotoImage], None]] = None,
+    ) -> ImageTk.PhotoImage:
+        """返回预览 PhotoImage：已就绪则直接返回，否则返回占位图并在后台生成"""
+        key = (os.path.normpath(frames_path), float(scale))
+        photo = self._photos.get(key)
+        if photo is not None and key not in self._waiters:
+            return photo
+        if photo is None:
+            w, h = self.PLACEHOLDER_SIZE
+            size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+            photo = ImageTk.PhotoImage(Image.new("RGBA", size, (0, 0, 0, 0)))
+            self._photos[key] = photo
+            self._waiters[key] = []
+            self._pending += 1
+            self._executor.submit(self._work, key, frames_path, float(scale))
+            self._ensure_pump()
+        if on_replaced is not None:
+            self._waiters[key].append(on_replaced)
+        return photo
+
+    def invalidate(self, frames_path: str) -> None:
+        """丢弃指定资源在内存中的预览（资源变化后下次 get_photo 将重新生成）"""
+        norm = os.path.normpath(frames_path)
+        for key in [k for k in self._photos if k[0] == norm and k not in self._waiters]:
+            del self._photos[key]
+
+    def refresh(self, frames_path: str) -> int:
+        """资源内容变化后重新生成已显示的预览：尺寸不变时原地替换，界面不闪烁；返回重新生成的数量"""
+        target = norm_asset_path(frames_path)
+        keys = [k for k in self._photos if k not in self._waiters and norm_asset_path(k[0]) == target]
+        for key in keys:
+            self._waiters[key] = []
+            self._pending += 1
+            self._executor.submit(self._work, key, key[0], key[1])
+        if keys:
+            self._ensure_pump()
+        return len(keys)
+
+    def pending_count(self) -> int:
+        """尚未完成的缩略图任务数"""
+        return self._pending
+
+    def pump(self) -> int:
+        """在 Tk 线程派发已完成的缩略图，返回本次处理的数量"""
+        handled = 0
+        while handled < self.MAX_DISPATCH_PER_PUMP:
+            try:
+                key, img = self._results.get_nowait()
+            except queue.Empty:
+                break
+            handled += 1
+            self._pending -= 1
+            waiters = self._waiters.pop(key, [])
+            if img is None:
+                # 生成失败：丢弃占位图，下次 get_photo 重新提交生成
+                self._photos.pop(key, None)
+                continue
+            photo = self._photos.get(key)
+            if photo is not None and (photo.width(), photo.height()) == img.size:
+                # 尺寸一致：原地替换，引用该图片的控件自动刷新
+                photo.paste(img)
+                continue
+            photo = ImageTk.PhotoImage(img)
+            self._photos[key] = photo
+            for cb in waiters:
+                try:
+                    cb(photo)
+                except Exception:
+                    # 控件可能已销毁，忽略
+                    pass
+        return handled
+
+    def shutdown(self) -> None:
+        """停止线程池（不等待未完成任务）"""
+        if self._pump_job and self._tk_widget is not None:
+            try:
+                self._tk_widget.after_cancel(self._pump_job)
+            except Exception:
+                pass
+            self._pump_job = None
+        self._executor.shutdown(wait=False)
+
+    def _ensure_pump(self) -> None:
+        """有待完成任务时启动派发循环，全部完成后自动停止"""
+        if self._pump_job or self._tk_widget is None:
+            return
+
+        def loop() -> None:
+            self._pump_job = None
+            self.pump()
+            if self._pending > 0:
+                self._pump_job = self._tk_widget.after(self.PUMP_INTERVAL_MS, loop)
+
+        self._pump_job = self._tk_widget.after(self.PUMP_INTERVAL_MS, loop)
+
+    # ===== 工作线程 =====
+
+    def _work(self, key: Tuple[str, float], frames_path: str, scale: float) -> None:
+        """工作线程：优先读取磁盘缓存，未命中则解码并写入缓存"""
+        img: Optional[Image.Image] = None
+        try:
+            img = self.load_or_render(frames_path, scale)
+        except Exception:
+            img = None
+        self._results.put((key, img))
+
+    def asset_digest(self, frames_path: str) -> Optional[str]:
+        """资源文件的内容哈希（按 mtime/大小记忆，未变化时不重复读取）"""
+        try:
+            st = os.stat(frames_path)
+        except OSError:
+            return None
+        memo_key = (os.path.normpath(frames_path), st.st_mtime_ns, st.st_size)
+        with self._digest_lock:
+            digest = self._digests.get(memo_key)
+        if digest is None:
+            with open(frames_path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+            with self._digest_lock:
+                self._digests[memo_key] = digest
+        return digest
+
+    @staticmethod
+    def cache_file_name(digest: str, scale: float) -> str:
+        """缓存文件名：<内容哈希>_<缩放>.png（构建工具预生成缩略图时共用）"""
+        return f"{digest}_{scale:g}.png"
+
+    def cache_path(self, digest: str, scale: float) -> str:
+        """缓存文件路径：<cache_dir>/<内容哈希>_<缩放>.png"""
+        return os.path.join(self.cache_dir, self.cache_file_name(digest, scale))
+
+    def load_or_render(self, frames_path: str, scale: float) -> Image.Image:
+        """读取缓存缩略图；未命中时解码资源、缩放并原子写入缓存"""
+        digest = self.asset_digest(frames_path)
+        if digest is not None:
+            path = self.cache_path(digest, scale)
+            if os.path.exists(path):
+                try:
+                    with Image.open(path) as cached:
+                        return cached.convert("RGBA")
+                except Exception:
+                    pass
+        img = self.render(frames_path, scale)
+        if digest is not None:
+            self._save_png(img, self.cache_path(digest, scale))
+        return img
+
+    @staticmethod
+    def render(frames_path: str, scale: float) -> Image.Image:
+        """解码资源首帧并缩放（经共享帧缓存，与 PetAnimator 的缩放方式一致）"""
+        loader = AssetsLoader(require_pygame=False)
+        w, h, frames = loader.load_frames(frames_path)
+        raw = AssetsLoader.to_rgba_bytes(frames[0])
+        # 与 PetAnimator 使用相同的帧键，同一缩放的帧图像在悬浮窗与预览之间共享
+        key = (hashlib.sha1(raw).hexdigest(), None)
+        return shared_frame_cache.get(key, scale, lambda: Image.frombytes("RGBA", (w, h), raw))
+
+    def _save_png(self, img: Image.Image, path: str) -> None:
+        """原子写入 PNG 缓存（失败时忽略，不影响显示）"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            img.save(tmp_path, format="PNG")
+            os.replace(tmp_path, path)
+        except Exception:
+            pass
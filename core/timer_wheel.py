@@ -0,0 +1,316 @@
+import math
+from typing import Callable, List, Optional
+
+
+class TimerHandle:
+    """定时器句柄：cancel() 取消，active 表示仍在等待触发"""
+
+    __slots__ = ("deadline", "slack", "interval", "callback", "cancelled", "_tick", "_wheel")
+
+    def __init__(self, wheel: "TimerWheel", deadline: float, slack: float, interval: float, callback: Callable[[], None]) -> None:
+        self._wheel = wheel
+        self.deadline = deadline  # 名义到期时间（相对轮起点的毫秒）
+        self.slack = slack  # 允许提前触发的毫秒数（用于合并唤醒）
+        self.interval = interval  # 周期（毫秒），0 表示一次性
+        self.callback = callback
+        self.cancelled = False
+        self._tick = 0
+
+    @property
+    def active(self) -> bool:
+        return not self.cancelled
+
+    def cancel(self) -> None:
+        if not self.cancelled:
+            self.cancelled = True
+            self._wheel._on_cancel(self)
+
+
+class TimerWheel:
+    """分层时间轮调度器：所有定时事件共用一个驱动定时器，相近的到期时间合并为一次唤醒
+    使用：
+        wheel = TimerWheel(TkClock(root))                  # 或 VirtualClock()（无界面 / 测试）
+        h = wheel.call_later(120, tick)                    # 一次性
+        h = wheel.call_every(1000, flush, slack_ms=500)    # 周期性（按名义时间推进，不累积漂移）
+        h.cancel()
+        wheel.after(50, cb) / wheel.after_cancel(h)        # 与 Tk after 接口兼容，可直接作为 clock / bind_tk 的参数
+    说明：
+        - 时间按 tick_ms 量化；4 层 × 64 槽，约覆盖 tick_ms × 64^4（默认约 46 小时），更远的放入溢出表
+        - 驱动（driver）只在最近的到期时间挂一个 after；触发时，顺带执行 slack 窗口内可提前的定时器
+        - after() 默认允许提前 10%（不超过 MAX_SLACK_MS），call_later / call_every 可显式指定 slack_ms
+        - 回调在驱动所在线程（Tk 线程）执行；后台服务应把周期任务注册到时间轮，而不是各自起睡眠线程，
+          但回调只应做轻量工作：序列化、写盘等耗时操作应通知 / 提交给后台线程执行
+    """
+
+    TICK_MS = 10
+    SLOT_BITS = 6
+    LEVELS = 4
+    MAX_SLACK_MS = 250
+    SLACK_RATIO = 0.1
+
+    def __init__(self, driver, tick_ms: int = TICK_MS) -> None:
+        self.driver = driver
+        self.tick_ms = max(1, int(tick_ms))
+        self._origin = driver.time()
+        self._slots_n = 1 << self.SLOT_BITS
+        self._mask = self._slots_n - 1
+        self._slots: List[List[List[TimerHandle]]] = [
+            [[] for _ in range(self._slots_n)] for _ in range(self.LEVELS)
+        ]
+        self._overflow: List[TimerHandle] = []
+        self._cur = self._tick_of(self._now_ms())  # 已处理到的 tick
+        self._pending = 0
+        self._wake_job = None
+        self._wake_tick: Optional[int] = None
+        self._in_wake = False
+        self.wakeups = 0
+        self.fired = 0
+        self.coalesced = 0
+
+    # ===== 公共接口 =====
+
+    def call_later(self, ms: float, cb: Callable[[], None], slack_ms: float = 0) -> TimerHandle:
+        """ms 毫秒后执行一次 cb；slack_ms 为允许提前的毫秒数"""
+        return self._schedule(ms, cb, slack_ms, 0)
+
+    def call_every(self, interval_ms: float, cb: Callable[[], None], slack_ms: float = 0) -> TimerHandle:
+        """每 interval_ms 毫秒执行一次 cb，直到句柄被取消"""
+        return self._schedule(interval_ms, cb, slack_ms, max(1.0, float(interval_ms)))
+
+    def after(self, ms: int, cb: Callable[[], None]) -> TimerHandle:
+        """与 Tk after 兼容：允许按比例提前，便于与其他定时器合并"""
+        return self._schedule(ms, cb, min(self.MAX_SLACK_MS, ms * self.SLACK_RATIO), 0)
+
+    def after_cancel(self, handle: Optional[TimerHandle]) -> None:
+        if handle is not None:
+            handle.cancel()
+
+    def time(self) -> float:
+        return self.driver.time()
+
+    def pending(self) -> int:
+        """等待中的定时器数量"""
+        return self._pending
+
+    def stats(self) -> dict:
+        """统计：等待中的定时器、驱动唤醒次数、已执行回调数与经合并提前执行的回调数"""
+        return {"pending": self._pending, "wakeups": self.wakeups, "fired": self.fired, "coalesced": self.coalesced}
+
+    def close(self) -> None:
+        """取消驱动定时器并丢弃全部定时器"""
+        self._cancel_wake()
+        for level in self._slots:
+            for slot in level:
+                for h in slot:
+                    h.cancelled = True
+                slot.clear()
+        for h in self._overflow:
+            h.cancelled = True
+        self._overflow.clear()
+        self._pending = 0
+
+    # ===== 内部实现 =====
+
+    def _now_ms(self) -> float:
+        return (self.driver.time() - self._origin) * 1000.0
+
+    # 浮点误差容限：避免恰在 tick 边界上的时间被取整到相邻 tick
+    _EPS = 1e-6
+
+    def _tick_of(self, ms: float) -> int:
+        return int(math.floor(ms / self.tick_ms + self._EPS))
+
+    def _schedule(self, ms: float, cb: Callable[[], None], slack_ms: float, interval: float) -> TimerHandle:
+        deadline = self._now_ms() + max(0.0, float(ms))
+        h = TimerHandle(self, deadline, min(float(slack_ms), self.MAX_SLACK_MS), interval, cb)
+        self._pending += 1
+        self._insert(h)
+        # 只有比当前唤醒点更早时才需要重挂驱动
+        if not self._in_wake and (self._wake_tick is None or h._tick < self._wake_tick):
+            self._arm_at(h._tick)
+        return h
+
+    def _insert(self, h: TimerHandle, earliest: Optional[int] = None) -> None:
+        # 向上取整到 tick，保证不会早于 (deadline - slack) 触发
+        t = int(math.ceil(h.deadline / self.tick_ms - self._EPS))
+        t = max(t, self._cur + 1 if earliest is None else earliest)
+        h._tick = t
+        delta = t - self._cur
+        for level in range(self.LEVELS):
+            if delta < 1 << (self.SLOT_BITS * (level + 1)):
+                self._slots[level][(t >> (self.SLOT_BITS * level)) & self._mask].append(h)
+                return
+        self._overflow.append(h)
+
+    def _on_cancel(self, h: TimerHandle) -> None:
+        self._pending -= 1
+        # 惰性删除；若取消的是当前唤醒目标，重新挂驱动以免空唤醒
+        if not self._in_wake and h._tick == self._wake_tick:
+            self._arm()
+
+    def _cascade(self, level: int) -> None:
+        idx = (self._cur >> (self.SLOT_BITS * level)) & self._mask
+        slot = self._slots[level][idx]
+        if not slot:
+            return
+        moved, self._slots[level][idx] = slot, []
+        for h in moved:
+            if not h.cancelled:
+                # 下放发生在收集当前 tick 之前，恰在当前 tick 到期的仍可放入
+                self._insert(h, self._cur)
+
+    def _advance(self, target: int, due: List[TimerHandle]) -> None:
+        """推进到 target tick，收集到期的定时器"""
+        if self._pending == 0:
+            self._cur = max(self._cur, target)
+            return
+        if target - self._cur > self._slots_n:
+            # 间隔超过低层一圈（如系统休眠后首次唤醒）：整体重新分桶，不逐个 tick 推进
+            self._rebucket(target, due)
+            return
+        while self._cur < target:
+            self._cur += 1
+            if self._cur & self._mask == 0:
+                # 低层转满一圈时把上层对应槽位下放
+                for level in range(1, self.LEVELS):
+                    self._cascade(level)
+                    if (self._cur >> (self.SLOT_BITS * level)) & self._mask:
+                        break
+                else:
+                    overflow, self._overflow = self._overflow, []
+                    for h in overflow:
+                        if not h.cancelled:
+                            self._insert(h, self._cur)
+            slot = self._slots[0][self._cur & self._mask]
+            if slot:
+                self._slots[0][self._cur & self._mask] = []
+                due.extend(h for h in slot if not h.cancelled)
+
+    def _rebucket(self, target: int, due: List[TimerHandle]) -> None:
+        """直接跳到 target：收集全部有效定时器，已到期的放入 due，其余按新的当前 tick 重新放入各层
+        开销与槽位数和定时器数成正比，与跳过的时长无关
+        """
+        live: List[TimerHandle] = []
+        for level in self._slots:
+            for i, slot in enumerate(level):
+                if slot:
+                    live.extend(h for h in slot if not h.cancelled)
+                    level[i] = []
+        live.extend(h for h in self._overflow if not h.cancelled)
+        self._overflow = []
+        self._cur = target
+        for h in live:
+            if h._tick <= target:
+                due.append(h)
+            else:
+                # 保留原到期 tick，只是相对新的当前 tick 重新选择层级与槽位
+                self._insert(h, h._tick)
+
+    def _take_early(self, now_ms: float, due: List[TimerHandle]) -> None:
+        """合并唤醒：取出 slack 窗口内允许提前执行的定时器"""
+        window = int(math.ceil(self.MAX_SLACK_MS / self.tick_ms))
+        end = self._cur + window
+        slots = [self._slots[0][(self._cur + i) & self._mask] for i in range(1, window + 1)]
+        if (end >> self.SLOT_BITS) != (self._cur >> self.SLOT_BITS):
+            # 窗口跨越低层边界：下一周期的定时器可能仍在第 1 层
+            slots.append(self._slots[1][((self._cur >> self.SLOT_BITS) + 1) & self._mask])
+        for slot in slots:
+            if not slot:
+                continue
+            keep = []
+            for h in slot:
+                if h.cancelled:
+                    continue
+                if h._tick <= end and h.deadline - h.slack <= now_ms:
+                    due.append(h)
+                    self.coalesced += 1
+                else:
+                    keep.append(h)
+            slot[:] = keep
+
+    def _next_tick(self) -> Optional[int]:
+        """最近的到期 tick：各层按时间顺序找第一个含有效定时器的槽位，槽位下界已不早于当前最优时提前结束"""
+        if self._pending <= 0:
+            return None
+        best: Optional[int] = None
+        for level in range(self.LEVELS):
+            shift = self.SLOT_BITS * level
+            base = self._cur >> shift
+            # i = 64 对应与当前相同的槽位下标，存放的是绕过一圈的定时器
+            for i in range(1, self._slots_n + 1):
+                if best is not None and (base + i) << shift >= best:
+                    break
+                slot = self._slots[level][(base + i) & self._mask]
+                if not slot:
+                    continue
+                t = min((h._tick for h in slot if not h.cancelled), default=None)
+                if t is None:
+                    slot.clear()
+                    continue
+                if best is None or t < best:
+                    best = t
+                break
+        if self._overflow:
+            self._overflow = [h for h in self._overflow if not h.cancelled]
+            t = min((h._tick for h in self._overflow), default=None)
+            if t is not None and (best is None or t < best):
+                best = t
+        return best
+
+    def _cancel_wake(self) -> None:
+        if self._wake_job is not None:
+            try:
+                self.driver.after_cancel(self._wake_job)
+            except Exception:
+                pass
+        self._wake_job = None
+        self._wake_tick = None
+
+    def _arm(self) -> None:
+        """按最近的到期时间重挂驱动定时器"""
+        if self._in_wake:
+            return
+        nxt = self._next_tick()
+        if nxt is None:
+            self._cancel_wake()
+        elif nxt != self._wake_tick or self._wake_job is None:
+            self._arm_at(nxt)
+
+    def _arm_at(self, tick: int) -> None:
+        self._cancel_wake()
+        delay = max(0, int(math.ceil(tick * self.tick_ms - self._now_ms())))
+        self._wake_tick = tick
+        self._wake_job = self.driver.after(delay, self._on_wake)
+
+    def _on_wake(self) -> None:
+        self._wake_job = None
+        self._wake_tick = None
+        self.wakeups += 1
+        now_ms = self._now_ms()
+        due: List[TimerHandle] = []
+        self._in_wake = True
+        try:
+            self._advance(self._tick_of(now_ms), due)
+            self._take_early(now_ms, due)
+            due.sort(key=lambda h: h.deadline)
+            for h in due:
+                if h.cancelled:
+                    continue
+                if h.interval:
+                    # 周期任务按名义时间推进；错过的周期直接跳过，不集中补发
+                    h.deadline += h.interval
+                    if h.deadline <= now_ms:
+                        # 一次算出跳过的周期数（休眠后不按周期逐个累加）
+                        h.deadline += (math.floor((now_ms - h.deadline) / h.interval) + 1) * h.interval
+                    self._insert(h)
+                else:
+                    h.cancelled = True
+                    self._pending -= 1
+                self.fired += 1
+                try:
+                    h.callback()
+                except Exception as e:
+                    print(f"定时回调失败: {e}")
+        finally:
+            self._in_wake = False
+        self._arm()
@@ -0,0 +1,237 @@
+import hashlib
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+TOTAL = ""  # 所有宠物合计的序列名
+
+
+def today_ordinal(ts: Optional[float] = None) -> int:
+    """本地日期的序号（date.toordinal），作为日桶下标"""
+    return date.fromtimestamp(time.time() if ts is None else ts).toordinal()
+
+
+class _Series:
+    """一条日桶序列：从 start 日开始每天一个 uint32 秒数，并维护前缀和以便 O(1) 求任意区间之和"""
+
+    __slots__ = ("start", "days", "prefix")
+
+    def __init__(self, start: int, days: Optional[array] = None) -> None:
+        self.start = start
+        self.days = days if days is not None else array("I")
+        self.prefix = array("Q", [0])
+        total = 0
+        for v in self.days:
+            total += v
+            self.prefix.append(total)
+
+    def add(self, day: int, seconds: int) -> None:
+        if not self.days:
+            self.start = day
+        i = day - self.start
+        if i < 0:
+            # 时钟回拨到序列开始之前：计入第一天
+            i = 0
+        if i >= len(self.days):
+            # 补齐中间未使用的天数（不超过间隔天数，一年最多 366 次）
+            gap = i + 1 - len(self.days)
+            self.days.extend([0] * gap)
+            last = self.prefix[-1]
+            self.prefix.extend([last] * gap)
+        self.days[i] += seconds
+        # 只有最后一天会增长；历史日桶被修改时（时钟回拨）重建前缀和
+        if i == len(self.days) - 1:
+            self.prefix[-1] += seconds
+        else:
+            for j in range(i + 1, len(self.prefix)):
+                self.prefix[j] += seconds
+
+    def window(self, end_day: int, n_days: int) -> int:
+        """截至 end_day（含）的 n_days 天合计"""
+        lo = max(0, end_day - n_days + 1 - self.start)
+        hi = min(len(self.days), end_day + 1 - self.start)
+        if hi <= lo:
+            return 0
+        return self.prefix[hi] - self.prefix[lo]
+
+    def day(self, day: int) -> int:
+        i = day - self.start
+        return self.days[i] if 0 <= i < len(self.days) else 0
+
+
+class UsageStats:
+    """按天统计的运行时间：每个用户、每个宠物一条日桶序列（另有一条合计序列）
+    属性：
+        usage_dir: 存储目录（data/usage），每个用户一个 zlib 压缩的二进制文件
+    方法：
+        add(username, pet_name, seconds): 累计运行时间（计时器每秒调用，只改内存）
+        rolling(username, pet_name): 今天 / 近 7 天 / 近 30 天合计（O(1)，基于前缀和）
+        per_pet(username, n_days): 各宠物近 n_days 天合计
+        daily(username, n_days, pet_name): 近 n_days 天逐日数据（图表用）
+        flush(): 将有变化的用户写盘（提供 scheduler 时每分钟提交到单线程写盘线程，否则累计满一批时写）
+    文件格式：
+        b"TPUS" + 版本(1 字节) + zlib( 序列数(H) + 每条序列 [名称长度(H) 起始日(I) 天数(I) 名称 小端 uint32 日桶...] )
+        一年每条序列约 1.4 KB（未压缩），压缩后通常只有几百字节
+    """
+
+    MAGIC = b"TPUS"
+    VERSION = 1
+    FLUSH_INTERVAL_MS = 60 * 1000
+    FLUSH_SLACK_MS = 5000
+    FLUSH_EVERY_S = 60
+
+    def __init__(self, usage_dir: str, scheduler=None) -> None:
+        """scheduler：可选的 TimerWheel；提供时由时间轮每分钟把写盘提交到后台线程（不在 Tk 线程写文件），
+        否则在 add 累计满 FLUSH_EVERY_S 秒时写盘
+        """
+        self.usage_dir = usage_dir
+        self.scheduler = scheduler
+        self._lock = threading.RLock()
+        self._users: Dict[str, Dict[str, _Series]] = {}
+        self._dirty: Dict[str, int] = {}
+        self._timer = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._flush_queued = False
+        if scheduler is not None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="usage-flush")
+            self._timer = scheduler.call_every(self.FLUSH_INTERVAL_MS, self._submit_flush, slack_ms=self.FLUSH_SLACK_MS)
+
+    def _path(self, username: str) -> str:
+        name = hashlib.sha1(username.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.usage_dir, f"{name}.bin")
+
+    def _series(self, username: str) -> Dict[str, _Series]:
+        """获取用户的全部序列；首次访问时从文件加载"""
+        series = self._users.get(username)
+        if series is None:
+            series = self._load(self._path(username))
+            self._users[username] = series
+        return series
+
+    @classmethod
+    def _load(cls, path: str) -> Dict[str, _Series]:
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            if raw[:4] != cls.MAGIC or raw[4] != cls.VERSION:
+                return {}
+            body = zlib.decompress(raw[5:])
+            (count,) = struct.unpack_from("<H", body, 0)
+            pos = 2
+            series: Dict[str, _Series] = {}
+            for _ in range(count):
+                name_len, start, n_days = struct.unpack_from("<HII", body, pos)
+                pos += 10
+                name = body[pos:pos + name_len].decode("utf-8")
+                pos += name_len
+                days = array("I")
+                days.frombytes(body[pos:pos + n_days * 4])
+                pos += n_days * 4
+                if sys.byteorder == "big":
+                    days.byteswap()
+                series[name] = _Series(start, days)
+            return series
+        except Exception:
+            return {}
+
+    @classmethod
+    def _dump(cls, series: Dict[str, _Series]) -> bytes:
+        parts = [struct.pack("<H", len(series))]
+        for name, s in series.items():
+            encoded = name.encode("utf-8")
+            days = array("I", s.days)
+            if sys.byteorder == "big":
+                days.byteswap()
+            parts.append(struct.pack("<HII", len(encoded), s.start, len(days)))
+            parts.append(encoded)
+            parts.append(days.tobytes())
+        return cls.MAGIC + bytes([cls.VERSION]) + zlib.compress(b"".join(parts), 6)
+
+    def add(self, username: str, pet_name: str, seconds: int = 1, ts: Optional[float] = None) -> None:
+        """累计运行时间到当天的宠物序列与合计序列"""
+        day = today_ordinal(ts)
+        flush = False
+        with self._lock:
+            series = self._series(username)
+            for name in (pet_name, TOTAL):
+                s = series.get(name)
+                if s is None:
+                    s = series[name] = _Series(day)
+                s.add(day, int(seconds))
+            self._dirty[username] = self._dirty.get(username, 0) + int(seconds)
+            flush = self.scheduler is None and self._dirty[username] >= self.FLUSH_EVERY_S
+        if flush:
+            self._flush_quietly()
+
+    def rolling(self, username: str, pet_name: str = TOTAL, ts: Optional[float] = None) -> Dict[str, int]:
+        """今天 / 近 7 天 / 近 30 天的运行时间（秒）"""
+        day = today_ordinal(ts)
+        with self._lock:
+            s = self._series(username).get(pet_name)
+            if s is None:
+                return {"today": 0, "7d": 0, "30d": 0}
+            return {"today": s.day(day), "7d": s.window(day, 7), "30d": s.window(day, 30)}
+
+    def per_pet(self, username: str, n_days: int = 7, ts: Optional[float] = None) -> List[Tuple[str, int]]:
+        """各宠物近 n_days 天的运行时间，按时长降序"""
+        day = today_ordinal(ts)
+        with self._lock:
+            rows = [(name, s.window(day, n_days)) for name, s in self._series(username).items() if name != TOTAL]
+        return sorted(rows, key=lambda r: -r[1])
+
+    def daily(self, username: str, n_days: int = 30, pet_name: str = TOTAL, ts: Optional[float] = None) -> List[Tuple[date, int]]:
+        """近 n_days 天逐日运行时间（从早到晚）"""
+        day = today_ordinal(ts)
+        with self._lock:
+            s = self._series(username).get(pet_name)
+            return [(date.fromordinal(d), s.day(d) if s else 0) for d in range(day - n_days + 1, day + 1)]
+
+    def flush(self) -> None:
+        """将有变化的用户写盘（先写临时文件再替换）"""
+        with self._lock:
+            pending = [(u, self._dump(self._users[u])) for u in self._dirty if u in self._users]
+            self._dirty.clear()
+        if not pending:
+            return
+        os.makedirs(self.usage_dir, exist_ok=True)
+        for username, data in pending:
+            path = self._path(username)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def _flush_quietly(self) -> None:
+        self._flush_queued = False
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def _submit_flush(self) -> None:
+        """时间轮回调：有变化时把写盘提交到后台线程；上一次尚未执行时不重复提交"""
+        if not self._dirty or self._flush_queued or self._executor is None:
+            return
+        self._flush_queued = True
+        try:
+            self._executor.submit(self._flush_quietly)
+        except RuntimeError:
+            # 已停止
+            self._flush_queued = False
+
+    def stop(self) -> None:
+        """停止定时写盘，等待后台写盘完成并最后写一次"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._flush_quietly()
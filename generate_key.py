@@ -1,35 +1,212 @@
 import argparse
+import csv
+import json
 import sys
 import os
+import time
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 # 将项目根目录添加到路径以便导入 core 模块
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT_DIR)
 
 from core.license_manager import LicenseManager
 
+DEFAULT_PETS_FILE = os.path.join(ROOT_DIR, "data", "pets.json")
+CHUNK_SIZE = 20000
+
+
+def read_pairs(path: str) -> Iterator[Tuple[str, str]]:
+    """流式读取 (用户名, 宠物) 列表：.jsonl 每行 {"username", "pet"}；其余按 CSV（username,pet，可带表头）"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".jsonl"):
+            for line in f:
+                line = line.strip()
+                if line:
+                    obj = json.loads(line)
+                    yield str(obj["username"]), str(obj.get("pet", obj.get("pet_name", "")))
+            return
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].strip():
+                continue
+            if row[0].strip().lower() == "username":
+                continue
+            yield row[0], row[1]
+
+
+def read_users(path: str) -> List[str]:
+    """读取用户名列表：每行一个（CSV 取第一列，跳过 username 表头）"""
+    users: List[str] = []
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.reader(f):
+            if row and row[0].strip() and row[0].strip().lower() != "username":
+                users.append(row[0].strip())
+    return users
+
+
+def key_only_pets(pets_file: str) -> List[str]:
+    """从 pets.json 读取需要卡密解锁的宠物（unlock_type == "key"）"""
+    with open(pets_file, "r", encoding="utf-8") as f:
+        pets = json.load(f)
+    return [name for name, cfg in pets.items() if isinstance(cfg, dict) and cfg.get("unlock_type") == "key"]
+
+
+def cross_pairs(users: List[str], pets: List[str]) -> Iterator[Tuple[str, str]]:
+    for username in users:
+        for pet in pets:
+            yield username, pet
+
+
+def chunked(pairs: Iterable[Tuple[str, str]], size: int) -> Iterator[List[Tuple[str, str]]]:
+    it = iter(pairs)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _generate_chunk(chunk: List[Tuple[str, str]]) -> List[Tuple[str, str, str]]:
+    """进程池任务：为一块 (用户名, 宠物) 生成密钥"""
+    keys = LicenseManager.generate_keys(chunk)
+    return [(u.strip(), p.strip(), k) for (u, p), k in zip(chunk, keys)]
+
+
+class KeyWriter:
+    """按 CSV 或 JSONL 流式写出 (用户名, 宠物, 密钥)"""
+
+    def __init__(self, out, fmt: str) -> None:
+        self.out = out
+        self.fmt = fmt
+        if fmt == "csv":
+            self._csv = csv.writer(out)
+            self._csv.writerow(["username", "pet", "key"])
+
+    def write(self, rows: List[Tuple[str, str, str]]) -> None:
+        if self.fmt == "csv":
+            self._csv.writerows(rows)
+        else:
+            self.out.write("".join(
+                json.dumps({"username": u, "pet": p, "key": k}, ensure_ascii=False) + "\n" for u, p, k in rows
+            ))
+
+
+def run_batch(
+    pairs: Iterable[Tuple[str, str]],
+    out,
+    fmt: str,
+    workers: int,
+    chunk_size: int = CHUNK_SIZE,
+    total: Optional[int] = None,
+) -> int:
+    """分块生成并按输入顺序写出，进度输出到 stderr；返回生成的密钥数"""
+    chunks = chunked(pairs, chunk_size)
+    writer = KeyWriter(out, fmt)
+    done = 0
+    t0 = time.perf_counter()
+    # 从开始计时，0.5 秒内完成的小批量只输出最终进度一次
+    last_report = t0
+
+    def report(final: bool = False) -> None:
+        nonlocal last_report
+        now = time.perf_counter()
+        if not final and now - last_report < 0.5:
+            return
+        last_report = now
+        rate = done / max(now - t0, 1e-9)
+        progress = f"{done}/{total} ({done * 100 // max(total, 1)}%)" if total else str(done)
+        sys.stderr.write(f"\r已生成 {progress}，{rate:,.0f} 个/秒" + ("\n" if final else ""))
+        sys.stderr.flush()
+
+    if workers <= 1:
+        results = map(_generate_chunk, chunks)
+        pool = None
+    else:
+        from multiprocessing import Pool
+        pool = Pool(workers)
+        results = pool.imap(_generate_chunk, chunks)
+    try:
+        for rows in results:
+            writer.write(rows)
+            done += len(rows)
+            report()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    report(final=True)
+    return done
+
+
+def batch_main(args: argparse.Namespace) -> None:
+    """批量模式：从 (用户名, 宠物) 列表或 用户 × 卡密宠物 的组合生成密钥"""
+    if args.pairs:
+        pairs: Iterable[Tuple[str, str]] = read_pairs(args.pairs)
+        total = None
+    else:
+        users = read_users(args.users)
+        pets = args.pets or key_only_pets(args.pets_file)
+        if not users or not pets:
+            print("错误: 用户列表或宠物列表为空", file=sys.stderr)
+            sys.exit(1)
+        pairs = cross_pairs(users, pets)
+        total = len(users) * len(pets)
+    fmt = args.format or ("jsonl" if args.out.lower().endswith(".jsonl") else "csv")
+    workers = args.workers if args.workers is not None else (os.cpu_count() or 1)
+    if args.out == "-":
+        count = run_batch(pairs, sys.stdout, fmt, workers, args.chunk, total)
+    else:
+        tmp = args.out + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8", newline="") as f:
+                count = run_batch(pairs, f, fmt, workers, args.chunk, total)
+            os.replace(tmp, args.out)
+        finally:
+            # 输入格式错误等中途失败时不留下临时文件
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    print(f"共生成 {count} 个密钥 -> {args.out}", file=sys.stderr)
+
+
 def main():
     parser = argparse.ArgumentParser(description="生成桌宠激活密钥 (License Key Generator)")
     parser.add_argument("username", nargs="?", help="目标用户的用户名")
     parser.add_argument("pet_name", nargs="?", help="要解锁的宠物名称 (例如: 黄金像素龙)")
-    
+    batch = parser.add_argument_group("批量模式（指定 --pairs 或 --users 时启用）")
+    batch.add_argument("--pairs", help="(用户名, 宠物) 列表文件：CSV（username,pet）或 JSONL（{\"username\", \"pet\"}）")
+    batch.add_argument("--users", help="用户名列表文件（每行一个），与宠物列表做组合")
+    batch.add_argument("--pets", nargs="*", help="与 --users 组合的宠物名称（默认 pets.json 中所有卡密解锁的宠物）")
+    batch.add_argument("--pets-file", default=DEFAULT_PETS_FILE, help="宠物配置文件（默认 data/pets.json）")
+    batch.add_argument("--out", default="-", help="输出文件（默认 - 即标准输出）")
+    batch.add_argument("--format", choices=["csv", "jsonl"], help="输出格式（默认按 --out 扩展名，否则 csv）")
+    batch.add_argument("--workers", type=int, help="进程数（默认 CPU 核数，1 为单进程）")
+    batch.add_argument("--chunk", type=int, default=CHUNK_SIZE, help=f"每个任务的密钥数（默认 {CHUNK_SIZE}）")
+
     args = parser.parse_args()
-    
+
+    if args.pairs or args.users:
+        if args.pairs and args.users:
+            parser.error("--pairs 与 --users 只能指定一个")
+        batch_main(args)
+        return
+
     # 如果未提供命令行参数，则进入交互模式
     if not args.username:
         print("进入交互模式 (Ctrl+C 退出)")
         args.username = input("请输入用户名: ").strip()
-        
+
     if not args.username:
         print("错误: 用户名不能为空")
         return
 
     if not args.pet_name:
         args.pet_name = input("请输入宠物名称 (例如: 黄金像素龙): ").strip()
-        
+
     if not args.pet_name:
         print("错误: 宠物名称不能为空")
         return
-    
+
     key = LicenseManager.generate_key(args.username, args.pet_name)
     print("\n" + "="*40)
     print(f" 用户: {args.username}")
@@ -1,9 +1,19 @@
+import os
 import tkinter as tk
-from typing import Dict
+from tkinter import messagebox
+from typing import Dict, List
 
 from core.data_manager import DataManager
+from core.auto_backup import AutoBackup
 from core.account import AccountManager
+from core.key_index import KeyIndex
 from core.runtime_tracker import RuntimeTracker
+from core.usage_stats import UsageStats
+from core.thumbnail_service import ThumbnailService
+from core.asset_watcher import AssetWatcher, norm_asset_path
+from core.frame_cache import FrameCache, shared_frame_cache
+from core.clock import TkClock
+from core.timer_wheel import TimerWheel
 
 from ui.login_view import LoginView
 from ui.register_view import RegisterView
@@ -13,21 +23,40 @@ from ui.mall_view import MallView
 from ui.inventory_view import InventoryView
 from ui.settings_view import SettingsView
 from ui.account_view import AccountView
+from ui.stats_view import StatsView
 from ui.update_view import UpdateView
 
 
 class AppController:
     """应用控制器：持有路由、共享服务与当前用户，负责页面切换"""
 
-    def __init__(self) -> None:
+    def __init__(self, data_dir: str = "data") -> None:
         self.root = tk.Tk()
         self.root.title("Desktop Pixel Pet By CanFlyhang")
         self.root.geometry("800x600")
         self.root.configure(bg="#222")
+        # 统一定时器：悬浮窗动画 / 问候、计时、落盘、热加载轮询共用一个 Tk after
+        self.timers = TimerWheel(TkClock(self.root))
         # 核心服务
-        self.dm = DataManager()
+        self.dm = DataManager(data_dir, scheduler=self.timers)
         self.am = AccountManager(self.dm)
-        self.tracker = RuntimeTracker(self.dm)
+        # 卡密反查索引：兑换时只凭用户名与密钥找到宠物（目录重载时自动失效）
+        self.key_index = KeyIndex(self.dm)
+        # 按天统计运行时间（每分钟写盘一次）
+        self.usage = UsageStats(os.path.join(self.dm.data_dir, "usage"), scheduler=self.timers)
+        self.tracker = RuntimeTracker(self.dm, scheduler=self.timers, usage=self.usage)
+        # 后台自动备份：定期轮转保存 users 的加密压缩备份（users.json 损坏时启动自动恢复）
+        self.auto_backup = AutoBackup(self.dm, scheduler=self.timers)
+        self.auto_backup.start()
+        self.thumbs = ThumbnailService(cache_dir=f"{self.dm.data_dir}/thumbs")
+        self.thumbs.bind_tk(self.timers)
+        # 资源热加载：资源目录与目录配置变化时无需重启
+        self.watcher = AssetWatcher()
+        self.watcher.watch_dir(os.path.join("assets", "pets"))
+        self.watcher.watch_file(self.dm.pets_path)
+        self.watcher.watch_file(self.dm.foods_path)
+        self.watcher.subscribe(self._on_assets_changed)
+        self.watcher.bind_tk(self.timers)
         # 状态
         self.current_user: str = ""
         self.float_window = None
@@ -40,6 +69,11 @@ class AppController:
         self._init_views()
         self.show("login")
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        if self.dm.recovered_from:
+            messagebox.showwarning(
+                "数据已恢复",
+                f"用户数据文件损坏，已从自动备份恢复：\n{os.path.basename(self.dm.recovered_from)}\n损坏的文件已另存为 users.json.corrupt-*",
+            )
 
     def _init_views(self) -> None:
         """创建并注册所有页面视图"""
@@ -51,6 +85,7 @@ class AppController:
         self.views["inventory"] = InventoryView(self.container, self, self.dm)
         self.views["settings"] = SettingsView(self.container, self, self.dm)
         self.views["account"] = AccountView(self.container, self, self.dm)
+        self.views["stats"] = StatsView(self.container, self, self.dm, self.usage)
         self.views["update"] = UpdateView(self.container, self, self.dm, self.am)
         for v in self.views.values():
             v.place(relx=0, rely=0, relwidth=1, relheight=1)
@@ -96,9 +131,32 @@ class AppController:
 
     def apply_settings(self, settings: Dict) -> None:
         """应用全局配置"""
+        try:
+            budget_mb = float(settings.get("frame_cache_mb", FrameCache.DEFAULT_BUDGET / 1024 / 1024))
+            shared_frame_cache.set_budget(int(budget_mb * 1024 * 1024))
+        except (TypeError, ValueError):
+            pass
         if self.float_window:
             self.float_window.update_settings(settings)
 
+    def _on_assets_changed(self, paths: List[str]) -> None:
+        """资源热加载：目录配置变化时刷新当前页面，宠物资源变化时只重新解码对应资源"""
+        catalogs = {norm_asset_path(self.dm.pets_path), norm_asset_path(self.dm.foods_path)}
+        if catalogs.intersection(paths) and self.dm.reload_catalogs():
+            view = self.views.get(self.current_view_name)
+            if view is not None and hasattr(view, "on_catalog_changed"):
+                try:
+                    view.on_catalog_changed()
+                except Exception:
+                    pass
+        for path in paths:
+            if path in catalogs:
+                continue
+            self.thumbs.refresh(path)
+            fw = self.float_window
+            if fw is not None and norm_asset_path(fw.frames_path) == path:
+                fw.reload_frames()
+
     def logout(self) -> None:
         """退出登录：清理悬浮窗与用户状态"""
         # 1. 关闭悬浮窗
@@ -125,10 +183,27 @@ class AppController:
             self.tracker.stop()
         except Exception:
             pass
+        try:
+            self.usage.stop()
+        except Exception:
+            pass
+        try:
+            self.auto_backup.stop()
+        except Exception:
+            pass
         try:
             self.dm.stop()
         except Exception:
             pass
+        try:
+            self.thumbs.shutdown()
+        except Exception:
+            pass
+        try:
+            self.watcher.stop()
+        except Exception:
+            pass
+        self.timers.close()
         self.root.destroy()
 
 
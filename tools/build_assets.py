@@ -0,0 +1,319 @@
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+# 将项目根目录添加到路径以便导入 core 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BUILDER_VERSION = 1
+SRC_DIR = os.path.join("assets", "src", "pets")
+MANIFEST_PATH = os.path.join("assets", "src", ".build_manifest.json")
+PETS_CFG_PATH = os.path.join("data", "pets.json")
+THUMB_DIR = os.path.join("data", "thumbs")
+STORE_DIR = os.path.join("assets", "store")
+# 进程池启动的估计开销（秒，按 Windows spawn 方式估计）：先串行执行少量任务并计时，
+# 其余任务的预计串行耗时超过该值时才使用进程池，否则启动开销会超过任务本身
+POOL_STARTUP_S = 0.2
+PROBE_JOBS = 2
+
+
+def run_jobs(fn, items: List[Any], options: Dict[str, Any], jobs: int) -> Tuple[List[Any], str]:
+    """执行 fn(item, options)：按实测单个耗时选择串行或进程池，返回 (按输入顺序的结果, 执行方式说明)
+    前 PROBE_JOBS 个任务在主进程串行执行并计时（第一个含导入等一次性开销，取最小值作为估计）
+    """
+    results: List[Any] = []
+    per_job = 0.0
+    for i, item in enumerate(items[:PROBE_JOBS]):
+        t = time.perf_counter()
+        results.append(fn(item, options))
+        elapsed = time.perf_counter() - t
+        per_job = elapsed if i == 0 else min(per_job, elapsed)
+    rest = items[PROBE_JOBS:]
+    jobs = max(1, min(jobs, len(rest)))
+    if jobs > 1 and per_job * len(rest) > POOL_STARTUP_S:
+        mode = f"{jobs} processes"
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunk = max(1, len(rest) // (jobs * 4))
+            results += list(pool.map(fn, rest, [options] * len(rest), chunksize=chunk))
+    else:
+        mode = "serial"
+        results += [fn(item, options) for item in rest]
+    return results, f"{mode}, {per_job * 1000:.1f} ms/job measured"
+
+
+def grid_to_pixels(grid: List[str], char_map: Dict[str, str], width: int = 32, height: int = 32) -> List[List[str]]:
+    """
+    将 ASCII 网格转换为像素名称矩阵
+    - 每行水平居中、整体垂直居中填充到 width x height
+    - 网格字符由 char_map 映射到调色板键名，未知字符视为 bg
+    """
+    lines = [line for line in grid if line][:height]
+    top_pad = (height - len(lines)) // 2
+    out = [["bg"] * width for _ in range(top_pad)]
+    for line in lines:
+        left_pad = (width - len(line)) // 2
+        row = ["bg"] * left_pad + [char_map.get(ch, "bg") for ch in line]
+        row.extend(["bg"] * (width - len(row)))
+        out.append(row[:width])
+    while len(out) < height:
+        out.append(["bg"] * width)
+    return out
+
+
+def make_asset(defn: Dict[str, Any]) -> Dict[str, Any]:
+    """根据宠物定义生成 AssetsLoader 可读取的资源结构（调色板名称矩阵）"""
+    w, h = (int(v) for v in defn.get("size", [32, 32]))
+    char_map = defn.get("char_map", {" ": "bg"})
+    return {
+        "size": [w, h],
+        "palette": defn["palette"],
+        "frames": [
+            {"name": fr["name"], "pixels": grid_to_pixels(fr.get("grid", []), char_map, w, h)}
+            for fr in defn.get("frames", [])
+        ],
+    }
+
+
+def compile_indexed(asset: Dict[str, Any]) -> Dict[str, Any]:
+    """转换为编译格式：调色板列表 + 每帧 base64 编码的下标字节（加载时无需逐像素查名称）"""
+    names = list(asset["palette"].keys())
+    if "bg" in names:
+        # 保证透明色为 0 号下标
+        names.remove("bg")
+        names.insert(0, "bg")
+    index = {name: i for i, name in enumerate(names)}
+    frames = []
+    for fr in asset["frames"]:
+        raw = bytes(index.get(name, 0) for row in fr["pixels"] for name in row)
+        frames.append({"name": fr["name"], "data": base64.b64encode(raw).decode("ascii")})
+    return {
+        "encoding": "indexed",
+        "size": asset["size"],
+        "palette": [[name, asset["palette"][name]] for name in names],
+        "frames": frames,
+    }
+
+
+def write_json_atomic(path: str, data: Any, compact: bool = True) -> bytes:
+    """原子写入 JSON（临时文件 + os.replace），返回写入的字节"""
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    payload = text.encode("utf-8")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return payload
+
+
+def input_hash(src_bytes: bytes, options: Dict[str, Any]) -> str:
+    """定义文件内容 + 构建器版本 + 构建选项的哈希，任一变化都会触发重建"""
+    h = hashlib.sha256(src_bytes)
+    h.update(json.dumps({"v": BUILDER_VERSION, **options}, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def write_thumbs(output: str, digest: str, options: Dict[str, Any]) -> List[str]:
+    """按构建选项预生成缩略图缓存（文件名与 ThumbnailService 一致），返回生成的路径"""
+    scales = options.get("thumbs") or []
+    if not scales:
+        return []
+    from core.thumbnail_service import ThumbnailService
+
+    thumb_dir = options.get("thumb_dir", THUMB_DIR)
+    os.makedirs(thumb_dir, exist_ok=True)
+    thumbs = []
+    for scale in scales:
+        path = os.path.join(thumb_dir, ThumbnailService.cache_file_name(digest, scale))
+        ThumbnailService.render(output, scale).save(path, format="PNG")
+        thumbs.append(path)
+    return thumbs
+
+
+def build_one(src_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """构建单个宠物定义（在进程池中执行），返回输出路径、内容哈希与耗时"""
+    t0 = time.perf_counter()
+    with open(src_path, "r", encoding="utf-8") as f:
+        defn = json.load(f)
+    asset = make_asset(defn)
+    if options.get("compiled"):
+        asset = compile_indexed(asset)
+    output = defn["output"]
+    payload = write_json_atomic(output, asset)
+    digest = hashlib.sha1(payload).hexdigest()
+    # 打包进资源库时文件内容会改变，缩略图在打包后由主进程生成
+    thumbs = [] if options.get("cas") else write_thumbs(output, digest, options)
+    return {
+        "slug": defn.get("slug", ""),
+        "output": output,
+        "output_hash": digest,
+        "thumbs": thumbs,
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def catalog_entry(defn: Dict[str, Any]) -> Dict[str, Any]:
+    """由定义生成 data/pets.json 中的目录条目"""
+    w, h = (int(v) for v in defn.get("size", [32, 32]))
+    entry = {
+        "price": int(defn.get("price", 0)),
+        "description": defn.get("description", ""),
+        "pixel_size": f"{w}x{h}",
+        "frames": defn["output"],
+    }
+    if defn.get("unlock_type"):
+        entry["unlock_type"] = defn["unlock_type"]
+    return entry
+
+
+def upsert_catalog(pets_cfg_path: str, entries: Dict[str, Dict[str, Any]]) -> bool:
+    """
+    合并目录条目并原子写入 data/pets.json；无变化时不写盘，返回是否写入
+    - 保留条目中定义未涉及的字段
+    - frames 路径与现有值等价（仅分隔符不同）时沿用现有写法
+    """
+    try:
+        with open(pets_cfg_path, "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+    except (OSError, ValueError):
+        cfg = {}
+    merged = dict(cfg)
+    for name, entry in entries.items():
+        cur = dict(merged.get(name, {}))
+        old_frames = str(cur.get("frames", ""))
+        cur.update(entry)
+        if old_frames.replace("\\", "/") == entry["frames"].replace("\\", "/"):
+            cur["frames"] = old_frames
+        if not entry.get("unlock_type"):
+            cur.pop("unlock_type", None)
+        merged[name] = cur
+    if merged == cfg:
+        return False
+    write_json_atomic(pets_cfg_path, merged, compact=False)
+    return True
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def file_sha1(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def plan_builds(
+    src_dir: str, manifest: Dict[str, Any], options: Dict[str, Any], force: bool, only: Optional[List[str]]
+) -> Tuple[List[Tuple[str, str, Dict[str, Any]]], Dict[str, Dict[str, Any]]]:
+    """扫描定义目录，返回 (待构建列表, 全部目录条目)；输入哈希与输出均未变化的定义被跳过"""
+    todo: List[Tuple[str, str, Dict[str, Any]]] = []
+    entries: Dict[str, Dict[str, Any]] = {}
+    for fn in sorted(os.listdir(src_dir)):
+        if not fn.endswith(".json"):
+            continue
+        src_path = os.path.join(src_dir, fn)
+        with open(src_path, "rb") as f:
+            src_bytes = f.read()
+        defn = json.loads(src_bytes.decode("utf-8"))
+        entries[defn["name"]] = catalog_entry(defn)
+        slug = defn.get("slug") or fn[:-len(".json")]
+        if only and slug not in only:
+            continue
+        h = input_hash(src_bytes, options)
+        prev = manifest.get(slug, {})
+        up_to_date = (
+            not force
+            and prev.get("input_hash") == h
+            and file_sha1(defn["output"]) == prev.get("output_hash")
+            and all(os.path.exists(p) for p in prev.get("thumbs", []))
+        )
+        if not up_to_date:
+            todo.append((slug, src_path, {"input_hash": h}))
+    return todo, entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="批量构建像素宠物资源（增量 + 并行）")
+    parser.add_argument("--src", default=SRC_DIR, help="宠物定义目录（默认 assets/src/pets）")
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="构建清单路径")
+    parser.add_argument("--catalog", default=PETS_CFG_PATH, help="目录配置 data/pets.json 路径")
+    parser.add_argument("--no-catalog", action="store_true", help="不更新目录配置")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="并行进程数")
+    parser.add_argument("--force", action="store_true", help="忽略清单，全部重建")
+    parser.add_argument("--only", nargs="*", help="仅构建指定 slug")
+    parser.add_argument("--compiled", action="store_true", help="输出编译格式（调色板下标 + base64）")
+    parser.add_argument("--thumbs", default="", help="同时生成缩略图缓存的缩放倍数，逗号分隔，例如 3,4")
+    parser.add_argument("--thumb-dir", default=THUMB_DIR, help="缩略图缓存目录（默认 data/thumbs）")
+    parser.add_argument("--cas", action="store_true", help="输出打包进内容寻址资源库（帧/调色板去重）")
+    parser.add_argument("--store", default=STORE_DIR, help="资源库目录（默认 assets/store，配合 --cas）")
+    args = parser.parse_args()
+
+    options: Dict[str, Any] = {
+        "compiled": bool(args.compiled),
+        "thumbs": [float(x) for x in args.thumbs.split(",") if x.strip()],
+    }
+    if args.cas:
+        options["cas"] = True
+    if options["thumbs"]:
+        options["thumb_dir"] = args.thumb_dir
+
+    t_start = time.perf_counter()
+    manifest = load_manifest(args.manifest)
+    todo, entries = plan_builds(args.src, manifest, options, args.force, args.only)
+    total_defs = len(entries)
+
+    results: List[Dict[str, Any]] = []
+    mode = "serial"
+    if todo:
+        results, mode = run_jobs(build_one, [src_path for _, src_path, _ in todo], options, args.jobs)
+        if args.cas:
+            from tools.pack_assets import pack_files
+
+            # 资源库写入需串行：构建完成后在主进程统一打包
+            pack_files([res["output"] for res in results], args.store)
+            for res in results:
+                res["output_hash"] = file_sha1(res["output"])
+                res["thumbs"] = write_thumbs(res["output"], res["output_hash"], options)
+        for (slug, _, meta), res in zip(todo, results):
+            manifest[slug] = {
+                "input_hash": meta["input_hash"],
+                "output_hash": res["output_hash"],
+                "thumbs": res["thumbs"],
+            }
+            print(f"Built {res['output']} ({res['seconds'] * 1000:.1f} ms)")
+        write_json_atomic(args.manifest, manifest, compact=False)
+
+    catalog_changed = False
+    if not args.no_catalog:
+        catalog_changed = upsert_catalog(args.catalog, entries)
+        if catalog_changed:
+            print(f"Updated {args.catalog}")
+
+    wall = time.perf_counter() - t_start
+    cpu = sum(r["seconds"] for r in results)
+    print(
+        f"{len(results)} built, {total_defs - len(results)} up to date; "
+        f"wall {wall * 1000:.1f} ms, build time {cpu * 1000:.1f} ms ({mode})"
+        + (", catalog updated" if catalog_changed else "")
+    )
+
+
+if __name__ == "__main__":
+    main()
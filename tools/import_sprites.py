@@ -0,0 +1,230 @@
+import argparse
+import base64
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# 将项目根目录添加到路径以便导入 core / tools 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None
+
+from PIL import Image
+
+from tools.build_assets import run_jobs, write_json_atomic
+
+OUT_DIR = os.path.join("assets", "pets")
+DEFAULT_CLIPS = ("idle", "walk", "sleep", "eat", "play")
+MAX_PALETTE = 256  # 调色板下标以单字节存储（含 0 号透明色）
+NEAREST_CHUNK = 4096  # 最近色匹配时每批处理的颜色数，限制距离矩阵的内存占用
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    """解析 "32x32" 或 "32" 形式的帧尺寸"""
+    parts = text.lower().replace("*", "x").split("x")
+    w = int(parts[0])
+    h = int(parts[1]) if len(parts) > 1 and parts[1] else w
+    if w <= 0 or h <= 0:
+        raise ValueError(f"无效的帧尺寸：{text}")
+    return w, h
+
+
+def load_rgba(path: str) -> "np.ndarray":
+    """读取图片为 (H, W, 4) 的 uint8 数组"""
+    with Image.open(path) as img:
+        return np.asarray(img.convert("RGBA"), dtype=np.uint8).copy()
+
+
+def split_sheet(
+    img: "np.ndarray",
+    frame_w: int,
+    frame_h: int,
+    clips: Optional[List[str]] = None,
+    alpha_threshold: int = 128,
+) -> Tuple[List[str], "np.ndarray"]:
+    """
+    按帧尺寸切分精灵表：每一行为一个动作片段，帧名为 <片段名><序号>（如 idle1）
+    - 行尾的空白帧（全透明）被丢弃，整行空白的片段被跳过
+    - 返回 (帧名列表, 形状为 (N, frame_h, frame_w, 4) 的帧数组)
+    """
+    h, w = img.shape[:2]
+    if h % frame_h or w % frame_w:
+        raise ValueError(f"图片尺寸 {w}x{h} 不是帧尺寸 {frame_w}x{frame_h} 的整数倍")
+    rows, cols = h // frame_h, w // frame_w
+    # (rows, frame_h, cols, frame_w, 4) -> (rows, cols, frame_h, frame_w, 4)
+    grid = img.reshape(rows, frame_h, cols, frame_w, 4).transpose(0, 2, 1, 3, 4)
+    filled = (grid[..., 3] >= alpha_threshold).any(axis=(2, 3))  # (rows, cols)
+    names: List[str] = []
+    picked: List["np.ndarray"] = []
+    for r in range(rows):
+        used = np.flatnonzero(filled[r])
+        if used.size == 0:
+            continue
+        if clips and r < len(clips):
+            clip = clips[r]
+        elif r < len(DEFAULT_CLIPS):
+            clip = DEFAULT_CLIPS[r]
+        else:
+            clip = f"clip{r + 1}"
+        count = int(used[-1]) + 1
+        names.extend(f"{clip}{i + 1}" for i in range(count))
+        picked.append(grid[r, :count])
+    if not picked:
+        return [], np.zeros((0, frame_h, frame_w, 4), dtype=np.uint8)
+    return names, np.concatenate(picked, axis=0)
+
+
+def quantize(
+    frames: "np.ndarray", max_colors: int = 16, alpha_threshold: int = 128
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    将帧数组量化到共享调色板，返回 (调色板 (K, 4), 下标数组 (N, H, W) uint8)
+    - 0 号下标固定为透明色；alpha 低于阈值的像素视为透明
+    - 颜色数不超过上限时无损保留；否则保留出现次数最多的颜色，其余映射到 RGBA 距离最近者
+    """
+    max_colors = max(2, min(int(max_colors), MAX_PALETTE))
+    flat = np.ascontiguousarray(frames).reshape(-1, 4)
+    opaque = flat[:, 3] >= alpha_threshold
+    packed = flat.view(np.uint32).reshape(-1)
+    indices = np.zeros(packed.shape[0], dtype=np.uint8)
+    if not opaque.any():
+        return np.zeros((1, 4), dtype=np.uint8), indices.reshape(frames.shape[:3])
+
+    colors, inverse, counts = np.unique(packed[opaque], return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    rgba = colors.view(np.uint8).reshape(-1, 4)
+    if colors.shape[0] <= max_colors - 1:
+        palette = rgba
+        mapping = np.arange(colors.shape[0])
+    else:
+        keep = np.argsort(-counts, kind="stable")[: max_colors - 1]
+        palette = rgba[keep]
+        pal = palette.astype(np.int32)
+        mapping = np.empty(colors.shape[0], dtype=np.int64)
+        for start in range(0, colors.shape[0], NEAREST_CHUNK):
+            block = rgba[start:start + NEAREST_CHUNK].astype(np.int32)
+            dist = ((block[:, None, :] - pal[None, :, :]) ** 2).sum(axis=2)
+            mapping[start:start + NEAREST_CHUNK] = dist.argmin(axis=1)
+    indices[opaque] = (mapping[inverse] + 1).astype(np.uint8)
+    palette = np.vstack([np.zeros((1, 4), dtype=np.uint8), palette])
+    return palette, indices.reshape(frames.shape[:3])
+
+
+def to_asset(
+    names: List[str], palette: "np.ndarray", indices: "np.ndarray", compiled: bool = False
+) -> Dict[str, Any]:
+    """生成 AssetsLoader 可读取的资源结构；compiled=True 时输出编译格式（调色板下标 + base64）"""
+    n, h, w = indices.shape
+    color_names = ["bg"] + [f"c{i}" for i in range(1, palette.shape[0])]
+    colors = [[int(c) for c in px] for px in palette]
+    if compiled:
+        return {
+            "encoding": "indexed",
+            "size": [w, h],
+            "palette": [[name, rgba] for name, rgba in zip(color_names, colors)],
+            "frames": [
+                {"name": name, "data": base64.b64encode(indices[i].tobytes()).decode("ascii")}
+                for i, name in enumerate(names)
+            ],
+        }
+    lookup = np.array(color_names, dtype=object)
+    return {
+        "size": [w, h],
+        "palette": dict(zip(color_names, colors)),
+        "frames": [{"name": name, "pixels": lookup[indices[i]].tolist()} for i, name in enumerate(names)],
+    }
+
+
+def import_one(src_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """导入单个 PNG / 精灵表并写出资源 JSON（在进程池中执行）"""
+    t0 = time.perf_counter()
+    threshold = int(options.get("alpha_threshold", 128))
+    img = load_rgba(src_path)
+    frame_w, frame_h = options.get("frame_size") or (img.shape[1], img.shape[0])
+    names, frames = split_sheet(img, frame_w, frame_h, options.get("clips"), threshold)
+    if not names:
+        raise ValueError("未找到非空帧")
+    palette, indices = quantize(frames, options.get("max_colors", 16), threshold)
+    asset = to_asset(names, palette, indices, bool(options.get("compiled")))
+    stem = os.path.splitext(os.path.basename(src_path))[0]
+    output = os.path.join(options.get("out_dir", OUT_DIR), f"{stem}.json")
+    write_json_atomic(output, asset)
+    return {
+        "output": output,
+        "frames": len(names),
+        "colors": int(palette.shape[0]) - 1,
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def _import_safe(src_path: str, options: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]], str]:
+    """进程池任务包装：单个文件失败不影响其余文件"""
+    try:
+        return src_path, import_one(src_path, options), ""
+    except Exception as e:
+        return src_path, None, str(e)
+
+
+def collect_inputs(paths: List[str]) -> List[str]:
+    """展开输入路径：目录下的 *.png（按名称排序）与单个文件"""
+    files: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(os.path.join(p, fn) for fn in sorted(os.listdir(p)) if fn.lower().endswith(".png"))
+        else:
+            files.append(p)
+    return files
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="导入 PNG 精灵 / 精灵表并量化为像素宠物资源")
+    parser.add_argument("inputs", nargs="+", help="PNG 文件或包含 PNG 的目录")
+    parser.add_argument("-o", "--out", default=OUT_DIR, help="输出目录（默认 assets/pets）")
+    parser.add_argument("--frame-size", default="32x32", help="单帧尺寸，例如 32x32；设为 0 表示整张图片为一帧")
+    parser.add_argument("--max-colors", type=int, default=16, help="调色板颜色上限（含透明色，最多 256）")
+    parser.add_argument("--alpha-threshold", type=int, default=128, help="alpha 低于该值的像素视为透明")
+    parser.add_argument("--clips", default="", help="按行命名动作片段，逗号分隔，例如 idle,walk,sleep")
+    parser.add_argument("--compiled", action="store_true", help="输出编译格式（调色板下标 + base64）")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="并行进程数")
+    args = parser.parse_args()
+
+    if np is None:
+        raise SystemExit("未检测到 numpy，请先安装：pip install numpy")
+
+    options: Dict[str, Any] = {
+        "out_dir": args.out,
+        "frame_size": None if args.frame_size.strip() in ("", "0") else parse_size(args.frame_size),
+        "max_colors": args.max_colors,
+        "alpha_threshold": args.alpha_threshold,
+        "clips": [c.strip() for c in args.clips.split(",") if c.strip()],
+        "compiled": bool(args.compiled),
+    }
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("未找到 PNG 文件")
+        return
+
+    t_start = time.perf_counter()
+    results, mode = run_jobs(_import_safe, files, options, args.jobs)
+
+    failed = 0
+    total_frames = 0
+    for src_path, res, err in results:
+        if res is None:
+            failed += 1
+            print(f"Failed {src_path}: {err}")
+            continue
+        total_frames += res["frames"]
+        print(f"Imported {src_path} -> {res['output']} ({res['frames']} frames, {res['colors']} colors)")
+    wall = time.perf_counter() - t_start
+    print(f"{len(results) - failed} imported, {failed} failed, {total_frames} frames; wall {wall * 1000:.1f} ms ({mode})")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+# 将项目根目录添加到路径以便导入 core / tools 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.asset_store import AssetStore
+from core.assets_loader import AssetsLoader
+from tools.build_assets import write_json_atomic
+
+ASSETS_DIR = os.path.join("assets", "pets")
+STORE_DIR = os.path.join("assets", "store")
+
+
+def store_ref(asset_path: str, store_root: str) -> str:
+    """资源文件中记录的 store 路径（相对资源文件目录，统一使用 /）"""
+    rel = os.path.relpath(os.path.abspath(store_root), os.path.dirname(os.path.abspath(asset_path)))
+    return rel.replace(os.sep, "/")
+
+
+def pack_file(path: str, store: AssetStore, loader: AssetsLoader) -> Tuple[Dict[str, Any], bool]:
+    """将单个资源（名称矩阵 / 编译格式）写入资源库，返回 (引用结构, 是否需要改写资源文件)"""
+    with open(path, "r", encoding="utf-8") as f:
+        obj = json.load(f)
+    if obj.get("format") == "cas":
+        return obj, False
+    w, h, frames = loader.load_frames(path)
+    names = [fr.get("name") or f"frame{i + 1}" for i, fr in enumerate(obj.get("frames", []))]
+    names += [f"frame{i + 1}" for i in range(len(names), len(frames))]
+    manifest = store.add_frames(w, h, zip(names, frames))
+    manifest["store"] = store_ref(path, store.root)
+    return manifest, True
+
+
+def collect_assets(paths: List[str]) -> List[str]:
+    files: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(os.path.join(p, fn) for fn in sorted(os.listdir(p)) if fn.endswith(".json"))
+        else:
+            files.append(p)
+    return files
+
+
+def pack_files(paths: List[str], store_root: str = STORE_DIR, prune: bool = False) -> Dict[str, Any]:
+    """
+    批量打包资源文件并保存资源库，返回统计信息
+    - prune=True 时删除未被本次资源文件引用的对象（应传入全部资源文件）
+    """
+    store = AssetStore.open(store_root)
+    loader = AssetsLoader(require_pygame=False)
+    used_palettes: Set[str] = set()
+    used_frames: Set[str] = set()
+    packed = 0
+    rewrites: List[Tuple[str, Dict[str, Any]]] = []
+    for path in paths:
+        manifest, rewrite = pack_file(path, store, loader)
+        if manifest.get("format") == "cas":
+            used_palettes.add(manifest.get("palette", ""))
+            used_frames.update(fr.get("ref", "") for fr in manifest.get("frames", []))
+            packed += 1
+        if rewrite:
+            rewrites.append((path, manifest))
+    removed = store.prune(used_palettes, used_frames) if prune else 0
+    # 先保存资源库再改写资源文件，热加载读到新引用时对象必然已存在
+    store.save()
+    for path, manifest in rewrites:
+        write_json_atomic(path, manifest)
+    return {"packed": packed, "removed": removed, **store.stats()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="将宠物资源打包进内容寻址资源库（帧/调色板去重 + 差分帧）")
+    parser.add_argument("inputs", nargs="*", default=[ASSETS_DIR], help="资源文件或目录（默认 assets/pets）")
+    parser.add_argument("--store", default=STORE_DIR, help="资源库目录（默认 assets/store）")
+    parser.add_argument("--prune", action="store_true", help="删除未被引用的对象")
+    args = parser.parse_args()
+
+    files = collect_assets(args.inputs)
+    before = sum(os.path.getsize(p) for p in files)
+    t0 = time.perf_counter()
+    stats = pack_files(files, args.store, prune=args.prune)
+    pack_path = os.path.join(args.store, AssetStore.PACK_NAME)
+    after = sum(os.path.getsize(p) for p in files) + (os.path.getsize(pack_path) if os.path.exists(pack_path) else 0)
+    print(
+        f"{stats['packed']} assets -> {stats['palettes']} palettes, {stats['keyframes']} keyframes, "
+        f"{stats['deltas']} delta frames ({stats['removed']} pruned)"
+    )
+    print(f"size {before / 1024:.1f} KiB -> {after / 1024:.1f} KiB; {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
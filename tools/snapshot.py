@@ -0,0 +1,120 @@
+import argparse
+import os
+import sys
+import time
+
+# 将项目根目录添加到路径以便导入 core 模块
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.snapshot_repo import SnapshotRepo
+
+REPO_DIR = "snapshots"
+DATA_DIR = "data"
+ASSETS_DIR = "assets"
+
+
+def fmt_bytes(n: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024:
+            return f"{n:.1f} {unit}" if unit != "B" else f"{int(n)} B"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def cmd_create(repo: SnapshotRepo, args: argparse.Namespace) -> None:
+    sources = [args.data] + ([ASSETS_DIR] if args.assets else []) + list(args.extra)
+    info = repo.create(sources, base_dir=args.base, label=args.label)
+    st = info["stats"]
+    print(
+        f"snapshot {info['id']}: {st['files']} files ({fmt_bytes(st['bytes'])}), "
+        f"{st['reused_files']} unchanged, {st['new_chunks']}/{st['chunks']} new chunks in changed files"
+    )
+    print(f"added {fmt_bytes(st['new_bytes'] + st['manifest_bytes'])} (manifest {fmt_bytes(st['manifest_bytes'])}) in {st['seconds'] * 1000:.1f} ms")
+    if args.prune:
+        cmd_prune(repo, args)
+
+
+def cmd_list(repo: SnapshotRepo, args: argparse.Namespace) -> None:
+    snaps = repo.list_snapshots()
+    for m in snaps:
+        st = m.get("stats", {})
+        created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(m.get("created", 0)))
+        label = f"  [{m['label']}]" if m.get("label") else ""
+        print(f"{m['id']}  {created}  {st.get('files', 0):>5} files  {fmt_bytes(st.get('bytes', 0)):>10}  +{fmt_bytes(st.get('new_bytes', 0))}{label}")
+    stats = repo.stats()
+    print(f"{stats['snapshots']} snapshots, {stats['objects']} objects, {fmt_bytes(stats['object_bytes'])} stored")
+
+
+def cmd_restore(repo: SnapshotRepo, args: argparse.Namespace) -> None:
+    snap_id = args.id
+    if snap_id == "latest":
+        latest = repo.list_snapshots()
+        if not latest:
+            raise SystemExit("仓库中没有快照")
+        snap_id = latest[-1]["id"]
+    result = repo.restore(snap_id, target_dir=args.target, paths=args.only or None)
+    print(f"restored {result['restored']} files from {snap_id} into {os.path.abspath(args.target)} ({result['skipped']} already up to date)")
+
+
+def cmd_prune(repo: SnapshotRepo, args: argparse.Namespace) -> None:
+    result = repo.prune(args.keep_last, args.keep_daily, args.keep_weekly, args.keep_monthly)
+    print(
+        f"kept {result['kept']} snapshots, removed {result['removed_snapshots']}; "
+        f"freed {result['removed_objects']} objects ({fmt_bytes(result['freed_bytes'])})"
+    )
+
+
+def cmd_verify(repo: SnapshotRepo, args: argparse.Namespace) -> None:
+    problems = repo.verify(args.id)
+    for p in problems:
+        print(p)
+    if problems:
+        raise SystemExit(f"{len(problems)} problems found")
+    print("ok")
+
+
+def add_retention_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--keep-last", type=int, default=3, help="保留最近的快照数（默认 3）")
+    p.add_argument("--keep-daily", type=int, default=7, help="保留最近若干天每天最新的一个（默认 7）")
+    p.add_argument("--keep-weekly", type=int, default=4, help="保留最近若干周每周最新的一个（默认 4）")
+    p.add_argument("--keep-monthly", type=int, default=6, help="保留最近若干月每月最新的一个（默认 6）")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="数据目录增量快照：内容寻址分块存储，未变化的文件不重复读取与存储")
+    parser.add_argument("--repo", default=REPO_DIR, help="快照仓库目录（默认 snapshots）")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("create", help="创建快照")
+    p.add_argument("--data", default=DATA_DIR, help="数据目录（默认 data）")
+    p.add_argument("--assets", action="store_true", help="同时快照资源目录 assets/")
+    p.add_argument("--extra", nargs="*", default=[], help="额外的文件或目录")
+    p.add_argument("--base", default=".", help="路径基准目录（默认当前目录，清单中记录相对路径）")
+    p.add_argument("--label", default="", help="快照备注")
+    p.add_argument("--prune", action="store_true", help="创建后按保留策略清理")
+    add_retention_args(p)
+    p.set_defaults(func=cmd_create)
+
+    p = sub.add_parser("list", help="列出快照")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("restore", help="恢复快照（请先退出程序）")
+    p.add_argument("id", help="快照 ID，或 latest")
+    p.add_argument("--target", default=".", help="恢复到的基准目录（默认当前目录）")
+    p.add_argument("--only", nargs="*", help="只恢复这些相对路径（前缀匹配，如 data/users.json）")
+    p.set_defaults(func=cmd_restore)
+
+    p = sub.add_parser("prune", help="按保留策略删除旧快照并回收无引用的块")
+    add_retention_args(p)
+    p.set_defaults(func=cmd_prune)
+
+    p = sub.add_parser("verify", help="校验块完整性")
+    p.add_argument("id", nargs="?", help="快照 ID（默认全部）")
+    p.set_defaults(func=cmd_verify)
+
+    args = parser.parse_args()
+    args.func(SnapshotRepo(args.repo), args)
+
+
+if __name__ == "__main__":
+    main()
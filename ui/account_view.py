@@ -75,7 +75,7 @@ class AccountView(tk.Frame):
             self.msg_var.set("请输入有效的目标用户与扣除秒数")
             return
         me = self.controller.current_user
-        if not self.dm.deduct_total_run_time(me, secs):
+        if not self.dm.deduct_total_run_time(me, secs, "transfer_out", f"to:{to_user}"):
             self.msg_var.set("扣除失败：余额不足或用户无效")
             return
         key = LicenseManager.generate_transfer_key(me, to_user, secs)
@@ -91,14 +91,18 @@ class AccountView(tk.Frame):
         if not info:
             self.msg_var.set("卡密无效或不匹配")
             return
-        if self.dm.is_transfer_key_used(dst, key):
+        secs = int(info["seconds"])
+        status = self.dm.redeem_transfer_key(dst, key, int(info["ts"]), secs, f"from:{src}")
+        if status == "used":
             self.msg_var.set("该卡密已使用")
             return
-        secs = int(info["seconds"])
-        if not self.dm.credit_total_run_time(dst, secs):
+        if status == "expired":
+            days = self.dm.TRANSFER_KEY_TTL_S // 86400
+            self.msg_var.set(f"卡密已过期（有效期 {days} 天）或生成时间异常")
+            return
+        if status != "ok":
             self.msg_var.set("充值失败：用户无效")
             return
-        self.dm.mark_transfer_key_used(dst, key)
         total = int(self.dm.get_user(dst).get("total_run_time", 0))
         self.msg_var.set(f"充值成功：+{RuntimeTracker.format_hms(secs)}，当前：{RuntimeTracker.format_hms(total)}")
 
@@ -4,7 +4,6 @@ from typing import Dict, List, Optional
 
 from core.data_manager import DataManager
 from core.runtime_tracker import RuntimeTracker
-from core.pet import PetAnimator
 from core.float_window import FloatWindow
 
 
@@ -18,7 +17,6 @@ class HomeView(tk.Frame):
         self.tracker = tracker
         self.selected_pet: Optional[str] = None
         self._grid_items: List[tk.Frame] = []
-        self._photo_cache: Dict[str, tk.PhotoImage] = {}
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -60,6 +58,7 @@ class HomeView(tk.Frame):
         tk.Button(foot, text="进入商城", command=lambda: self.controller.show("mall")).pack(side="left", padx=8)
         tk.Button(foot, text="粮仓", command=lambda: self.controller.show("inventory")).pack(side="left", padx=8)
         tk.Button(foot, text="账户", command=lambda: self.controller.show("account")).pack(side="left", padx=8)
+        tk.Button(foot, text="统计", command=lambda: self.controller.show("stats")).pack(side="left", padx=8)
         tk.Button(foot, text="设置", command=lambda: self.controller.show("settings")).pack(side="left", padx=8)
         tk.Button(foot, text="退出登录", command=self.controller.logout).pack(side="right", padx=8)
 
@@ -91,15 +90,23 @@ class HomeView(tk.Frame):
         total = int(user.get("total_run_time", 0)) if user else 0
         self.time_label.configure(text=f"总时间：{RuntimeTracker.format_hms(total)}")
         self._render_grid()
-        # 订阅计时器以更新时间显示
-        self.tracker.subscribe(lambda t, _: self.time_label.configure(text=f"总时间：{RuntimeTracker.format_hms(t)}"))
+        # 订阅计时器以更新时间显示（页面隐藏时取消订阅）
+        self.tracker.subscribe(self._on_tracker_tick)
+
+    def _on_tracker_tick(self, total: int, _pet_seconds: int) -> None:
+        self.time_label.configure(text=f"总时间：{RuntimeTracker.format_hms(total)}")
+
+    def on_catalog_changed(self) -> None:
+        """目录配置热加载后刷新列表"""
+        self._render_grid()
 
     def on_hide(self) -> None:
-        """页面隐藏时解绑事件"""
+        """页面隐藏时解绑事件并取消计时订阅"""
         try:
             self.canvas.unbind_all("<MouseWheel>")
         except Exception:
             pass
+        self.tracker.unsubscribe(self._on_tracker_tick)
 
     def _render_grid(self) -> None:
         """渲染已解锁宠物网格"""
@@ -156,11 +163,13 @@ class HomeView(tk.Frame):
             
             # 预览图
             frames_path = pets_cfg.get(name, {}).get("frames", "")
+            preview_label = tk.Label(fr, bg="#333")
+            preview_label.pack(pady=8)
             try:
-                preview = self._get_preview(name, frames_path)
-                tk.Label(fr, image=preview, bg="#333").pack(pady=8)
+                preview = self._get_preview(name, frames_path, on_replaced=lambda p, l=preview_label: l.configure(image=p))
+                preview_label.configure(image=preview)
             except Exception:
-                tk.Label(fr, text="[预览失败]", fg="#f99", bg="#333").pack(pady=8)
+                preview_label.configure(text="[预览失败]", fg="#f99")
             
             # 文本信息
             tk.Label(fr, text=name, fg="#fff", bg="#333", font=("微软雅黑", 10, "bold")).pack()
@@ -184,14 +193,9 @@ class HomeView(tk.Frame):
         for c in range(cols):
             self.grid.grid_columnconfigure(c, weight=1)
 
-    def _get_preview(self, name: str, frames_path: str) -> tk.PhotoImage:
-        """生成或取缓存的预览 PhotoImage"""
-        if name in self._photo_cache:
-            return self._photo_cache[name]
-        pa = PetAnimator(frames_path, scale=3)
-        img = pa.get_tk_image()
-        self._photo_cache[name] = img
-        return img
+    def _get_preview(self, name: str, frames_path: str, on_replaced=None) -> tk.PhotoImage:
+        """获取预览 PhotoImage：由缩略图服务后台生成，未就绪时先返回占位图"""
+        return self.controller.thumbs.get_photo(frames_path, 3, on_replaced)
 
     def _select_pet(self, name: str) -> None:
         """选中或取消选中指定宠物"""
@@ -222,8 +226,7 @@ class HomeView(tk.Frame):
             # 检查窗口是否存活
             is_alive = False
             try:
-                if self.controller.float_window.top.winfo_exists():
-                    is_alive = True
+                is_alive = self.controller.float_window.is_alive()
             except Exception:
                 pass
 
@@ -232,7 +235,7 @@ class HomeView(tk.Frame):
                 current_path = getattr(self.controller.float_window, "frames_path", "")
                 if os.path.normpath(current_path) == os.path.normpath(frames_path):
                     try:
-                        self.controller.float_window.top.lift()
+                        self.controller.float_window.lift()
                     except Exception:
                         pass
                     return
@@ -244,6 +247,7 @@ class HomeView(tk.Frame):
             # 如果窗口已销毁但对象还在，直接创建新的覆盖之
         
         try:
+            user = self.dm.get_user(self.controller.current_user) or {}
             self.controller.float_window = FloatWindow(
                 root=self.controller.root,
                 username=self.controller.current_user,
@@ -253,10 +257,11 @@ class HomeView(tk.Frame):
                 on_back_home=lambda: self.controller.show("home"),
                 on_change_pet=lambda: self.controller.show("home"),
                 on_switched_pet=self.set_selection,
+                backend=user.get("settings", {}).get("renderer", "tk"),
+                clock=self.controller.timers,
             )
             
             # 立即应用用户配置
-            user = self.dm.get_user(self.controller.current_user)
             if user:
                 self.controller.apply_settings(user.get("settings", {}))
                 
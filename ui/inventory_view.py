@@ -2,7 +2,6 @@ import tkinter as tk
 from typing import Dict
 
 from core.data_manager import DataManager
-from core.pet import PetAnimator
 
 
 class InventoryView(tk.Frame):
@@ -12,7 +11,6 @@ class InventoryView(tk.Frame):
         super().__init__(master, bg="#222")
         self.controller = controller
         self.dm = dm
-        self._photo_cache: Dict[str, tk.PhotoImage] = {}
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -43,6 +41,10 @@ class InventoryView(tk.Frame):
             pass
         self._render_grid()
 
+    def on_catalog_changed(self) -> None:
+        """目录配置热加载后刷新列表"""
+        self._render_grid()
+
     def on_hide(self) -> None:
         """页面隐藏时解绑滚轮"""
         try:
@@ -76,11 +78,13 @@ class InventoryView(tk.Frame):
             fr.pack(fill="both", expand=True)
 
             frames_path = cfg.get("frames", "")
+            preview_label = tk.Label(fr, bg="#333")
+            preview_label.pack(pady=8)
             try:
-                preview = self._get_preview(name, frames_path)
-                tk.Label(fr, image=preview, bg="#333").pack(pady=8)
+                preview = self._get_preview(name, frames_path, on_replaced=lambda p, l=preview_label: l.configure(image=p))
+                preview_label.configure(image=preview)
             except Exception:
-                tk.Label(fr, text="[预览]", fg="#999", bg="#333").pack(pady=8)
+                preview_label.configure(text="[预览]", fg="#999")
 
             tk.Label(fr, text=name, fg="#fff", bg="#333", font=("微软雅黑", 10, "bold")).pack()
             tk.Label(fr, text=f"数量：{qty}", fg="#ccc", bg="#333").pack(pady=(0, 6))
@@ -88,14 +92,9 @@ class InventoryView(tk.Frame):
         for c in range(cols):
             self.grid.grid_columnconfigure(c, weight=1)
 
-    def _get_preview(self, name: str, frames_path: str) -> tk.PhotoImage:
-        """生成或取缓存的预览 PhotoImage"""
-        if name in self._photo_cache:
-            return self._photo_cache[name]
-        pa = PetAnimator(frames_path)
-        img = pa.get_tk_image()
-        self._photo_cache[name] = img
-        return img
+    def _get_preview(self, name: str, frames_path: str, on_replaced=None) -> tk.PhotoImage:
+        """获取预览 PhotoImage：由缩略图服务后台生成，未就绪时先返回占位图"""
+        return self.controller.thumbs.get_photo(frames_path, 4, on_replaced)
 
     def _on_frame_configure(self, event) -> None:
         """根据内容尺寸更新 Canvas 的滚动区域"""
@@ -1,16 +1,34 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog, Toplevel
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
 
-from core.data_manager import DataManager
+from core.data_manager import DataManager, TxnOp, TxnResult
 from core.runtime_tracker import RuntimeTracker
-from core.pet import PetAnimator
 from core.license_manager import LicenseManager
 
 
 class MallView(tk.Frame):
     """商城页面：展示未解锁宠物列表与购买逻辑"""
 
+    MAX_VISIBLE_ROWS = 200  # 单次最多展示的行数，超出时提示用户搜索
+    SORT_OPTIONS = {
+        "默认排序": "default",
+        "价格从低到高": "price_asc",
+        "价格从高到低": "price_desc",
+        "按名称": "name",
+    }
+    EMPTY_TEXT = {
+        "pet": ("所有宠物已解锁", "#9f9"),
+        "food": ("暂无粮食上架", "#f99"),
+    }
+    # 事务失败原因对应的提示
+    TXN_ERRORS = {
+        "no_user": "当前用户无效，请重新登录",
+        "insufficient": "运行时间不足，无法购买",
+        "already_unlocked": "【{name}】已解锁，无需重复购买",
+        "invalid": "【{name}】已下架或不可购买",
+    }
+
     def __init__(self, master: tk.Misc, controller, dm: DataManager) -> None:
         super().__init__(master, bg="#222")
         self.controller = controller
@@ -19,7 +37,13 @@ class MallView(tk.Frame):
         self.selected_food: Optional[str] = None
         self.mode: str = "pet"
         self.qty_var = tk.IntVar(value=1)
-        self._photo_cache: Dict[str, tk.PhotoImage] = {}
+        self.search_var = tk.StringVar()
+        self.sort_var = tk.StringVar(value="默认排序")
+        # 列表行缓存：按模式、商品名索引；两种模式的行在切换时保留
+        self._rows: Dict[str, Dict[str, "_ListingRow"]] = {"pet": {}, "food": {}}
+        self._order: Dict[str, List[str]] = {"pet": [], "food": []}
+        # 购物车：(类别, 商品名) -> 数量，结算时整单一次扣减
+        self.cart: Dict[Tuple[str, str], int] = {}
         self._build_ui()
 
     def _build_ui(self) -> None:
@@ -29,25 +53,38 @@ class MallView(tk.Frame):
         self.time_label = tk.Label(head, text="货币：00:00:00", fg="#fff", bg="#222")
         self.time_label.pack(side="left", padx=12)
         tk.Button(head, text="返回主页", command=lambda: self.controller.show("home")).pack(side="right", padx=12)
+        tk.Button(head, text="兑换卡密", command=self._on_redeem).pack(side="right")
 
         # 模式切换：宠物 / 粮食
         modebar = tk.Frame(self, bg="#222")
         modebar.pack(fill="x", padx=12)
         def set_mode(m: str) -> None:
+            prev_mode, prev_sel = self.mode, self._current_selection()
             self.mode = m
             self.selected_pet = None
             self.selected_food = None
+            self._restyle_row(prev_mode, prev_sel)
             self.btn_buy.configure(state="disabled", text="购买", command=self._on_buy)
             try:
                 self.qty_label.pack_forget()
                 self.spin_qty.pack_forget()
             except Exception:
                 pass
+            self._sync_cart_buttons()
             self._render_list()
             self.canvas.yview_moveto(0)
         tk.Button(modebar, text="宠物", command=lambda: set_mode("pet")).pack(side="left", padx=4)
         tk.Button(modebar, text="粮食", command=lambda: set_mode("food")).pack(side="left", padx=4)
 
+        # 搜索与排序：输入即过滤（基于目录索引，不重扫目录）
+        sort_menu = tk.OptionMenu(modebar, self.sort_var, *self.SORT_OPTIONS.keys())
+        sort_menu.configure(bg="#333", fg="#fff", highlightthickness=0)
+        sort_menu.pack(side="right", padx=4)
+        tk.Entry(modebar, textvariable=self.search_var, width=18).pack(side="right", padx=4)
+        tk.Label(modebar, text="搜索", fg="#ddd", bg="#222").pack(side="right")
+        self.search_var.trace_add("write", lambda *_: self._render_list())
+        self.sort_var.trace_add("write", lambda *_: self._render_list())
+
         # 中间滚动容器
         mid = tk.Frame(self, bg="#222")
         mid.pack(fill="both", expand=True, padx=12, pady=8)
@@ -63,6 +100,16 @@ class MallView(tk.Frame):
         self.list_frame = tk.Frame(self.canvas, bg="#222")
         self._canvas_window = self.canvas.create_window((0, 0), window=self.list_frame, anchor="nw")
 
+        # 每种模式一个行容器与提示标签（空列表/结果过多），切换模式时只切换可见容器
+        self._mode_frames: Dict[str, tk.Frame] = {
+            "pet": tk.Frame(self.list_frame, bg="#222"),
+            "food": tk.Frame(self.list_frame, bg="#222"),
+        }
+        self._hint_labels: Dict[str, tk.Label] = {
+            "pet": tk.Label(self._mode_frames["pet"], bg="#222"),
+            "food": tk.Label(self._mode_frames["food"], bg="#222"),
+        }
+
         # 绑定尺寸变化事件，保持滚动正确与宽度自适应
         self.list_frame.bind("<Configure>", self._on_frame_configure)
         self.canvas.bind("<Configure>", self._on_canvas_configure)
@@ -71,6 +118,12 @@ class MallView(tk.Frame):
         foot.pack(fill="x", pady=8)
         self.btn_buy = tk.Button(foot, text="购买", command=self._on_buy, state="disabled")
         self.btn_buy.pack(side="left", padx=8)
+        self.btn_add_cart = tk.Button(foot, text="加入购物车", command=self._on_add_to_cart, state="disabled")
+        self.btn_add_cart.pack(side="left")
+        self.btn_clear_cart = tk.Button(foot, text="清空", command=self._on_clear_cart)
+        self.btn_clear_cart.pack(side="right", padx=8)
+        self.btn_checkout = tk.Button(foot, text="结算购物车 (0)", command=self._on_checkout)
+        self.btn_checkout.pack(side="right")
         # 粮食数量选择控件（默认不显示，仅在选择粮食时显示）
         self.qty_label = tk.Label(foot, text="数量", fg="#ddd", bg="#222")
         self.spin_qty = tk.Spinbox(foot, from_=1, to=99, textvariable=self.qty_var, width=5)
@@ -85,6 +138,15 @@ class MallView(tk.Frame):
         user = self.dm.get_user(self.controller.current_user) or {}
         total = int(user.get("total_run_time", 0))
         self.time_label.configure(text=f"货币：{RuntimeTracker.format_hms(total)}")
+        # 已解锁（如通过卡密兑换）的宠物从购物车移除
+        unlocked = set(user.get("unlocked_pets", []))
+        for key in [k for k in self.cart if k[0] == "pet" and k[1] in unlocked]:
+            del self.cart[key]
+        self._sync_cart_buttons()
+        self._render_list()
+
+    def on_catalog_changed(self) -> None:
+        """目录配置热加载后刷新列表"""
         self._render_list()
 
     def on_hide(self) -> None:
@@ -95,112 +157,140 @@ class MallView(tk.Frame):
             pass
 
     def _render_list(self) -> None:
-        """渲染当前模式的商品列表（宠物或粮食）"""
-        for w in list(self.list_frame.children.values()):
-            try:
-                w.destroy()
-            except Exception:
-                pass
-        if self.mode == "pet":
-            user = self.dm.get_user(self.controller.current_user) or {}
-            unlocked = set(user.get("unlocked_pets", []))
-            pets_cfg = self.dm.get_pets()
-            locked = [name for name in pets_cfg.keys() if name not in unlocked]
-            if not locked:
-                tk.Label(self.list_frame, text="所有宠物已解锁", fg="#9f9", bg="#222").pack(pady=18)
-                return
+        """按商品名对当前模式的列表做增量协调：仅新增、删除或更新有变化的行
+        不符合搜索条件的行只隐藏不销毁，便于输入联想时快速恢复。
+        """
+        mode = self.mode
+        mode_frame = self._show_mode_frame(mode)
+        rows = self._rows[mode]
+        catalog, excluded, visible = self._collect_items(mode)
+        selected = self._current_selection()
+
+        # 1. 移除已下架/已解锁的行
+        for name in [n for n in rows if n not in catalog or n in excluded]:
+            rows.pop(name).destroy()
+
+        # 2. 新建或按签名更新可见行（未变化的行不触碰任何控件）
+        shown = visible[:self.MAX_VISIBLE_ROWS]
+        for name in shown:
+            cfg = catalog[name]
+            row = rows.get(name)
+            if row is None:
+                row = _ListingRow(mode_frame, name, self._make_select_command(mode, name))
+                rows[name] = row
+            frames_path = cfg.get("frames", "")
+            if frames_path != row.frames_path:
+                try:
+                    row.set_preview(self._get_preview(name, frames_path, on_replaced=row.set_preview))
+                    row.frames_path = frames_path
+                except Exception:
+                    pass
+            row.update(self._price_text(mode, cfg), cfg.get("description", ""), name == selected)
+
+        # 3. 维护显示顺序：相对顺序未变时只插入新行，否则整体重排
+        self._apply_order(mode, shown)
+
+        hint_label = self._hint_labels[mode]
+        if not visible:
+            if self.search_var.get().strip():
+                hint_label.configure(text="没有匹配的商品", fg="#f99")
+            else:
+                hint_label.configure(text=self.EMPTY_TEXT[mode][0], fg=self.EMPTY_TEXT[mode][1])
+            hint_label.pack_forget()
+            hint_label.pack(pady=18)
+        elif len(visible) > len(shown):
+            hint_label.configure(text=f"仅显示前 {len(shown)} 项（共 {len(visible)} 项），请输入关键词缩小范围", fg="#aaa")
+            hint_label.pack_forget()
+            hint_label.pack(pady=12)
         else:
-            foods_cfg = self.dm.get_foods()
-            if not foods_cfg:
-                tk.Label(self.list_frame, text="暂无粮食上架", fg="#f99", bg="#222").pack(pady=18)
-                return
+            hint_label.pack_forget()
 
-        # 定义选中与未选中的样式常量
-        STYLE_SELECTED = {
-            "border_color": "#FFD700",  # 金色边框
-            "border_width": 3,
-            "btn_text": "取消选中",
-            "btn_bg": "#FFD700",
-            "btn_fg": "#000000",
-            "btn_state": "normal"
-        }
-        STYLE_NORMAL = {
-            "border_color": "#444444",  # 深灰边框
-            "border_width": 1,
-            "btn_text": "选中",
-            "btn_bg": "#555555",
-            "btn_fg": "#ffffff",
-            "btn_state": "normal"
-        }
+    def _show_mode_frame(self, mode: str) -> tk.Frame:
+        """显示指定模式的行容器，另一模式的行保持缓存但隐藏"""
+        for m, fr in self._mode_frames.items():
+            if m != mode:
+                fr.pack_forget()
+        fr = self._mode_frames[mode]
+        if not fr.winfo_manager():
+            fr.pack(fill="x")
+        return fr
 
-        items = []
-        if self.mode == "pet":
-            pets_cfg = self.dm.get_pets()
+    def _collect_items(self, mode: str) -> Tuple[Mapping[str, Dict], Set[str], List[str]]:
+        """收集当前模式的目录视图、需排除的商品与按搜索/排序得到的可见名称
+        每次渲染仅读取一次用户与目录；过滤与排序由 DataManager 的目录索引完成。
+        """
+        query = self.search_var.get()
+        sort = self.SORT_OPTIONS.get(self.sort_var.get(), "default")
+        if mode == "pet":
             user = self.dm.get_user(self.controller.current_user) or {}
-            unlocked = set(user.get("unlocked_pets", []))
-            items = [(name, pets_cfg[name]) for name in pets_cfg.keys() if name not in unlocked]
+            excluded = set(user.get("unlocked_pets", []))
+            catalog = self.dm.get_pets_view()
         else:
-            foods_cfg = self.dm.get_foods()
-            items = list(foods_cfg.items())
+            excluded = set()
+            catalog = self.dm.get_foods_view()
+        names = self.dm.search_catalog(mode, query, sort=sort)
+        visible = [name for name in names if name not in excluded and name in catalog]
+        return catalog, excluded, visible
 
-        for name, cfg in items:
-            is_selected = (name == (self.selected_pet if self.mode == "pet" else self.selected_food))
-            style = STYLE_SELECTED if is_selected else STYLE_NORMAL
-            
-            # 外层容器充当边框
-            container = tk.Frame(
-                self.list_frame, 
-                bg=style["border_color"], 
-                padx=style["border_width"], 
-                pady=style["border_width"]
-            )
-            container.pack(fill="x", pady=6)
-            
-            # 内层内容容器
-            fr = tk.Frame(container, bg="#333")
-            fr.pack(fill="both", expand=True)
-            
-            # 预览
-            frames_path = cfg.get("frames", "")
-            try:
-                preview = self._get_preview(name, frames_path)
-                tk.Label(fr, image=preview, bg="#333").pack(side="left", padx=8, pady=6)
-            except Exception:
-                pass
-            
-            # 文本区域
-            text_frame = tk.Frame(fr, bg="#333")
-            text_frame.pack(side="left", fill="both", expand=True, padx=4)
-            
-            tk.Label(text_frame, text=name, fg="#fff", bg="#333", font=("微软雅黑", 12, "bold")).pack(anchor="w")
-
-            if self.mode == "pet":
-                if cfg.get("unlock_type") == "key":
-                    price_text = "获取方式：卡密兑换 (联系管理员)"
-                else:
-                    price_text = f"价格：{RuntimeTracker.format_hms(int(cfg.get('price', 0)))}"
+    def _apply_order(self, mode: str, order: List[str]) -> None:
+        """按目标顺序摆放行；已有行的相对顺序不变时不做重排"""
+        rows = self._rows[mode]
+        order_set = set(order)
+        prev: List[str] = []
+        for name in self._order[mode]:
+            row = rows.get(name)
+            if row is None:
+                continue
+            if name in order_set:
+                prev.append(name)
             else:
-                price_text = f"单价：{RuntimeTracker.format_hms(int(cfg.get('price', 0)))}"
+                row.container.pack_forget()
+        prev_set = set(prev)
+        if [name for name in order if name in prev_set] == prev:
+            # 仅需把新行插入到其后继行之前（或追加到末尾）
+            next_packed: Optional[_ListingRow] = None
+            for name in reversed(order):
+                row = rows[name]
+                if name not in prev_set:
+                    row.pack(before=next_packed)
+                next_packed = row
+        else:
+            for name in prev:
+                rows[name].container.pack_forget()
+            for name in order:
+                rows[name].pack()
+        self._order[mode] = order
 
-            tk.Label(text_frame, text=price_text, fg="#ccc", bg="#333").pack(anchor="w")
-            tk.Label(text_frame, text=cfg.get("description", ""), fg="#bbb", bg="#333").pack(anchor="w")
-            
-            # 选择按钮
-            btn = tk.Button(
-                fr, 
-                text=style["btn_text"], 
-                bg=style["btn_bg"], 
-                fg=style["btn_fg"],
-                activebackground=style["btn_bg"],
-                activeforeground=style["btn_fg"],
-                state=style["btn_state"],
-                relief="flat",
-                command=(lambda n=name: self._select_pet(n)) if self.mode == "pet" else (lambda n=name: self._select_food(n))
-            )
-            btn.pack(side="right", padx=12)
+    def _current_selection(self) -> Optional[str]:
+        """返回当前模式下被选中的商品名"""
+        return self.selected_pet if self.mode == "pet" else self.selected_food
+
+    def _restyle_row(self, mode: str, name: Optional[str]) -> None:
+        """仅更新单行的选中样式（选择点击不触发整表协调）"""
+        if not name:
+            return
+        row = self._rows[mode].get(name)
+        if row is not None:
+            row.set_selected(name == self._current_selection() and mode == self.mode)
+
+    def _make_select_command(self, mode: str, name: str):
+        """生成行内选择按钮的回调"""
+        if mode == "pet":
+            return lambda: self._select_pet(name)
+        return lambda: self._select_food(name)
+
+    @staticmethod
+    def _price_text(mode: str, cfg: Dict) -> str:
+        """生成价格描述文本"""
+        if mode == "pet":
+            if cfg.get("unlock_type") == "key":
+                return "获取方式：卡密兑换 (联系管理员)"
+            return f"价格：{RuntimeTracker.format_hms(int(cfg.get('price', 0)))}"
+        return f"单价：{RuntimeTracker.format_hms(int(cfg.get('price', 0)))}"
 
     def _select_pet(self, name: str) -> None:
         """选中或取消选中未解锁宠物"""
+        prev = self.selected_pet
         if self.selected_pet == name:
             self.selected_pet = None
             self.btn_buy.configure(state="disabled", text="购买", command=self._on_buy)
@@ -209,8 +299,7 @@ class MallView(tk.Frame):
             self.selected_food = None
             self.btn_buy.configure(state="normal")
             
-            pets_cfg = self.dm.get_pets()
-            cfg = pets_cfg.get(name, {})
+            cfg = self.dm.get_pets_view().get(name, {})
             if cfg.get("unlock_type") == "key":
                 self.btn_buy.configure(text="激活 (卡密)", command=self._on_activate)
             else:
@@ -221,10 +310,13 @@ class MallView(tk.Frame):
             self.spin_qty.pack_forget()
         except Exception:
             pass
-        self._render_list()
+        self._restyle_row("pet", prev)
+        self._restyle_row("pet", self.selected_pet)
+        self._sync_cart_buttons()
 
     def _select_food(self, name: str) -> None:
         """选中或取消选中粮食"""
+        prev = self.selected_food
         if self.selected_food == name:
             self.selected_food = None
             self.btn_buy.configure(state="disabled", text="购买", command=self._on_buy)
@@ -243,22 +335,13 @@ class MallView(tk.Frame):
                 self.spin_qty.pack(side="left")
             except Exception:
                 pass
-        self._render_list()
+        self._restyle_row("food", prev)
+        self._restyle_row("food", self.selected_food)
+        self._sync_cart_buttons()
 
-    def _unlock_pet(self, pet_name: str) -> None:
-        """通用解锁逻辑"""
-        user = self.dm.get_user(self.controller.current_user) or {}
-        unlocked: List[str] = list(user.get("unlocked_pets", []))
-        if pet_name not in unlocked:
-            unlocked.append(pet_name)
-            
-        pet_times: Dict[str, int] = dict(user.get("pet_run_time", {}))
-        pet_times.setdefault(pet_name, 0)
-        
-        self.dm.enqueue_user_update(self.controller.current_user, {
-            "unlocked_pets": unlocked,
-            "pet_run_time": pet_times
-        })
+    def _unlock_pet(self, pet_name: str) -> TxnResult:
+        """通用解锁逻辑：在 DataManager 的一次事务中追加已解锁宠物并初始化运行时间"""
+        return self.dm.transact(self.controller.current_user, [TxnOp("unlock", pet_name)], "unlock", pet_name)
 
     def _on_activate(self) -> None:
         """卡密激活逻辑"""
@@ -275,7 +358,10 @@ class MallView(tk.Frame):
             return
             
         if LicenseManager.verify_key(username, self.selected_pet, key):
-            self._unlock_pet(self.selected_pet)
+            result = self._unlock_pet(self.selected_pet)
+            if not result.ok:
+                self._toast(self._txn_error(result))
+                return
             self._toast("激活成功！")
             self.selected_pet = None
             self.btn_buy.configure(state="disabled", text="购买", command=self._on_buy)
@@ -283,38 +369,52 @@ class MallView(tk.Frame):
         else:
             messagebox.showerror("激活失败", "激活码无效或与当前用户/宠物不匹配")
 
+    def _on_redeem(self) -> None:
+        """卡密兑换：无需先选择宠物，由密钥反查对应的卡密宠物"""
+        username = self.controller.current_user
+        if not username:
+            return
+        prompt = f"当前用户：{username}\n\n请输入激活密钥（无需先选择宠物）：\n(请联系管理员获取)"
+        key = simpledialog.askstring("兑换卡密", prompt, parent=self)
+        if not key:
+            return
+        pet_name = self.controller.key_index.find_pet(username, key)
+        if not pet_name:
+            messagebox.showerror("兑换失败", "激活码无效或不属于当前用户")
+            return
+        result = self._unlock_pet(pet_name)
+        if result.reason == "already_unlocked":
+            self._toast(f"【{pet_name}】已解锁，无需重复兑换")
+            return
+        if not result.ok:
+            self._toast(self._txn_error(result))
+            return
+        self._toast(f"兑换成功：已解锁【{pet_name}】")
+        if self.selected_pet == pet_name:
+            self.selected_pet = None
+            self.btn_buy.configure(state="disabled", text="购买", command=self._on_buy)
+        self.on_show()
+
     def _on_buy(self) -> None:
-        """购买逻辑：根据当前模式购买宠物或粮食"""
+        """购买逻辑：根据当前模式购买宠物或粮食（校验、扣减与解锁 / 入仓在一次事务中完成）"""
         if self.mode == "pet":
             if not self.selected_pet:
                 return
-            user = self.dm.get_user(self.controller.current_user) or {}
-            pets_cfg = self.dm.get_pets()
-            price = int(pets_cfg.get(self.selected_pet, {}).get("price", 0))
-            if int(user.get("total_run_time", 0)) < price:
-                self._toast("运行时间不足，无法购买")
+            result = self.dm.checkout(self.controller.current_user, [("pet", self.selected_pet, 1)])
+            if not result.ok:
+                self._toast(self._txn_error(result))
                 return
-            if not self.dm.deduct_total_run_time(self.controller.current_user, price):
-                self._toast("扣减失败，请重试")
-                return
-            self._unlock_pet(self.selected_pet)
+            self.cart.pop(("pet", self.selected_pet), None)
             self._toast("购买成功")
             self.on_show()
         else:
             if not self.selected_food:
                 return
             qty = max(1, int(self.qty_var.get()))
-            user = self.dm.get_user(self.controller.current_user) or {}
-            foods_cfg = self.dm.get_foods()
-            unit = int(foods_cfg.get(self.selected_food, {}).get("price", 0))
-            total_price = unit * qty
-            if int(user.get("total_run_time", 0)) < total_price:
-                self._toast("运行时间不足，无法购买")
-                return
-            if not self.dm.deduct_total_run_time(self.controller.current_user, total_price):
-                self._toast("扣减失败，请重试")
+            result = self.dm.checkout(self.controller.current_user, [("food", self.selected_food, qty)])
+            if not result.ok:
+                self._toast(self._txn_error(result))
                 return
-            self.dm.add_inventory_item(self.controller.current_user, self.selected_food, qty)
             self._toast("购买成功，已入粮仓")
             # 重置选择
             self.selected_food = None
@@ -327,6 +427,63 @@ class MallView(tk.Frame):
                 pass
             self.on_show()
 
+    def _sync_cart_buttons(self) -> None:
+        """根据当前选择与购物车内容更新“加入购物车”与“结算”按钮"""
+        name = self._current_selection()
+        cfg = self.dm.get_pets_view().get(name, {}) if self.mode == "pet" and name else {}
+        can_add = bool(name) and cfg.get("unlock_type") != "key"
+        self.btn_add_cart.configure(state="normal" if can_add else "disabled")
+        count = sum(self.cart.values())
+        self.btn_checkout.configure(text=f"结算购物车 ({count})", state="normal" if self.cart else "disabled")
+        self.btn_clear_cart.configure(state="normal" if self.cart else "disabled")
+
+    def _on_add_to_cart(self) -> None:
+        """将选中的宠物（数量固定为 1）或粮食（按所选数量累加）加入购物车"""
+        name = self._current_selection()
+        if not name:
+            return
+        if self.mode == "pet":
+            self.cart[("pet", name)] = 1
+        else:
+            qty = max(1, int(self.qty_var.get()))
+            self.cart[("food", name)] = self.cart.get(("food", name), 0) + qty
+        self._sync_cart_buttons()
+
+    def _on_clear_cart(self) -> None:
+        """清空购物车"""
+        self.cart.clear()
+        self._sync_cart_buttons()
+
+    def _on_checkout(self) -> None:
+        """结算购物车：确认清单后整单一次扣减，任一商品无法购买时整单不生效"""
+        if not self.cart:
+            return
+        pets, foods = self.dm.get_pets_view(), self.dm.get_foods_view()
+        lines: List[str] = []
+        total = 0
+        for (kind, name), qty in self.cart.items():
+            cfg = (pets if kind == "pet" else foods).get(name, {})
+            price = int(cfg.get("price", 0)) * qty
+            total += price
+            label = name if kind == "pet" else f"{name} x{qty}"
+            lines.append(f"{label}：{RuntimeTracker.format_hms(price)}")
+        prompt = "\n".join(lines) + f"\n\n合计：{RuntimeTracker.format_hms(total)}\n确认结算？"
+        if not messagebox.askyesno("结算购物车", prompt, parent=self):
+            return
+        cart = [(kind, name, qty) for (kind, name), qty in self.cart.items()]
+        result = self.dm.checkout(self.controller.current_user, cart)
+        if not result.ok:
+            self._toast(self._txn_error(result))
+            return
+        self.cart.clear()
+        self._sync_cart_buttons()
+        self._toast(f"结算成功，共花费 {RuntimeTracker.format_hms(result.spent)}")
+        self.on_show()
+
+    def _txn_error(self, result: TxnResult) -> str:
+        """事务失败原因转为提示文本"""
+        return self.TXN_ERRORS.get(result.reason, "购买失败，请重试").format(name=result.name)
+
     def _toast(self, text: str) -> None:
         """轻提示"""
         try:
@@ -334,14 +491,9 @@ class MallView(tk.Frame):
         except Exception:
             pass
 
-    def _get_preview(self, name: str, frames_path: str) -> tk.PhotoImage:
-        """生成或取缓存的预览 PhotoImage"""
-        if name in self._photo_cache:
-            return self._photo_cache[name]
-        pa = PetAnimator(frames_path)
-        img = pa.get_tk_image()
-        self._photo_cache[name] = img
-        return img
+    def _get_preview(self, name: str, frames_path: str, on_replaced=None) -> tk.PhotoImage:
+        """获取预览 PhotoImage：由缩略图服务后台生成，未就绪时先返回占位图"""
+        return self.controller.thumbs.get_photo(frames_path, 4, on_replaced)
 
     def _on_frame_configure(self, event) -> None:
         """根据内容尺寸更新 Canvas 的滚动区域"""
@@ -364,3 +516,102 @@ class MallView(tk.Frame):
                 self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
         except Exception:
             pass
+
+
+class _ListingRow:
+    """商城列表行：持有行内控件引用与上次渲染的数据签名
+    仅当价格、描述或选中状态变化时才 configure 对应控件。
+    """
+
+    # 选中与未选中的样式常量
+    STYLE_SELECTED = {
+        "border_color": "#FFD700",  # 金色边框
+        "border_width": 3,
+        "btn_text": "取消选中",
+        "btn_bg": "#FFD700",
+        "btn_fg": "#000000",
+    }
+    STYLE_NORMAL = {
+        "border_color": "#444444",  # 深灰边框
+        "border_width": 1,
+        "btn_text": "选中",
+        "btn_bg": "#555555",
+        "btn_fg": "#ffffff",
+    }
+
+    def __init__(self, parent: tk.Misc, name: str, on_select: Callable[[], None]) -> None:
+        self.name = name
+        self.frames_path: Optional[str] = None
+        self._price_text: Optional[str] = None
+        self._description: Optional[str] = None
+        self._selected: Optional[bool] = None
+
+        # 外层容器充当边框
+        self.container = tk.Frame(parent)
+        # 内层内容容器
+        fr = tk.Frame(self.container, bg="#333")
+        fr.pack(fill="both", expand=True)
+
+        # 预览（图片在创建后按需设置）
+        self.preview_label = tk.Label(fr, bg="#333")
+        self.preview_label.pack(side="left", padx=8, pady=6)
+
+        # 文本区域
+        text_frame = tk.Frame(fr, bg="#333")
+        text_frame.pack(side="left", fill="both", expand=True, padx=4)
+        tk.Label(text_frame, text=name, fg="#fff", bg="#333", font=("微软雅黑", 12, "bold")).pack(anchor="w")
+        self.price_label = tk.Label(text_frame, fg="#ccc", bg="#333")
+        self.price_label.pack(anchor="w")
+        self.desc_label = tk.Label(text_frame, fg="#bbb", bg="#333")
+        self.desc_label.pack(anchor="w")
+
+        # 选择按钮
+        self.button = tk.Button(fr, relief="flat", command=on_select)
+        self.button.pack(side="right", padx=12)
+
+    def pack(self, before: Optional["_ListingRow"] = None) -> None:
+        """将行放入列表，可指定插在某行之前"""
+        if before is not None:
+            self.container.pack(fill="x", pady=6, before=before.container)
+        else:
+            self.container.pack(fill="x", pady=6)
+
+    def set_preview(self, image: tk.PhotoImage) -> None:
+        """设置预览图"""
+        self.preview_label.configure(image=image)
+
+    def update(self, price_text: str, description: str, selected: bool) -> None:
+        """按签名比较，仅更新发生变化的控件"""
+        if price_text != self._price_text:
+            self.price_label.configure(text=price_text)
+            self._price_text = price_text
+        if description != self._description:
+            self.desc_label.configure(text=description)
+            self._description = description
+        self.set_selected(selected)
+
+    def set_selected(self, selected: bool) -> None:
+        """切换选中样式（状态未变化时不做任何操作）"""
+        if selected == self._selected:
+            return
+        self._selected = selected
+        style = self.STYLE_SELECTED if selected else self.STYLE_NORMAL
+        self.container.configure(
+            bg=style["border_color"],
+            padx=style["border_width"],
+            pady=style["border_width"],
+        )
+        self.button.configure(
+            text=style["btn_text"],
+            bg=style["btn_bg"],
+            fg=style["btn_fg"],
+            activebackground=style["btn_bg"],
+            activeforeground=style["btn_fg"],
+        )
+
+    def destroy(self) -> None:
+        """销毁行控件"""
+        try:
+            self.container.destroy()
+        except Exception:
+            pass
@@ -1,7 +1,31 @@
 import tkinter as tk
+import time
 from tkinter import ttk
 from typing import Dict, Any
 
+# 桌宠缩放选项：显示文本 -> 设置值（"auto" 按屏幕 DPI 换算，可能为小数倍）
+ZOOM_OPTIONS = {
+    "自动（按屏幕 DPI）": "auto",
+    "2 倍": 2.0,
+    "3 倍": 3.0,
+    "3.5 倍": 3.5,
+    "4 倍": 4.0,
+    "4.5 倍": 4.5,
+    "5 倍（默认）": 5.0,
+    "6 倍": 6.0,
+    "7.5 倍": 7.5,
+    "8 倍": 8.0,
+}
+DEFAULT_ZOOM_LABEL = "5 倍（默认）"
+DEFAULT_CACHE_MB = 32
+# 悬浮窗渲染后端：显示文本 -> 设置值（下次打开悬浮窗时生效）
+RENDERER_OPTIONS = {
+    "Tk（默认）": "tk",
+    "pygame（SDL 窗口）": "pygame",
+}
+DEFAULT_RENDERER_LABEL = "Tk（默认）"
+
+
 class SettingsView(tk.Frame):
     """设置页面：管理应用配置与偏好"""
 
@@ -51,6 +75,66 @@ class SettingsView(tk.Frame):
             font=("微软雅黑", 10)
         ).pack(side="left", padx=10)
 
+        # 桌宠缩放与帧缓存预算
+        zoom_frame = tk.Frame(content, bg="#333", padx=15, pady=15)
+        zoom_frame.pack(fill="x", pady=10)
+        tk.Label(zoom_frame, text="桌宠大小", fg="#fff", bg="#333", font=("微软雅黑", 12)).pack(side="left")
+        self.var_zoom = tk.StringVar(value=DEFAULT_ZOOM_LABEL)
+        cb_zoom = ttk.Combobox(
+            zoom_frame, textvariable=self.var_zoom, values=list(ZOOM_OPTIONS.keys()), state="readonly", width=16
+        )
+        cb_zoom.pack(side="left", padx=10)
+        cb_zoom.bind("<<ComboboxSelected>>", lambda e: self._on_setting_change())
+
+        tk.Label(zoom_frame, text="帧缓存上限(MB)", fg="#fff", bg="#333", font=("微软雅黑", 12)).pack(side="left", padx=(20, 0))
+        self.var_cache_mb = tk.IntVar(value=DEFAULT_CACHE_MB)
+        spin_cache = tk.Spinbox(
+            zoom_frame,
+            from_=4,
+            to=512,
+            increment=4,
+            textvariable=self.var_cache_mb,
+            width=6,
+            command=self._on_setting_change,
+        )
+        spin_cache.pack(side="left", padx=10)
+        spin_cache.bind("<Return>", lambda e: self._on_setting_change())
+        spin_cache.bind("<FocusOut>", lambda e: self._on_setting_change())
+
+        # 渲染后端
+        renderer_frame = tk.Frame(content, bg="#333", padx=15, pady=15)
+        renderer_frame.pack(fill="x", pady=10)
+        tk.Label(renderer_frame, text="渲染后端", fg="#fff", bg="#333", font=("微软雅黑", 12)).pack(side="left")
+        self.var_renderer = tk.StringVar(value=DEFAULT_RENDERER_LABEL)
+        cb_renderer = ttk.Combobox(
+            renderer_frame, textvariable=self.var_renderer, values=list(RENDERER_OPTIONS.keys()), state="readonly", width=16
+        )
+        cb_renderer.pack(side="left", padx=10)
+        cb_renderer.bind("<<ComboboxSelected>>", lambda e: self._on_setting_change())
+        tk.Label(
+            renderer_frame,
+            text="（下次打开悬浮窗时生效）",
+            fg="#aaa",
+            bg="#333",
+            font=("微软雅黑", 10)
+        ).pack(side="left", padx=10)
+
+        # 自动备份状态
+        backup_frame = tk.Frame(content, bg="#333", padx=15, pady=15)
+        backup_frame.pack(fill="x", pady=10)
+        tk.Label(backup_frame, text="自动备份", fg="#fff", bg="#333", font=("微软雅黑", 12)).pack(side="left")
+        self.lbl_backup = tk.Label(backup_frame, text="", fg="#aaa", bg="#333", font=("微软雅黑", 10), justify="left")
+        self.lbl_backup.pack(side="left", padx=10)
+        tk.Button(
+            backup_frame,
+            text="立即备份",
+            command=self._on_backup_now,
+            bg="#555",
+            fg="#fff",
+            relief="flat",
+            font=("微软雅黑", 10),
+        ).pack(side="right")
+
         # 底部按钮
         foot = tk.Frame(self, bg="#222")
         foot.pack(fill="x", pady=20, side="bottom")
@@ -69,6 +153,7 @@ class SettingsView(tk.Frame):
 
     def on_show(self) -> None:
         """显示时加载当前配置"""
+        self._refresh_backup_status()
         username = self.controller.current_user
         if not username:
             return
@@ -78,6 +163,12 @@ class SettingsView(tk.Frame):
         
         # 加载各项配置
         self.var_warm_greetings.set(settings.get("warm_greetings", False))
+        zoom = settings.get("pet_zoom", ZOOM_OPTIONS[DEFAULT_ZOOM_LABEL])
+        label = next((k for k, v in ZOOM_OPTIONS.items() if v == zoom), DEFAULT_ZOOM_LABEL)
+        self.var_zoom.set(label)
+        self.var_cache_mb.set(int(settings.get("frame_cache_mb", DEFAULT_CACHE_MB)))
+        renderer = settings.get("renderer", "tk")
+        self.var_renderer.set(next((k for k, v in RENDERER_OPTIONS.items() if v == renderer), DEFAULT_RENDERER_LABEL))
 
     def _on_setting_change(self) -> None:
         """配置变更时立即保存并生效"""
@@ -85,8 +176,15 @@ class SettingsView(tk.Frame):
         if not username:
             return
             
+        try:
+            cache_mb = max(4, int(self.var_cache_mb.get()))
+        except (tk.TclError, ValueError):
+            cache_mb = DEFAULT_CACHE_MB
         new_settings = {
-            "warm_greetings": self.var_warm_greetings.get()
+            "warm_greetings": self.var_warm_greetings.get(),
+            "pet_zoom": ZOOM_OPTIONS.get(self.var_zoom.get(), ZOOM_OPTIONS[DEFAULT_ZOOM_LABEL]),
+            "frame_cache_mb": cache_mb,
+            "renderer": RENDERER_OPTIONS.get(self.var_renderer.get(), "tk"),
         }
         
         # 1. 更新数据库
@@ -96,7 +194,7 @@ class SettingsView(tk.Frame):
         
         user = self.dm.get_user(username) or {}
         # 确保 settings 也是合并更新
-        current_settings = user.get("settings", {})
+        current_settings = dict(user.get("settings", {}))
         current_settings.update(new_settings)
         user["settings"] = current_settings
         
@@ -104,3 +202,32 @@ class SettingsView(tk.Frame):
         
         # 2. 通知控制器应用新配置
         self.controller.apply_settings(current_settings)
+
+    def _refresh_backup_status(self) -> None:
+        """刷新自动备份统计：代数、最近一次时间与耗时、累计 CPU 时间"""
+        backup = getattr(self.controller, "auto_backup", None)
+        if backup is None:
+            self.lbl_backup.config(text="未启用")
+            return
+        st = backup.stats()
+        if st["last_time"]:
+            when = time.strftime("%m-%d %H:%M", time.localtime(st["last_time"]))
+            text = (
+                f"最近 {when}，{st['last_bytes'] / 1024:.0f} KB，耗时 {st['last_wall_ms']:.0f} ms"
+                f"（CPU {st['last_cpu_ms']:.0f} ms，持锁 {st['last_lock_ms']:.1f} ms）\n"
+                f"保留 {st['generations']} 代，本次运行累计 CPU {st['total_cpu_ms'] / 1000:.1f} s，"
+                f"间隔 {st['next_interval_s'] / 60:.0f} 分钟"
+            )
+        else:
+            text = f"本次运行尚未备份，保留 {st['generations']} 代"
+        if st["last_error"]:
+            text += f"\n上次失败：{st['last_error']}"
+        self.lbl_backup.config(text=text)
+
+    def _on_backup_now(self) -> None:
+        """在后台线程立即备份，稍后刷新状态"""
+        backup = getattr(self.controller, "auto_backup", None)
+        if backup is None:
+            return
+        backup.trigger(force=True)
+        self.after(1500, self._refresh_backup_status)
@@ -0,0 +1,105 @@
+import tkinter as tk
+from typing import Dict
+
+from core.data_manager import DataManager
+from core.runtime_tracker import RuntimeTracker
+from core.usage_stats import UsageStats
+
+
+class StatsView(tk.Frame):
+    """统计页面：今天 / 近 7 天 / 近 30 天的运行时间、各宠物排行与近 30 天柱状图
+    数据来自 UsageStats 的滚动合计（前缀和），打开页面无需扫描历史记录。
+    """
+
+    CHART_DAYS = 30
+    CHART_HEIGHT = 160
+
+    def __init__(self, master: tk.Misc, controller, dm: DataManager, usage: UsageStats) -> None:
+        super().__init__(master, bg="#222")
+        self.controller = controller
+        self.dm = dm
+        self.usage = usage
+        self._build_ui()
+
+    def _build_ui(self) -> None:
+        """构建统计页面控件"""
+        head = tk.Frame(self, bg="#222")
+        head.pack(fill="x", pady=8)
+        tk.Label(head, text="运行统计", fg="#fff", bg="#222").pack(side="left", padx=12)
+        tk.Button(head, text="返回主页", command=lambda: self.controller.show("home")).pack(side="right", padx=12)
+
+        # 汇总：今天 / 近 7 天 / 近 30 天
+        summary = tk.Frame(self, bg="#222")
+        summary.pack(fill="x", padx=12, pady=4)
+        self._summary_vars: Dict[str, tk.StringVar] = {}
+        for key, title in (("today", "今天"), ("7d", "近 7 天"), ("30d", "近 30 天")):
+            box = tk.Frame(summary, bg="#333", padx=12, pady=8)
+            box.pack(side="left", expand=True, fill="x", padx=4)
+            tk.Label(box, text=title, fg="#aaa", bg="#333").pack()
+            var = tk.StringVar(value="00:00:00")
+            tk.Label(box, textvariable=var, fg="#fff", bg="#333", font=("微软雅黑", 14, "bold")).pack()
+            self._summary_vars[key] = var
+
+        # 近 30 天柱状图
+        self.chart = tk.Canvas(self, bg="#222", height=self.CHART_HEIGHT, highlightthickness=0)
+        self.chart.pack(fill="x", padx=12, pady=8)
+        self.chart.bind("<Configure>", lambda e: self._draw_chart())
+
+        # 各宠物排行
+        table = tk.LabelFrame(self, text="各宠物运行时间", fg="#fff", bg="#222")
+        table.pack(fill="both", expand=True, padx=12, pady=8)
+        self.table = tk.Frame(table, bg="#222")
+        self.table.pack(fill="both", expand=True)
+
+    def on_show(self) -> None:
+        """显示时读取滚动合计并刷新"""
+        username = self.controller.current_user
+        if not username:
+            return
+        for key, value in self.usage.rolling(username).items():
+            self._summary_vars[key].set(RuntimeTracker.format_hms(value))
+        self._render_table(username)
+        self._draw_chart()
+
+    def _render_table(self, username: str) -> None:
+        """渲染各宠物的今天 / 近 7 天 / 近 30 天 / 累计运行时间"""
+        for w in list(self.table.children.values()):
+            w.destroy()
+        user = self.dm.get_user(username) or {}
+        lifetime = user.get("pet_run_time", {})
+        headers = ("宠物", "今天", "近 7 天", "近 30 天", "累计")
+        for col, text in enumerate(headers):
+            tk.Label(self.table, text=text, fg="#aaa", bg="#222").grid(row=0, column=col, sticky="w", padx=8, pady=2)
+        names = [name for name, _ in self.usage.per_pet(username, 30)]
+        names += [name for name in lifetime if name not in names]
+        if not names:
+            tk.Label(self.table, text="暂无运行记录", fg="#888", bg="#222").grid(row=1, column=0, columnspan=5, pady=12)
+            return
+        for row, name in enumerate(names, start=1):
+            r = self.usage.rolling(username, name)
+            values = (name, r["today"], r["7d"], r["30d"], int(lifetime.get(name, 0)))
+            for col, value in enumerate(values):
+                text = value if col == 0 else RuntimeTracker.format_hms(int(value))
+                tk.Label(self.table, text=text, fg="#fff", bg="#222").grid(row=row, column=col, sticky="w", padx=8, pady=1)
+
+    def _draw_chart(self) -> None:
+        """绘制近 30 天每日运行时间柱状图"""
+        self.chart.delete("all")
+        username = self.controller.current_user
+        if not username:
+            return
+        days = self.usage.daily(username, self.CHART_DAYS)
+        width = max(1, self.chart.winfo_width())
+        height = self.CHART_HEIGHT
+        peak = max((secs for _, secs in days), default=0)
+        bar_w = width / len(days)
+        bottom = height - 18
+        for i, (day, secs) in enumerate(days):
+            x0 = i * bar_w + 2
+            x1 = (i + 1) * bar_w - 2
+            bar_h = (bottom - 16) * secs / peak if peak else 0
+            self.chart.create_rectangle(x0, bottom - bar_h, x1, bottom, fill="#4a9" if secs else "#333", outline="")
+            if i % 5 == 4 or i == len(days) - 1:
+                self.chart.create_text((x0 + x1) / 2, height - 8, text=day.strftime("%m-%d"), fill="#888", font=("微软雅黑", 8))
+        if peak:
+            self.chart.create_text(4, 2, anchor="nw", text=f"最高 {RuntimeTracker.format_hms(peak)}", fill="#aaa", font=("微软雅黑", 8))
@@ -6,6 +6,7 @@ import os
 from core.data_manager import DataManager
 from core.account import AccountManager
 from core.backup_manager import BackupManager
+from core.migrations import migrate_user
 
 class UpdateView(tk.Frame):
     """数据更新页面：提供用户数据的加密导出与导入功能"""
@@ -103,11 +104,8 @@ class UpdateView(tk.Frame):
             # 必须注入 username，因为 data_manager 中的用户对象不包含 key 本身
             export_payload = dict(user)
             export_payload["username"] = username
-            encrypted_data = BackupManager.export_data(export_payload)
-            
-            # 写入文件
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(encrypted_data)
+            # 流式加密写入文件
+            BackupManager.export_to_file(export_payload, filepath)
                 
             self.msg_label.config(text=f"导出成功！已保存至 {os.path.basename(filepath)}")
             messagebox.showinfo("成功", "数据已加密导出！")
@@ -126,11 +124,8 @@ class UpdateView(tk.Frame):
             return
             
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                content = f.read()
-                
-            # 解析并解密
-            user_data = BackupManager.import_data(content)
+            # 流式读取、验签并解密
+            user_data = BackupManager.import_file(filepath)
             
             if not user_data or not isinstance(user_data, dict):
                 self.msg_label.config(text="文件无效或校验失败（可能被篡改）")
@@ -155,6 +150,8 @@ class UpdateView(tk.Frame):
                 
             # 确认覆盖
             if messagebox.askyesno("确认导入", f"即将恢复用户 [{username}] 的数据。\n这将覆盖本地该用户的现有进度。\n是否继续？"):
+                # 旧版本导出的数据按当前数据版本迁移后再写入
+                migrate_user(self.dm, username, user_data)
                 # 更新数据
                 if self.dm.upsert_user(username, user_data):
                     self.msg_label.config(text=f"导入成功！用户 [{username}] 数据已更新")